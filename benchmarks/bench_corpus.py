@@ -0,0 +1,221 @@
+# Times every stage of the similarity metric against the rule corpus shipped with the repository.
+#
+# The ground truth is rules/rtec/maritime_rules.prolog and the generated programs are the LLM outputs
+# in rules/llms/llm_generated_rules and rules/llms/executable_version. For each program the stages are
+# timed separately:
+#
+# lex:                         tokenizing the source with the RTEC lexer
+# parse:                       parsing the source with the shared parser
+# partition:                   partition_event_description of the parsed program
+# rule_distance:               rule_distance of every pair of rules of the concepts shared with the ground truth
+# event_description_distance:  event_description_distance of every shared concept (also reported per concept)
+# parse_and_compute_distance:  the whole pipeline, without log file and caches
+# feedback:                    generating and formatting the feedback of every shared concept
+#
+# Every stage sees fresh rules (partitioning is redone outside of the timed region) and no cache, so the
+# numbers are those of a first comparison. Peak memory is measured with tracemalloc in a separate, untimed
+# run of each stage. The results are written as JSON; --compare prints the change against an earlier run.
+#
+# Usage: python benchmarks/bench_corpus.py [-n repetitions] [-o results.json] [--compare baseline.json] [programs...]
+
+import argparse
+import contextlib
+import glob
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, root_dir)
+
+from simlp.distance_metric import rule_distance, event_description_distance
+from simlp.feedback_generator import FeedbackGenerator
+from simlp.partitioner import partition_event_description, format_concept_key
+from simlp.rtec_parser import get_parser
+from simlp.run import parse_and_compute_distance
+
+GROUND_FILE = os.path.join(root_dir, "rules/rtec/maritime_rules.prolog")
+PROGRAM_PATTERNS = ("rules/llms/llm_generated_rules/*.prolog", "rules/llms/executable_version/*.prolog")
+STAGES = ('lex', 'parse', 'partition', 'rule_distance', 'event_description_distance',
+		  'parse_and_compute_distance', 'feedback')
+
+LOGGER = logging.Logger("bench_corpus", logging.WARNING)
+
+def corpus_programs():
+	return [path for pattern in PROGRAM_PATTERNS for path in sorted(glob.glob(os.path.join(root_dir, pattern)))]
+
+def program_name(path):
+	return os.path.relpath(os.path.abspath(path), root_dir)
+
+def git_commit():
+	try:
+		output = subprocess.run(["git", "rev-parse", "HEAD"], cwd=root_dir, capture_output=True, text=True, check=True)
+		return output.stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+def shared_keys(generated_partitions, ground_partitions):
+	return sorted(generated_partitions.keys() & ground_partitions.keys(), key=str)
+
+def measure(setup, stage, repetitions):
+	''' Returns the times of repetitions calls of stage(setup()) and the peak memory of one more call.
+
+	An untimed call comes first, so the lazy imports (e.g. of scipy) are not part of the first time.
+	'''
+	stage(setup())
+	times = []
+	for _ in range(repetitions):
+		argument = setup()
+		start = time.perf_counter()
+		stage(argument)
+		times.append(time.perf_counter() - start)
+	argument = setup()
+	tracemalloc.start()
+	try:
+		stage(argument)
+		_, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+	return times, peak
+
+def lex(source):
+	lexer = get_parser().lexer
+	lexer.input(source)
+	while lexer.token() is not None:
+		pass
+
+def program_stages(source, ground_source):
+	''' The (setup, stage) pairs of a program; per-concept stages return their time per concept key. '''
+	parser = get_parser()
+	event_description = parser.parse(source)
+
+	def fresh_partitions():
+		return partition_event_description(event_description), partition_event_description(parser.parse(ground_source))
+
+	def all_rule_distances(partitions):
+		generated, ground = partitions
+		for key in shared_keys(generated, ground):
+			for rule1 in generated[key].rules:
+				for rule2 in ground[key].rules:
+					rule_distance(rule1, rule2, LOGGER, atom_cache=None)
+
+	def per_concept(compute):
+		def stage(partitions):
+			generated, ground = partitions
+			concept_times = dict()
+			for key in shared_keys(generated, ground):
+				start = time.perf_counter()
+				compute(generated[key], ground[key])
+				concept_times[key] = time.perf_counter() - start
+			return concept_times
+		return stage
+
+	def feedback(generated, ground):
+		feedback_gen = FeedbackGenerator(LOGGER)
+		feedback_gen.format_feedback_for_llm(feedback_gen.generate_event_description_feedback(generated, ground))
+
+	return {
+		'lex': (lambda: source, lex),
+		'parse': (lambda: source, parser.parse),
+		'partition': (lambda: event_description, partition_event_description),
+		'rule_distance': (fresh_partitions, all_rule_distances),
+		'event_description_distance': (fresh_partitions, per_concept(
+			lambda generated, ground: event_description_distance(generated, ground, LOGGER, atom_cache=None))),
+		'parse_and_compute_distance': (lambda: source, lambda source: parse_and_compute_distance(
+			generated_event_description=source, ground_event_description=ground_source, log_file=None,
+			use_cache=False, use_atom_cache=False, trace=False)),
+		'feedback': (fresh_partitions, per_concept(feedback)),
+	}
+
+def run_benchmarks(programs, repetitions):
+	with open(GROUND_FILE) as f:
+		ground_source = f.read()
+	results = {
+		'commit': git_commit(),
+		'python': platform.python_version(),
+		'repetitions': repetitions,
+		'ground': program_name(GROUND_FILE),
+		'stages': {stage: {'seconds': 0.0, 'min_seconds': 0.0, 'peak_bytes': 0} for stage in STAGES},
+		'programs': dict(),
+		'concepts': {stage: dict() for stage in ('event_description_distance', 'feedback')},
+	}
+	for path in programs:
+		with open(path) as f:
+			source = f.read()
+		program = {'rules': len(get_parser().parse(source).rules)}
+		for stage, (setup, function) in program_stages(source, ground_source).items():
+			concept_times = []
+			def timed(argument):
+				returned = function(argument)
+				if isinstance(returned, dict):
+					concept_times.append(returned)
+			times, peak = measure(setup, timed, repetitions)
+			median = statistics.median(times)
+			program[stage] = {'seconds': median, 'min_seconds': min(times), 'peak_bytes': peak}
+			totals = results['stages'][stage]
+			totals['seconds'] += median
+			totals['min_seconds'] += min(times)
+			totals['peak_bytes'] = max(totals['peak_bytes'], peak)
+			if stage in results['concepts']:
+				# The per-concept time of the program is the median over the timed repetitions (not the warm-up and
+				# tracemalloc calls)
+				for key in concept_times[0]:
+					name = format_concept_key(key)
+					median = statistics.median(run[key] for run in concept_times[1:repetitions + 1])
+					results['concepts'][stage][name] = results['concepts'][stage].get(name, 0.0) + median
+		results['programs'][program_name(path)] = program
+	return results
+
+def format_summary(results, baseline=None):
+	lines = ["%-28s %12s %12s %12s" % ("stage", "median ms", "min ms", "peak KiB")
+			 + ("  %10s" % "vs baseline" if baseline else "")]
+	for stage in STAGES:
+		totals = results['stages'][stage]
+		line = "%-28s %12.2f %12.2f %12.1f" % (stage, 1000 * totals['seconds'], 1000 * totals['min_seconds'],
+											   totals['peak_bytes'] / 1024)
+		if baseline and stage in baseline['stages'] and baseline['stages'][stage]['seconds']:
+			line += "  %10.2fx" % (totals['seconds'] / baseline['stages'][stage]['seconds'])
+		lines.append(line)
+	for stage, concepts in results['concepts'].items():
+		lines.append("")
+		lines.append("%s per concept (ms, summed over programs):" % stage)
+		for name, seconds in sorted(concepts.items(), key=lambda item: -item[1]):
+			line = "  %-40s %10.2f" % (name, 1000 * seconds)
+			base_seconds = baseline['concepts'].get(stage, dict()).get(name) if baseline else None
+			if base_seconds:
+				line += "  %10.2fx" % (seconds / base_seconds)
+			lines.append(line)
+	return "\n".join(lines)
+
+if __name__=="__main__":
+	argparser = argparse.ArgumentParser(description="Time the stages of simlp against the bundled rule corpus.")
+	argparser.add_argument("programs", nargs="*", help="generated programs (default: the LLM outputs in rules/llms)")
+	argparser.add_argument("-n", "--repetitions", type=int, default=5, help="timed runs of every stage (default: 5)")
+	argparser.add_argument("-o", "--output", help="JSON file of the results (default: standard output)")
+	argparser.add_argument("--compare", metavar="BASELINE", help="JSON results of an earlier run to compare with")
+	args = argparser.parse_args()
+	# parse_and_compute_distance warns about the malformed clauses of some programs on every run
+	logging.getLogger("simlp").setLevel(logging.ERROR)
+
+	# The lexer prints every illegal character of the malformed programs to standard output
+	with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+		results = run_benchmarks(args.programs or corpus_programs(), max(1, args.repetitions))
+	baseline = None
+	if args.compare:
+		with open(args.compare) as f:
+			baseline = json.load(f)
+		results['baseline_commit'] = baseline.get('commit')
+	print("Commit: %s, %d programs, %d repetitions" % (results['commit'], len(results['programs']), args.repetitions),
+		  file=sys.stderr)
+	print(format_summary(results, baseline), file=sys.stderr)
+	if args.output:
+		with open(args.output, "w") as f:
+			json.dump(results, f, indent=2)
+	else:
+		print(json.dumps(results, indent=2))
@@ -0,0 +1,61 @@
+# Measures the setup and parsing cost of the RTEC parser.
+#
+# cold start: first construction of the shared parser in a fresh interpreter (tables read from simlp/parsetab.py)
+# rebuild:    generating the lexer regex and the LALR tables from the grammar, as a parser without
+#             packaged tables does (nothing is read from or written to lextab.py or parsetab.py)
+# warm parse: parsing a program with the already built parser, for each parser backend
+#
+# Usage: python benchmarks/bench_parser.py [prolog file] [repetitions]
+
+import os
+import subprocess
+import sys
+import time
+
+from ply import lex, yacc
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, root_dir)
+
+from simlp.rtec_lexer import RTECLexer
+from simlp.rtec_parser import get_parser, PARSER_BACKENDS
+
+COLD_START_SNIPPET = """
+import time
+start = time.perf_counter()
+from simlp.rtec_parser import get_parser
+get_parser()
+print(time.perf_counter() - start)
+"""
+
+def time_cold_start():
+	output = subprocess.run([sys.executable, "-c", COLD_START_SNIPPET], cwd=root_dir, capture_output=True, text=True, check=True)
+	return float(output.stdout.strip().splitlines()[-1])
+
+def time_per_call(function, repetitions):
+	start = time.perf_counter()
+	for _ in range(repetitions):
+		function()
+	return (time.perf_counter() - start) / repetitions
+
+if __name__=="__main__":
+	rules_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join(root_dir, "rules/rtec/maritime_rules.prolog")
+	repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+	with open(rules_file) as f:
+		source = f.read()
+
+	# Without optimize, lex builds the master regex from the token rules instead of reading lextab.py; yacc
+	# generates the tables because the tabmodule does not exist, and write_tables=False keeps them in memory
+	token_rules = RTECLexer()
+	ply_parser = get_parser()
+	def rebuild():
+		lex.lex(module=token_rules, optimize=False)
+		yacc.yacc(module=ply_parser, tabmodule='_bench_parser_no_tables', write_tables=False, debug=False,
+				  errorlog=yacc.NullLogger())
+
+	print("Program: " + rules_file + " (" + str(len(get_parser().parse(source).rules)) + " rules)")
+	print("cold start (import + build):  %8.2f ms" % (1000 * time_cold_start()))
+	print("rebuild lexer and tables:     %8.2f ms" % (1000 * time_per_call(rebuild, repetitions)))
+	for backend in PARSER_BACKENDS:
+		parser = get_parser(backend)
+		print("warm parse (%-7s):          %8.2f ms" % (backend, 1000 * time_per_call(lambda: parser.parse(source), repetitions)))
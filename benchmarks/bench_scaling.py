@@ -0,0 +1,105 @@
+# Measures how the comparison of one concept scales with its number of rules, on synthetic programs.
+#
+# For every size m, simlp.synthetic generates a ground truth with a single simple fluent whose concepts
+# have m rules, and mutates it into a generated program. The two O(m^2) and O(m^3) steps of
+# event_description_distance are timed separately on the initiatedAt concept:
+#
+# cost_matrix:  rule_cost_matrix, m^2 rule distances (each an assignment of body literals)
+# assignment:   linear_sum_assignment of the m x m cost matrix
+# total:        event_description_distance, without atom cache
+# approximate:  event_description_distance with an ApproximateAssignment (--method, -k), and its similarity
+#               and similarity gap
+#
+# Usage: python benchmarks/bench_scaling.py [-s sizes] [-n repetitions] [--body-length N] [--mutation-rate R]
+#                                           [--method greedy|auction] [-k K] [-o results.json]
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, root_dir)
+
+from simlp.assignment import linear_sum_assignment, ApproximateAssignment, APPROXIMATE_METHODS
+from simlp.atom_utils import get_padded_views
+from simlp.distance_metric import rule_cost_matrix, event_description_distance, compare_event_descriptions, DUMMY_RULE
+from simlp.partitioner import partition_event_description
+from simlp.synthetic import generate_event_description, mutate_event_description, to_prolog
+from simlp.rtec_parser import get_parser
+
+LOGGER = logging.Logger("bench_scaling", logging.WARNING)
+
+def concept_pair(size, body_length, mutation_rate, seed):
+	''' The parsed initiatedAt partitions of a synthetic ground truth with size rules per concept and its mutation. '''
+	ground = generate_event_description(fluents=1, rules_per_concept=size, body_length=body_length,
+										static_fraction=0.0, seed=seed)
+	generated = mutate_event_description(ground, mutation_rate, seed)
+	parser = get_parser()
+	generated_partitions = partition_event_description(parser.parse(to_prolog(generated)))
+	ground_partitions = partition_event_description(parser.parse(to_prolog(ground)))
+	key = ('fluent0', 'initiatedAt')
+	return generated_partitions[key], ground_partitions[key]
+
+def median_time(function, repetitions):
+	times = []
+	for _ in range(repetitions):
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+	return statistics.median(times)
+
+def run_benchmarks(sizes, repetitions, body_length, mutation_rate, approximate, seed=0):
+	results = {'repetitions': repetitions, 'body_length': body_length, 'mutation_rate': mutation_rate,
+			   'approximate': repr(approximate), 'sizes': []}
+	for size in sizes:
+		generated, ground = concept_pair(size, body_length, mutation_rate, seed)
+		rules1, rules2, m, _ = get_padded_views(generated.rules, ground.rules, DUMMY_RULE)
+		cost_matrix = rule_cost_matrix(rules1, rules2, m, LOGGER, atom_cache=None)
+		comparison = compare_event_descriptions(generated, ground, LOGGER, atom_cache=None, approximate=approximate)
+		results['sizes'].append({
+			'm': m,
+			'cost_matrix_seconds': median_time(lambda: rule_cost_matrix(rules1, rules2, m, LOGGER, atom_cache=None),
+											   repetitions),
+			'assignment_seconds': median_time(lambda: linear_sum_assignment(cost_matrix), repetitions),
+			'total_seconds': median_time(lambda: event_description_distance(generated, ground, LOGGER, atom_cache=None),
+										 repetitions),
+			'similarity': float(event_description_distance(generated, ground, LOGGER, atom_cache=None)[2]),
+			'approximate_seconds': median_time(lambda: event_description_distance(generated, ground, LOGGER, atom_cache=None,
+																				   approximate=approximate), repetitions),
+			'approximate_similarity': float(comparison.similarity),
+			'similarity_gap': comparison.similarity_gap,
+		})
+	return results
+
+if __name__=="__main__":
+	argparser = argparse.ArgumentParser(description="Time the comparison of one concept as its number of rules grows.")
+	argparser.add_argument("-s", "--sizes", default="10,25,50,100,200", help="rules per concept (default: 10,25,50,100,200)")
+	argparser.add_argument("-n", "--repetitions", type=int, default=3, help="timed runs of every step (default: 3)")
+	argparser.add_argument("--body-length", type=int, default=4, help="literals per rule body (default: 4)")
+	argparser.add_argument("--mutation-rate", type=float, default=0.2, help="mutation rate of the generated program (default: 0.2)")
+	argparser.add_argument("--method", choices=APPROXIMATE_METHODS, default="greedy",
+						   help="approximate assignment method (default: greedy)")
+	argparser.add_argument("-k", type=int, default=10, help="rule pairs compared per rule by the approximation (default: 10)")
+	argparser.add_argument("-o", "--output", help="JSON file of the results (default: standard output)")
+	args = argparser.parse_args()
+
+	# Every size is approximated, to compare it with the exact comparison
+	approximate = ApproximateAssignment(args.method, k=args.k, exact_below=1)
+	results = run_benchmarks([int(size) for size in args.sizes.split(",")], max(1, args.repetitions), args.body_length,
+							 args.mutation_rate, approximate)
+	print("%6s %16s %16s %12s %12s %16s %12s %8s" % ("m", "cost matrix ms", "assignment ms", "total ms", "similarity",
+												   "approximate ms", "similarity", "gap"), file=sys.stderr)
+	for row in results['sizes']:
+		print("%6d %16.2f %16.3f %12.2f %12.4f %16.2f %12.4f %8.4f" % (
+			row['m'], 1000 * row['cost_matrix_seconds'], 1000 * row['assignment_seconds'], 1000 * row['total_seconds'],
+			row['similarity'], 1000 * row['approximate_seconds'], row['approximate_similarity'], row['similarity_gap']),
+			file=sys.stderr)
+	if args.output:
+		with open(args.output, "w") as f:
+			json.dump(results, f, indent=2)
+	else:
+		print(json.dumps(results, indent=2))
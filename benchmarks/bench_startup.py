@@ -0,0 +1,44 @@
+# Measures the startup cost of simlp in a fresh interpreter and checks it against a budget.
+#
+# import:            import simlp (the heavy dependencies are loaded on first use)
+# first comparison:  import simlp plus one parse_and_compute_distance of the unit_tests/test1 rules,
+#                    which also loads numpy, ply and scipy
+#
+# Each snippet is run several times and the fastest run is reported. The exit status is 1 if a budget
+# is exceeded, so the script can gate a CI job on a dedicated machine.
+#
+# Usage: python benchmarks/bench_startup.py [repetitions]
+
+import os
+import subprocess
+import sys
+import time
+
+# Wall-clock budgets, in seconds. Measured on a development machine: 0.013 s for import simlp and
+# 0.46 s for import simlp plus one comparison of the test1 rules.
+IMPORT_BUDGET = 0.25
+FIRST_COMPARISON_BUDGET = 2.0
+
+root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+FIRST_COMPARISON_SNIPPET = """
+import simlp
+assert simlp.parse_and_compute_distance(generated_rules_file='unit_tests/test1/generated.prolog',
+                                        ground_rules_file='unit_tests/test1/ground.prolog', log_file=None)[2] is not None
+"""
+
+def time_fresh_interpreter(code):
+	start = time.perf_counter()
+	# The interpreter runs in the repository, where it imports simlp from and finds the test1 rules
+	subprocess.run([sys.executable, "-c", code], cwd=root_dir, check=True)
+	return time.perf_counter() - start
+
+if __name__=="__main__":
+	repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+	within_budget = True
+	for label, code, budget in (("import", "import simlp", IMPORT_BUDGET),
+								("first comparison", FIRST_COMPARISON_SNIPPET, FIRST_COMPARISON_BUDGET)):
+		seconds = min(time_fresh_interpreter(code) for _ in range(repetitions))
+		within_budget = within_budget and seconds < budget
+		print("%-17s %8.2f ms (budget %.0f ms)" % (label + ":", 1000 * seconds, 1000 * budget))
+	sys.exit(0 if within_budget else 1)
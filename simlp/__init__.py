@@ -1,2 +1,28 @@
-from .run import parse_and_compute_distance
-from .feedback_generator import FeedbackGenerator
\ No newline at end of file
+# The public names are imported from their modules on first access, so that import simlp stays cheap
+# and, e.g., the query and feedback modules are only loaded by the programs that use them.
+
+_exports = {
+	'parse_and_compute_distance': 'run',
+	'FeedbackGenerator': 'feedback_generator',
+	'similarity_at_least': 'query',
+	'top_k': 'query',
+	'FeedbackReport': 'feedback_report',
+	'Evaluator': 'evaluator',
+	'PerformanceStats': 'stats',
+	'ApproximateAssignment': 'assignment',
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+	if name not in _exports:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	from importlib import import_module
+	value = getattr(import_module('.' + _exports[name], __name__), name)
+	globals()[name] = value
+	return value
+
+
+def __dir__():
+	return sorted(list(globals()) + __all__)
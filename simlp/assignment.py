@@ -0,0 +1,126 @@
+# Solvers of the linear assignment problems of the metric.
+#
+# scipy.optimize takes longer to import than a typical comparison takes to run, so it is imported on
+# the first assignment that needs it rather than with simlp. A 1 x 1 problem has a single assignment
+# and never needs it.
+#
+# For concepts with very many rules, ApproximateAssignment selects a greedy or an auction solver; both
+# come with a lower bound of the optimal cost, so the approximation gap can be reported.
+
+import numpy as np
+
+_scipy_linear_sum_assignment = None
+
+
+def linear_sum_assignment(cost_matrix):
+	''' scipy.optimize.linear_sum_assignment(cost_matrix): returns (row_ind, col_ind) of a minimum cost assignment. '''
+	global _scipy_linear_sum_assignment
+	if cost_matrix.shape == (1, 1):
+		return np.zeros(1, dtype=np.intp), np.zeros(1, dtype=np.intp)
+	if _scipy_linear_sum_assignment is None:
+		from scipy.optimize import linear_sum_assignment as _scipy_linear_sum_assignment
+	return _scipy_linear_sum_assignment(cost_matrix)
+
+
+APPROXIMATE_METHODS = ('greedy', 'auction')
+
+
+class ApproximateAssignment:
+	''' Options of the approximate rule assignment of compare_event_descriptions.
+
+	Attributes:
+		method (str): 'greedy' (cheapest remaining pair first) or 'auction' (Bertsekas' auction).
+		epsilon (float): Bid increment of the auction. The auction assignment costs at most m * epsilon
+			more than the optimal one, i.e. the similarity of a concept is within epsilon of the similarity
+			of the optimal assignment of the same matrix.
+		k (int or None): Number of ground rules compared exactly with each generated rule, those with the
+			lowest lower bounds; None compares all rule pairs.
+		exact_below (int): Concepts whose padded rule matrix has fewer rows are compared exactly.
+	'''
+
+	def __init__(self, method='greedy', epsilon=0.01, k=None, exact_below=32):
+		if method not in APPROXIMATE_METHODS:
+			raise ValueError(f"Unknown assignment method {method!r}; expected one of {APPROXIMATE_METHODS}")
+		if epsilon <= 0:
+			raise ValueError("epsilon must be positive")
+		if k is not None and k < 1:
+			raise ValueError("k must be at least 1")
+		self.method = method
+		self.epsilon = epsilon
+		self.k = k
+		self.exact_below = exact_below
+
+	def applies(self, m):
+		return m >= self.exact_below
+
+	def solve(self, cost_matrix):
+		''' Returns (row_ind, col_ind, lower_bound): an assignment and a lower bound of the optimal cost. '''
+		if self.method == 'greedy':
+			row_ind, col_ind = greedy_assignment(cost_matrix)
+			return row_ind, col_ind, assignment_lower_bound(cost_matrix)
+		row_ind, col_ind, prices = auction_assignment(cost_matrix, self.epsilon)
+		return row_ind, col_ind, assignment_lower_bound(cost_matrix, prices)
+
+	def __repr__(self):
+		return f'ApproximateAssignment({self.method!r}, epsilon={self.epsilon}, k={self.k}, ' \
+			   f'exact_below={self.exact_below})'
+
+
+def greedy_assignment(cost_matrix):
+	''' Assigns the cheapest pair of a free row and a free column first; O(m^2 log m) for an m x m matrix. '''
+	m, n = cost_matrix.shape
+	row_free = np.ones(m, dtype=bool)
+	col_free = np.ones(n, dtype=bool)
+	col_ind = np.empty(m, dtype=np.intp)
+	assigned = 0
+	for cell in np.argsort(cost_matrix, axis=None, kind='stable'):
+		i, j = divmod(int(cell), n)
+		if row_free[i] and col_free[j]:
+			col_ind[i] = j
+			row_free[i] = col_free[j] = False
+			assigned += 1
+			if assigned == m:
+				break
+	return np.arange(m), col_ind
+
+
+def auction_assignment(cost_matrix, epsilon):
+	''' Bertsekas' forward auction on a square cost matrix.
+
+	Every unassigned row bids for its cheapest column at the current prices, raising its price by the
+	margin over the second cheapest plus epsilon. Returns (row_ind, col_ind, prices); the assignment
+	costs at most m * epsilon more than the optimal one.
+	'''
+	m = cost_matrix.shape[0]
+	prices = np.zeros(m)
+	owner = np.full(m, -1, dtype=np.intp)
+	col_ind = np.full(m, -1, dtype=np.intp)
+	unassigned = list(range(m - 1, -1, -1))
+	while unassigned:
+		i = unassigned.pop()
+		costs = cost_matrix[i] + prices
+		j = int(np.argmin(costs))
+		if m > 1:
+			best = costs[j]
+			costs[j] = np.inf
+			prices[j] += costs.min() - best + epsilon
+		else:
+			prices[j] += epsilon
+		if owner[j] >= 0:
+			col_ind[owner[j]] = -1
+			unassigned.append(owner[j])
+		owner[j] = i
+		col_ind[i] = j
+	return np.arange(m), col_ind, prices
+
+
+def assignment_lower_bound(cost_matrix, prices=None):
+	''' A lower bound of the cost of every assignment of a square cost matrix.
+
+	For any column prices p, sum_i min_j (c_ij + p_j) - sum_j p_j is a feasible value of the dual
+	problem; the bound is the larger of that value and the sum of the column minima.
+	'''
+	if prices is None:
+		prices = np.zeros(cost_matrix.shape[1])
+	dual = (cost_matrix + prices[None, :]).min(axis=1).sum() - prices.sum()
+	return max(dual, cost_matrix.min(axis=0).sum())
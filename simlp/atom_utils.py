@@ -2,6 +2,8 @@
 # Extracted from distance_metric.py to avoid circular imports
 
 from .event_description import Atom
+from collections import Counter
+import numpy as np
 
 def atomIsVar(atom):
     return atom.predicateName[0].isupper() or atom.predicateName[0]=="_"
@@ -15,40 +17,168 @@ def atomIsConst(atom):
 def atomIsComp(atom):
     return len(atom.args)>0
 
-def compute_var_routes(rule):
+# Kind flags of an atom; an atom may have more than one, e.g. a hand-built variable with arguments.
+VAR = 1
+CONST = 2
+COMPOUND = 4
+
+def atom_kind(atom):
+    return (VAR if atomIsVar(atom) else 0) | (CONST if atomIsConst(atom) else 0) | (COMPOUND if atomIsComp(atom) else 0)
+
+def signature_key(atom):
+    # Integer key of the (predicate, arity) signature; a collision only costs an unnecessary comparison.
+    return hash((atom.predicateName, len(atom.args)))
+
+def _find_var_routes(atoms, make_route):
+    # Walks the atoms with a single route stack; make_route freezes the current route at each variable.
     var_routes = dict()
-    
-    def find_var_routes_in_atom(atom, route):
+    route = []
+
+    def find_var_routes_in_atom(atom):
         # For free variables, we do nothing.
-        if atom.predicateName[0].isupper(): 
+        if atom.predicateName[0].isupper():
             if atom.predicateName in var_routes:
-                var_routes[atom.predicateName].append(route)
+                var_routes[atom.predicateName].append(make_route(route))
             else:
-                var_routes[atom.predicateName] = [route]
+                var_routes[atom.predicateName] = [make_route(route)]
         else:
             for arg_index in range(0, len(atom.args)):
-                find_var_routes_in_atom(atom.args[arg_index], route + [(atom.predicateName, arg_index)])
+                route.append((atom.predicateName, arg_index))
+                find_var_routes_in_atom(atom.args[arg_index])
+                route.pop()
 
-    find_var_routes_in_atom(rule.head, list())
-    for atom in rule.body:
-        find_var_routes_in_atom(atom, list())
+    for atom in atoms:
+        find_var_routes_in_atom(atom)
     return var_routes
 
-def get_lists_size_and_pad(list1, list2, pad_item):
-    def pad_list(mylist, n):
-        for _ in range(n):
-            mylist.append(pad_item)
-
-    if len(list1)==len(list2):
-        m = len(list1)
-        k = len(list1)
-    elif len(list1)>len(list2):
-        m = len(list1)
-        k = len(list2)
-        pad_list(list2, m-k)
-    elif len(list2)>len(list1):
-        m = len(list2)
-        k = len(list1)
-        pad_list(list1, m-k)
-
-    return m, k
+def atom_variables(atom):
+    # The variables whose routes compute_var_routes records inside atom, in order of first occurrence.
+    variables = dict()
+    stack = [atom]
+    while stack:
+        atom = stack.pop()
+        if atom.predicateName[0].isupper():
+            variables[atom.predicateName] = None
+        else:
+            stack.extend(reversed(atom.args))
+    return list(variables)
+
+def compute_var_routes(rule):
+    return _find_var_routes([rule.head] + list(rule.body), list)
+
+
+class RuleAnalysis(dict):
+    """Per-rule data used by the distance metric and the feedback generator.
+
+    A RuleAnalysis is the var routes mapping of the rule (variable -> list of routes, each route a
+    tuple of (predicate name, argument index) pairs), so it can be passed wherever var routes are
+    expected. In addition it holds:
+        signatures: variable -> sorted tuple of its routes; two variables appear in the same atoms
+            wrt nesting iff their signatures are equal.
+        singletons: the variables that appear once in the rule.
+        atom_kinds: atom -> kind flags (VAR, CONST, COMPOUND) for every atom and sub-atom of the rule.
+        body_keys, body_vars: NumPy arrays with the signature_key of each body atom and whether it
+            is a variable, used to prefilter cost matrices.
+        body_classes: Counter of the body atoms by signature_key, with all variables counted under
+            None; only atoms of the same class can be at distance less than 1.
+        plain_body_atoms: Counter of the body atoms whose leaves are all variables or constants; such an
+            atom is at distance 0 from itself in a rule where its variables have the same context.
+        contexts: atom -> context of the atom (see context), computed on demand.
+    """
+
+    def __init__(self, rule):
+        atoms = [rule.head] + list(rule.body)
+        super().__init__(_find_var_routes(atoms, tuple))
+        self.signatures = {var: tuple(sorted(routes)) for var, routes in self.items()}
+        self.singletons = frozenset(var for var, routes in self.items() if len(routes) == 1)
+        self.atom_kinds = dict()
+        stack = atoms
+        while stack:
+            atom = stack.pop()
+            if atom not in self.atom_kinds:
+                self.atom_kinds[atom] = atom_kind(atom)
+                stack.extend(atom.args)
+        self.body_keys = np.array([signature_key(atom) for atom in rule.body], dtype=np.int64)
+        self.body_vars = np.array([bool(self.atom_kinds[atom] & VAR) for atom in rule.body], dtype=bool)
+        self.body_classes = Counter(None if self.atom_kinds[atom] & VAR else signature_key(atom) for atom in rule.body)
+        self.plain_body_atoms = Counter(atom for atom in rule.body if self.is_plain(atom))
+        self.contexts = dict()
+
+    def is_plain(self, atom):
+        kind = self.atom_kinds[atom]
+        if len(atom.args) == 0:
+            return bool(kind & (VAR | CONST))
+        return not kind & VAR and all(self.is_plain(arg) for arg in atom.args)
+
+    def context(self, atom):
+        """Returns the frozenset of (variable, signature) pairs of the variables of atom.
+
+        Two atoms with equal contexts take part in the same var_distance comparisons, so the atom and
+        its context determine every distance between the atom and another atom.
+        """
+        context = self.contexts.get(atom)
+        if context is None:
+            context = self.contexts[atom] = frozenset((var, self.signatures.get(var)) for var in atom_variables(atom))
+        return context
+
+    def kind(self, atom):
+        kind = self.atom_kinds.get(atom)
+        return atom_kind(atom) if kind is None else kind
+
+def analyze_rule(rule):
+    """Returns the RuleAnalysis of a rule, computing it on first use.
+
+    The analysis is cached on the rule, so the head and body of a rule must not be modified once it
+    has been analyzed.
+    """
+    analysis = rule.analysis
+    if analysis is None:
+        analysis = rule.analysis = RuleAnalysis(rule)
+    return analysis
+
+def route_signature(var, var_routes):
+    if isinstance(var_routes, RuleAnalysis):
+        return var_routes.signatures[var]
+    return tuple(sorted(tuple(route) for route in var_routes[var]))
+
+def singleton_vars(var_routes):
+    if isinstance(var_routes, RuleAnalysis):
+        return var_routes.singletons
+    return frozenset(var for var, routes in var_routes.items() if len(routes) == 1)
+
+class PaddedView:
+    """Read-only view of a list extended to a given length, where an index past the end of the
+    list stands for pad_item. The list is neither copied nor modified."""
+
+    __slots__ = ('items', 'length', 'pad_item')
+
+    def __init__(self, items, length, pad_item):
+        self.items = items
+        self.length = length
+        self.pad_item = pad_item
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("PaddedView index out of range")
+        return self.items[index] if index < len(self.items) else self.pad_item
+
+    def __iter__(self):
+        yield from self.items
+        for _ in range(self.length - len(self.items)):
+            yield self.pad_item
+
+def get_padded_views(list1, list2, pad_item):
+    """Pads the shorter of two lists with pad_item by index; the lists are neither copied nor modified.
+
+    Returns:
+        tuple: (view1, view2, m, k), where view1 and view2 are PaddedViews of length m and k is the
+            length of the shorter list.
+    """
+    m = max(len(list1), len(list2))
+    k = min(len(list1), len(list2))
+    return PaddedView(list1, m, pad_item), PaddedView(list2, m, pad_item), m, k
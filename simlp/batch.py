@@ -0,0 +1,445 @@
+# Batch evaluation of many generated event descriptions against one ground truth.
+#
+# The ground truth is parsed and partitioned once and sent to the workers in the compact encoding.
+# Each candidate is scored as parse_and_compute_distance would score it, without writing a log file,
+# and a failure in one candidate is recorded in its result instead of stopping the batch.
+
+import glob
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cache import LRUCache
+from .compact import compile_event_description
+from .distance_metric import compare_event_descriptions, atom_distance_cache
+from .partitioner import format_concept_key, find_fluent_type_mismatches
+from .run import parse_event_description, concept_plan, average_similarity, normalize_source, setup_logger
+
+# Ground truths decoded in this (worker) process, keyed by the SHA-256 of their source.
+ground_partitions_cache = LRUCache(max_entries=4)
+
+# Corpora of similarity_matrix decoded in this (worker) process, keyed by the digest of the corpus.
+corpus_cache = LRUCache(max_entries=2)
+
+# The pools started here receive the ground truth (or corpus) once per process, through their initializer.
+# An executor given by the caller may run a task in any of its processes, so each of its tasks carries the
+# ground truth; the work is submitted to it in tasks of EXECUTOR_CHUNK_SIZE candidates (or rows).
+EXECUTOR_CHUNK_SIZE = 8
+
+# The metric logs at INFO level; batch runs discard those messages.
+_quiet_logger = logging.Logger("simlp.batch", logging.WARNING)
+
+
+class CandidateResult:
+	''' Scores of one generated event description.
+
+	Attributes:
+		path (str): The file of the candidate.
+		similarity (float): The event description similarity, as computed by parse_and_compute_distance,
+			or None if the candidate failed.
+		similarities (dict): Concept key -> similarity, as in parse_and_compute_distance.
+		matchings (dict): Shared concept key -> (optimal rule matching, distances of the matched rules).
+		skipped_clauses (list): Messages of the malformed clauses that were skipped while parsing.
+		error (str): The error that stopped the evaluation of the candidate, or None.
+		feedback (str): The feedback of parse_and_compute_distance, if it was requested, or None.
+	'''
+
+	def __init__(self, path, similarity=None, similarities=None, matchings=None, skipped_clauses=None, error=None,
+				 feedback=None):
+		self.path = path
+		self.similarity = similarity
+		self.similarities = similarities if similarities is not None else dict()
+		self.matchings = matchings if matchings is not None else dict()
+		self.skipped_clauses = skipped_clauses if skipped_clauses is not None else []
+		self.error = error
+		self.feedback = feedback
+
+	@property
+	def ok(self):
+		return self.error is None
+
+	def to_dict(self):
+		''' The result as a JSON-serializable dict, with concepts named by format_concept_key. '''
+		result = {'path': self.path, 'similarity': self.similarity,
+				  'concepts': {format_concept_key(key): similarity for key, similarity in self.similarities.items()},
+				  'matching': {format_concept_key(key): {'matching': matching, 'distances': distances}
+							   for key, (matching, distances) in self.matchings.items()},
+				  'skipped_clauses': self.skipped_clauses,
+				  'error': self.error}
+		if self.feedback is not None:
+			result['feedback'] = self.feedback
+		return result
+
+	def __repr__(self):
+		if self.error is not None:
+			return f'CandidateResult({self.path!r}, error={self.error!r})'
+		return f'CandidateResult({self.path!r}, similarity={self.similarity})'
+
+
+class BatchResult:
+	''' Results of a batch, one CandidateResult per candidate in input order. '''
+
+	COLUMNS = ('path', 'concept', 'similarity', 'matching', 'distances', 'error')
+
+	def __init__(self, candidates):
+		self.candidates = candidates
+
+	def __iter__(self):
+		return iter(self.candidates)
+
+	def __len__(self):
+		return len(self.candidates)
+
+	def similarities(self):
+		''' Returns path -> event description similarity (None for failed candidates). '''
+		return {candidate.path: candidate.similarity for candidate in self.candidates}
+
+	def failures(self):
+		return [candidate for candidate in self.candidates if not candidate.ok]
+
+	def rows(self):
+		''' Yields the result table as dicts with the keys in COLUMNS.
+
+		Every candidate has a row with concept None and its event description similarity (or its
+		error), followed by a row per concept with the concept similarity and, for shared concepts,
+		the optimal matching and the distances of the matched rules.
+		'''
+		for candidate in self.candidates:
+			yield {'path': candidate.path, 'concept': None, 'similarity': candidate.similarity,
+				   'matching': None, 'distances': None, 'error': candidate.error}
+			for key, similarity in candidate.similarities.items():
+				matching, distances = candidate.matchings.get(key, (None, None))
+				yield {'path': candidate.path, 'concept': format_concept_key(key), 'similarity': similarity,
+					   'matching': matching, 'distances': distances, 'error': None}
+
+
+def resolve_candidates(candidates):
+	''' Expands candidates (a directory, a glob pattern, a file, or a list of these) into a list of files.
+
+	Directories contribute their *.prolog files and glob patterns their matches, both in sorted order.
+	'''
+	if isinstance(candidates, (str, os.PathLike)):
+		candidates = [candidates]
+	paths = []
+	for candidate in candidates:
+		candidate = os.fspath(candidate)
+		if os.path.isdir(candidate):
+			paths.extend(sorted(glob.glob(os.path.join(glob.escape(candidate), '*.prolog'))))
+		elif glob.has_magic(candidate):
+			paths.extend(sorted(glob.glob(candidate, recursive=True)))
+		else:
+			paths.append(candidate)
+	return paths
+
+
+def score_partitions(path, gen_ed_partitions, ground_ed_partitions, use_atom_cache=True, skipped_clauses=(),
+					 generate_feedback=False, logger=None):
+	''' Scores parsed and partitioned event descriptions; returns a CandidateResult.
+
+	With generate_feedback=True, its feedback is the text parse_and_compute_distance returns. If a logger
+	is given, the comparison of every shared concept and the similarities are logged to it.
+	'''
+	logger = logger if logger is not None else _quiet_logger
+	similarity_keys, shared_keys, num_ground_concepts = concept_plan(gen_ed_partitions.keys(), ground_ed_partitions.keys())
+	similarities = dict.fromkeys(similarity_keys, 0)
+	matchings = dict()
+	feedback = None
+	if generate_feedback:
+		from .feedback_report import fluent_type_mismatch_text
+		mismatches = find_fluent_type_mismatches(gen_ed_partitions.keys(), ground_ed_partitions.keys())
+		feedback = "".join(fluent_type_mismatch_text(mismatch) for mismatch in mismatches)
+	atom_cache = atom_distance_cache if use_atom_cache else None
+	for key in shared_keys:
+		comparison = compare_event_descriptions(gen_ed_partitions[key], ground_ed_partitions[key], logger,
+												generate_feedback, atom_cache)
+		similarities[key] = comparison.similarity
+		matchings[key] = (comparison.col_ind.tolist(), comparison.distances.tolist())
+		if generate_feedback:
+			feedback += comparison.formatted_feedback + "\n"
+	similarity = average_similarity(similarities, num_ground_concepts)
+	for key in similarities:
+		logger.info("Similarity for definition: %s is %s", key, similarities[key])
+	logger.info("Event Description Similarity is: ")
+	logger.info(similarity)
+	return CandidateResult(path, similarity, similarities, matchings, list(skipped_clauses), feedback=feedback)
+
+
+def log_file_name(log_dir, path):
+	''' The log file of a candidate in log_dir, named after its path, e.g. logs/rules__gpt4.prolog.log. '''
+	name = os.path.normpath(os.path.splitdrive(path)[1]).lstrip(os.sep).replace(os.sep, '__')
+	return os.path.join(log_dir, name + '.log')
+
+
+def score_file(path, ground_ed_partitions, parser_backend='ply', use_atom_cache=True, generate_feedback=False,
+			   log_dir=None):
+	''' Scores one candidate file against partitioned ground truth; never raises.
+
+	If log_dir is given, the comparison is logged to the log_file_name of the candidate in it.
+	'''
+	logger, handler = setup_logger(log_file_name(log_dir, path)) if log_dir is not None else (None, None)
+	try:
+		with open(path) as f:
+			source = f.read()
+		# Candidates are seen once, so they are not kept in the parse cache.
+		gen_ed, gen_ed_partitions = parse_event_description(source, False, parser_backend)
+		if logger is not None:
+			for error in gen_ed.errors:
+				logger.warning(f"Skipped malformed clause in generated event description at {error}")
+		return score_partitions(path, gen_ed_partitions, ground_ed_partitions, use_atom_cache,
+								[str(error) for error in gen_ed.errors], generate_feedback, logger)
+	except Exception as e:
+		if logger is not None:
+			logger.error(f"Error scoring {path}: {e}")
+		return CandidateResult(path, error=f'{type(e).__name__}: {e}')
+	finally:
+		if handler is not None:
+			logger.removeHandler(handler)
+			handler.close()
+
+
+def score_candidate(path, ground_digest, ground_partitions=None, parser_backend='ply', use_atom_cache=True,
+					generate_feedback=False, log_dir=None):
+	''' Worker entry point: scores one candidate file against the ground truth with ground_digest.
+
+	ground_partitions, the compact partitions of the ground truth, are needed only if this process has
+	not decoded the ground truth yet; each process decodes it once.
+	'''
+	ground_ed_partitions = ground_partitions_cache.get(ground_digest)
+	if ground_ed_partitions is None:
+		ground_ed_partitions = _set_ground(ground_digest, ground_partitions)
+	return score_file(path, ground_ed_partitions, parser_backend, use_atom_cache, generate_feedback, log_dir)
+
+
+def score_candidates(paths, ground_digest, ground_partitions, *args):
+	''' Worker entry point: score_candidate of every path of a chunk of candidates. '''
+	return [score_candidate(path, ground_digest, ground_partitions, *args) for path in paths]
+
+
+def _set_ground(ground_digest, ground_partitions):
+	# Initializer of the processes of the pool created by evaluate_corpus
+	ground_ed_partitions = {key: partition.to_event_description() for key, partition in ground_partitions.items()}
+	ground_partitions_cache.put(ground_digest, ground_ed_partitions)
+	return ground_ed_partitions
+
+
+def _chunks(items, size=EXECUTOR_CHUNK_SIZE):
+	return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def evaluate_corpus(candidates, ground_rules_file=None, ground_event_description=None, workers=None,
+					executor=None, parser_backend='ply', use_atom_cache=True, generate_feedback=False, log_dir=None):
+	"""
+	Score many generated event descriptions against one ground truth.
+
+	Args:
+		candidates: A directory (its *.prolog files), a glob pattern, a file, or a list of these.
+		ground_rules_file (str, optional): Path to the ground truth. Used only if
+			ground_event_description is None.
+		ground_event_description (str, optional): Prolog code of the ground truth.
+		workers (int, optional): If greater than 1, candidates are scored in a pool of that many
+			processes. Defaults to None (serial).
+		executor (concurrent.futures.Executor, optional): Executor that scores the candidates, e.g. a
+			pool reused across batches; takes precedence over workers. The ground truth is sent with
+			every chunk of EXECUTOR_CHUNK_SIZE candidates.
+		parser_backend (str, optional): 'ply' or 'descent'. Defaults to 'ply'.
+		use_atom_cache (bool, optional): Memoize atom distances within each process. Defaults to True.
+		generate_feedback (bool, optional): Set the feedback of every result. Defaults to False.
+		log_dir (str, optional): Directory (created if needed) where every candidate's comparison is
+			logged, in the file named by log_file_name. Defaults to None (no logs).
+
+	Returns:
+		BatchResult: One CandidateResult per candidate file, in the order of the resolved candidates.
+		The similarities are those of parse_and_compute_distance; candidates that could not be read
+		or scored have their error set instead.
+	"""
+	if ground_event_description is None:
+		with open(ground_rules_file) as f:
+			ground_event_description = f.read()
+	ground_event_description = normalize_source(ground_event_description)
+	_, ground_ed_partitions = parse_event_description(ground_event_description, True, parser_backend)
+	ground_digest = hashlib.sha256(ground_event_description.encode('utf-8')).hexdigest()
+	ground_partitions_cache.put(ground_digest, ground_ed_partitions)
+	paths = resolve_candidates(candidates)
+	if log_dir is not None:
+		os.makedirs(log_dir, exist_ok=True)
+
+	if executor is None and (workers is None or workers <= 1):
+		return BatchResult([score_file(path, ground_ed_partitions, parser_backend, use_atom_cache, generate_feedback,
+									   log_dir) for path in paths])
+
+	ground_partitions = {key: compile_event_description(partition) for key, partition in ground_ed_partitions.items()}
+	options = (parser_backend, use_atom_cache, generate_feedback, log_dir)
+
+	def collect(chunks, futures):
+		results = []
+		for chunk, future in zip(chunks, futures):
+			try:
+				results.extend(future.result())
+			except Exception as e:
+				# e.g. a worker process that died
+				results.extend(CandidateResult(path, error=f'{type(e).__name__}: {e}') for path in chunk)
+		return BatchResult(results)
+
+	if executor is not None:
+		chunks = _chunks(paths)
+		return collect(chunks, [executor.submit(score_candidates, chunk, ground_digest, ground_partitions, *options)
+								for chunk in chunks])
+	with ProcessPoolExecutor(max_workers=workers, initializer=_set_ground,
+							 initargs=(ground_digest, ground_partitions)) as pool:
+		# Only the path and the digest of the ground truth are sent with each candidate
+		futures = [pool.submit(score_candidates, [path], ground_digest, None, *options) for path in paths]
+		return collect([[path] for path in paths], futures)
+
+
+class SimilarityMatrix:
+	''' All-pairs similarities of a corpus of event descriptions.
+
+	Attributes:
+		paths (list): The programs, in the order of the rows and columns.
+		overall (np.ndarray): N x N event description similarities; overall[i, j] is the similarity
+			of program i, as the generated event description, to program j, as the ground truth.
+		concepts (dict): Concept key -> N x N array of the similarities of that concept, i.e. the
+			similarities dict of parse_and_compute_distance, with NaN where the dict has no entry for
+			the concept (e.g. concepts defined only in the generated program).
+		errors (dict): Index -> error of the programs that could not be read or parsed; their rows
+			and columns are NaN.
+		pair_errors (dict): (i, j) -> error of the ordered pairs that could not be scored (NaN).
+	'''
+
+	def __init__(self, paths, overall, concepts, errors, pair_errors):
+		self.paths = paths
+		self.overall = overall
+		self.concepts = concepts
+		self.errors = errors
+		self.pair_errors = pair_errors
+
+
+def score_row(row, corpus_digest, corpus=None, use_atom_cache=True):
+	''' Worker entry point: scores program row against every program from row on, in both orientations.
+
+	corpus is the list of compact partitions of the programs (None for programs that failed), needed
+	only if this process has not decoded the corpus with corpus_digest yet. Returns a list of
+	(column, similarities of row against column, similarities of column against row) with the
+	similarities as (average similarity, similarities dict, error).
+	'''
+	programs = corpus_cache.get(corpus_digest)
+	if programs is None:
+		programs = _decode_corpus(corpus)
+		corpus_cache.put(corpus_digest, programs)
+	scores = []
+	for column in range(row, len(programs)):
+		if programs[column] is None:
+			continue
+		forward = _score_pair(programs[row], programs[column], use_atom_cache)
+		backward = forward if column == row else _score_pair(programs[column], programs[row], use_atom_cache)
+		scores.append((column, forward, backward))
+	return scores
+
+
+def score_rows(rows, corpus_digest, corpus, use_atom_cache=True):
+	''' Worker entry point for an executor of the caller: score_row of every row of a chunk. '''
+	return [score_row(row, corpus_digest, corpus, use_atom_cache) for row in rows]
+
+
+def _score_pair(gen_ed_partitions, ground_ed_partitions, use_atom_cache):
+	# (similarity, similarities dict, error) of one orientation of a pair
+	try:
+		result = score_partitions(None, gen_ed_partitions, ground_ed_partitions, use_atom_cache)
+		return result.similarity, result.similarities, None
+	except Exception as e:
+		return None, dict(), f'{type(e).__name__}: {e}'
+
+
+def _decode_corpus(corpus):
+	return [None if partitions is None else {key: partition.to_event_description() for key, partition in partitions.items()}
+			for partitions in corpus]
+
+
+def _set_corpus(corpus_digest, corpus):
+	# Initializer of the processes of the pool created by similarity_matrix
+	corpus_cache.put(corpus_digest, _decode_corpus(corpus))
+
+
+def similarity_matrix(programs, workers=None, executor=None, parser_backend='ply', use_atom_cache=True):
+	"""
+	Compute the similarities between every ordered pair of programs of a corpus.
+
+	Every program is parsed and partitioned once. The metric is not symmetric (concepts are counted
+	from the ground truth side), so each unordered pair is scored in both orientations by the same task;
+	the tasks are the rows of the upper triangle.
+
+	Args:
+		programs: A directory (its *.prolog files), a glob pattern, a file, or a list of these.
+		workers (int, optional): If greater than 1, rows are scored in a pool of that many processes,
+			which receive the corpus once. Defaults to None (serial).
+		executor (concurrent.futures.Executor, optional): Executor that scores the rows; the corpus is
+			sent with every chunk of EXECUTOR_CHUNK_SIZE rows. Takes precedence over workers.
+		parser_backend (str, optional): 'ply' or 'descent'. Defaults to 'ply'.
+		use_atom_cache (bool, optional): Memoize atom distances within each process. Defaults to True.
+
+	Returns:
+		SimilarityMatrix: overall[i, j] equals the similarity that parse_and_compute_distance computes
+		with program i as the generated and program j as the ground event description.
+	"""
+	paths = resolve_candidates(programs)
+	n = len(paths)
+	partitions = []
+	errors = dict()
+	digest = hashlib.sha256()
+	for index, path in enumerate(paths):
+		try:
+			with open(path) as f:
+				source = normalize_source(f.read())
+			partitions.append(parse_event_description(source, False, parser_backend)[1])
+			digest.update(hashlib.sha256(source.encode('utf-8')).digest())
+		except Exception as e:
+			partitions.append(None)
+			errors[index] = f'{type(e).__name__}: {e}'
+			digest.update(b'-')
+	corpus_digest = digest.hexdigest()
+	rows = [row for row in range(n) if row not in errors]
+
+	if executor is None and (workers is None or workers <= 1):
+		corpus_cache.put(corpus_digest, partitions)
+		row_scores = [score_row(row, corpus_digest, None, use_atom_cache) for row in rows]
+	else:
+		corpus = [None if partition is None else {key: compile_event_description(event_description)
+												  for key, event_description in partition.items()}
+				  for partition in partitions]
+		if executor is not None:
+			# The rows of the upper triangle get shorter, so every chunk takes rows from the whole range
+			chunk_count = -(-len(rows) // EXECUTOR_CHUNK_SIZE)
+			chunks = [rows[start::chunk_count] for start in range(chunk_count)]
+			futures = [executor.submit(score_rows, chunk, corpus_digest, corpus, use_atom_cache) for chunk in chunks]
+			scores_by_row = {row: scores for chunk, future in zip(chunks, futures)
+							 for row, scores in zip(chunk, future.result())}
+			row_scores = [scores_by_row[row] for row in rows]
+		else:
+			with ProcessPoolExecutor(max_workers=workers, initializer=_set_corpus,
+									 initargs=(corpus_digest, corpus)) as pool:
+				row_scores = [future.result() for future in
+							  [pool.submit(score_row, row, corpus_digest, None, use_atom_cache) for row in rows]]
+
+	overall = np.full((n, n), np.nan)
+	concepts = dict()
+	pair_errors = dict()
+
+	def store(i, j, score):
+		similarity, similarities, error = score
+		if error is not None:
+			pair_errors[(i, j)] = error
+			return
+		overall[i, j] = similarity
+		for key, concept_similarity in similarities.items():
+			if key not in concepts:
+				concepts[key] = np.full((n, n), np.nan)
+			concepts[key][i, j] = concept_similarity
+
+	for row, scores in zip(rows, row_scores):
+		for column, forward, backward in scores:
+			store(row, column, forward)
+			store(column, row, backward)
+	return SimilarityMatrix(paths, overall, concepts, errors, pair_errors)
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+import threading
+
+
+class LRUCache:
+	''' A bounded least-recently-used mapping with hit/miss/eviction counters.
+
+	The cache is bounded by the number of entries (max_entries) and/or by the total size of its
+	values (max_bytes), where the size of a value is the size argument given to put. A bound that
+	is None is not enforced.
+	'''
+
+	def __init__(self, max_entries=128, max_bytes=None):
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.entries = OrderedDict()
+		self.total_bytes = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.lock = threading.Lock()
+
+	def __len__(self):
+		return len(self.entries)
+
+	def __contains__(self, key):
+		return key in self.entries
+
+	def get(self, key, default=None):
+		with self.lock:
+			if key in self.entries:
+				self.entries.move_to_end(key)
+				self.hits += 1
+				return self.entries[key][0]
+			self.misses += 1
+			return default
+
+	def put(self, key, value, size=0):
+		with self.lock:
+			if key in self.entries:
+				self.total_bytes -= self.entries.pop(key)[1]
+			if self.max_bytes is not None and size > self.max_bytes:
+				# The value would evict everything else and still not fit.
+				return
+			self.entries[key] = (value, size)
+			self.total_bytes += size
+			self._evict()
+
+	def _evict(self):
+		while (self.max_entries is not None and len(self.entries) > self.max_entries) or \
+			  (self.max_bytes is not None and self.total_bytes > self.max_bytes):
+			_, (_, evicted_size) = self.entries.popitem(last=False)
+			self.total_bytes -= evicted_size
+			self.evictions += 1
+
+	def resize(self, max_entries=None, max_bytes=None):
+		''' Changes the bounds of the cache, evicting the least recently used entries if necessary. '''
+		with self.lock:
+			self.max_entries = max_entries
+			self.max_bytes = max_bytes
+			self._evict()
+
+	def clear(self):
+		''' Removes every entry and resets the counters. '''
+		with self.lock:
+			self.entries.clear()
+			self.total_bytes = 0
+			self.hits = 0
+			self.misses = 0
+			self.evictions = 0
+
+	def stats(self):
+		lookups = self.hits + self.misses
+		return {
+			'entries': len(self.entries),
+			'bytes': self.total_bytes,
+			'hits': self.hits,
+			'misses': self.misses,
+			'evictions': self.evictions,
+			'hit_rate': self.hits / lookups if lookups > 0 else 0.0
+		}
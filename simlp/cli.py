@@ -0,0 +1,112 @@
+# Command line interface: the simlp console script, also run as python -m simlp <command> ...
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .rtec_parser import PARSER_BACKENDS
+
+
+def serve_jsonl_command(args):
+	from .serve import serve_jsonl
+	ground = None
+	if args.ground is not None:
+		with open(args.ground) as f:
+			ground = f.read()
+	serve_jsonl(sys.stdin, sys.stdout, ground, args.jobs, args.max_in_flight, args.order, args.parser_backend,
+				not args.no_atom_cache)
+	return 0
+
+
+def score_command(args):
+	from .batch import evaluate_corpus, resolve_candidates, BatchResult
+
+	grounds = resolve_candidates(args.ground)
+	if not grounds:
+		raise SystemExit(f"simlp: no ground truth found in {' '.join(args.ground)}")
+	results = []
+	executor = ProcessPoolExecutor(max_workers=args.jobs) if args.jobs > 1 else None
+	try:
+		for ground in grounds:
+			log_dir = None
+			if not args.no_log:
+				# One log per candidate, in a subdirectory per ground truth if there are several
+				log_dir = args.log_dir if len(grounds) == 1 else os.path.join(args.log_dir, os.path.basename(ground))
+			batch = evaluate_corpus(args.generated, ground_rules_file=ground, executor=executor,
+									parser_backend=args.parser_backend, use_atom_cache=not args.no_atom_cache,
+									generate_feedback=args.feedback, log_dir=log_dir)
+			results.extend((ground, candidate) for candidate in batch)
+	finally:
+		if executor is not None:
+			executor.shutdown()
+
+	if args.format == 'json':
+		json.dump([dict(candidate.to_dict(), ground=ground) for ground, candidate in results], sys.stdout, indent=2)
+		sys.stdout.write("\n")
+	else:
+		columns = ('ground',) + BatchResult.COLUMNS + (('feedback',) if args.feedback else ())
+		writer = csv.DictWriter(sys.stdout, columns, extrasaction='ignore')
+		writer.writeheader()
+		for ground, candidate in results:
+			for row in BatchResult([candidate]).rows():
+				row['ground'] = ground
+				for column in ('matching', 'distances'):
+					if row[column] is not None:
+						row[column] = ' '.join(str(value) for value in row[column])
+				if row['concept'] is None:
+					row['feedback'] = candidate.feedback
+				writer.writerow(row)
+	return 1 if any(not candidate.ok for _, candidate in results) else 0
+
+
+def build_parser():
+	parser = argparse.ArgumentParser(prog='simlp', description='Similarity metric for RTEC event descriptions.')
+	parser.add_argument('--profile', action='store_true',
+						help='profile the command in this process and print the statistics to stderr')
+	commands = parser.add_subparsers(dest='command', required=True)
+
+	score = commands.add_parser('score', help='score generated event descriptions against ground truths',
+								description='Scores every generated event description against every ground truth '
+											'and writes the similarities to stdout.')
+	score.add_argument('generated', nargs='+', help='generated programs: files, directories (their *.prolog '
+												   'files) or glob patterns')
+	score.add_argument('-g', '--ground', nargs='+', required=True, help='ground truths: files, directories or '
+																		'glob patterns')
+	score.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes (default: 1)')
+	score.add_argument('--format', choices=('json', 'csv'), default='json', help='output format (default: json)')
+	score.add_argument('--feedback', action='store_true', help='include the feedback for every candidate')
+	score.add_argument('--log-dir', default='logs', help='directory of the per-candidate logs (default: logs)')
+	score.add_argument('--no-log', action='store_true', help='do not write logs')
+	score.add_argument('--parser-backend', choices=PARSER_BACKENDS, default='ply')
+	score.add_argument('--no-atom-cache', action='store_true', help='do not memoize atom distances')
+	score.set_defaults(run=score_command)
+
+	serve = commands.add_parser('serve-jsonl', help='score comparison requests read as JSON lines from stdin',
+								description='Reads one JSON request per line from stdin and writes one JSON '
+											'result per line to stdout.')
+	serve.add_argument('--ground', help='ground truth of the requests that do not name one')
+	serve.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes (default: 1)')
+	serve.add_argument('--max-in-flight', type=int, help='requests read but not written yet (default: 4 per job)')
+	serve.add_argument('--order', choices=('input', 'completion'), default='input',
+					   help='write results in input order or as they complete (default: input)')
+	serve.add_argument('--parser-backend', choices=PARSER_BACKENDS, default='ply')
+	serve.add_argument('--no-atom-cache', action='store_true', help='do not memoize atom distances')
+	serve.set_defaults(run=serve_jsonl_command)
+	return parser
+
+
+def main(argv=None):
+	args = build_parser().parse_args(argv)
+	if not args.profile:
+		return args.run(args)
+	import cProfile
+	import pstats
+	profiler = cProfile.Profile()
+	try:
+		return profiler.runcall(args.run, args)
+	finally:
+		# Worker processes are not profiled; use --jobs 1 to profile the metric itself.
+		pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(30)
@@ -0,0 +1,98 @@
+# Compact, array-backed encoding of event descriptions.
+#
+# Every top-level atom (rule head or body literal) is stored as a preorder sequence of nodes in flat
+# NumPy arrays: symbol id, arity and the end of the subtree of each node. Rules are ranges of top-level
+# atoms, the first of which is the head. The encoding is a transport format only: it pickles to a few
+# arrays, so it is a cheap way to move programs between processes, but the distances are not computed
+# on the arrays. Workers decode the rules, whose atoms are interned again when they are rebuilt.
+
+import numpy as np
+
+from .event_description import Atom, Rule, EventDescription
+
+
+class CompactEventDescription:
+	''' An event description encoded in flat integer arrays.
+
+	Attributes:
+		symbols (list): Symbol table; symbol_ids index into it.
+		symbol_ids, arities, ends (np.ndarray): One entry per node, in preorder. ends[i] is
+			the index after the last node of the subtree rooted at node i.
+		atom_starts (np.ndarray): Index of the root node of every top-level atom.
+		rule_offsets (np.ndarray): Rule r consists of the top-level atoms
+			rule_offsets[r] .. rule_offsets[r+1]-1; the first of them is its head.
+	'''
+
+	def __init__(self, symbols, symbol_ids, arities, ends, atom_starts, rule_offsets):
+		self.symbols = symbols
+		self.symbol_ids = symbol_ids
+		self.arities = arities
+		self.ends = ends
+		self.atom_starts = atom_starts
+		self.rule_offsets = rule_offsets
+
+	def __len__(self):
+		return len(self.rule_offsets) - 1
+
+	def rule_atoms(self, rule_index):
+		''' Returns the root nodes of the head and the body atoms of a rule. '''
+		return self.atom_starts[self.rule_offsets[rule_index]:self.rule_offsets[rule_index+1]]
+
+	def name(self, node):
+		return self.symbols[self.symbol_ids[node]]
+
+	def children(self, node):
+		''' Yields the root nodes of the arguments of a node. '''
+		child = node + 1
+		for _ in range(self.arities[node]):
+			yield child
+			child = self.ends[child]
+
+	def to_atom(self, node):
+		return Atom(self.name(node), [self.to_atom(child) for child in self.children(node)])
+
+	def to_rule(self, rule_index):
+		head, *body = [self.to_atom(node) for node in self.rule_atoms(rule_index)]
+		return Rule(head, body)
+
+	def to_event_description(self):
+		event_description = EventDescription()
+		for rule_index in range(len(self)):
+			event_description.rules.append(self.to_rule(rule_index))
+		return event_description
+
+
+def compile_event_description(event_description):
+	''' Encodes an EventDescription into a CompactEventDescription. '''
+	symbol_table = dict()
+	symbols = []
+	symbol_ids, arities, ends = [], [], []
+	atom_starts = []
+	rule_offsets = [0]
+
+	def encode(atom):
+		node = len(symbol_ids)
+		symbol_id = symbol_table.get(atom.predicateName)
+		if symbol_id is None:
+			symbol_id = symbol_table[atom.predicateName] = len(symbols)
+			symbols.append(atom.predicateName)
+		symbol_ids.append(symbol_id)
+		arities.append(len(atom.args))
+		ends.append(0)
+		for arg in atom.args:
+			encode(arg)
+		ends[node] = len(symbol_ids)
+
+	for rule in event_description.rules:
+		for atom in [rule.head] + list(rule.body):
+			atom_starts.append(len(symbol_ids))
+			encode(atom)
+		rule_offsets.append(len(atom_starts))
+
+	return CompactEventDescription(symbols,
+								   np.array(symbol_ids, dtype=np.int32),
+								   np.array(arities, dtype=np.int32),
+								   np.array(ends, dtype=np.int32),
+								   np.array(atom_starts, dtype=np.int32),
+								   np.array(rule_offsets, dtype=np.int32))
+
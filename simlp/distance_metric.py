@@ -3,20 +3,27 @@
 
 from .event_description import Atom, Rule
 import numpy as np
-from scipy.optimize import linear_sum_assignment
-from copy import deepcopy
+from .assignment import linear_sum_assignment
 import logging
-from .atom_utils import atomIsVar, var_is_singleton, atomIsConst, atomIsComp, compute_var_routes, get_lists_size_and_pad
+from time import perf_counter
+from .cache import LRUCache
+from .atom_utils import get_padded_views, VAR, CONST, COMPOUND, atom_kind, RuleAnalysis, analyze_rule, \
+	route_signature, singleton_vars, signature_key
 
-# Moved to atom_utils.py to avoid circular imports
+# Padding of the shorter body and the shorter event description
+PAD_ATOM = Atom("&", [])
+DUMMY_RULE = Rule(Atom("_dummy_rule", []), [])
 
 def var_distance(var1, var2, var_routes1, var_routes2):
-	if var_is_singleton(var1, var_routes1) and var_is_singleton(var2, var_routes2):
+	# Variables starting with _ are not recorded in the var routes and are always singletons
+	singleton1 = var1[0] == "_" or var1 in singleton_vars(var_routes1)
+	singleton2 = var2[0] == "_" or var2 in singleton_vars(var_routes2)
+	if singleton1 and singleton2:
 		return 0
-	elif var_is_singleton(var1, var_routes1) or var_is_singleton(var2, var_routes2):
+	elif singleton1 or singleton2:
 		return 1
 	# Case: Both variables appear in the same atoms wrt nesting.
-	elif sorted(var_routes1[var1])==sorted(var_routes2[var2]):
+	elif route_signature(var1, var_routes1)==route_signature(var2, var_routes2):
 		return 0
 	else:
 		return 1
@@ -36,53 +43,251 @@ def comp_atom_distance(atom1, atom2, var_routes1, var_routes2, logger):
 		return 1
 
 def atom_distance(atom1, atom2, var_routes1, var_routes2, logger):
-	if atomIsVar(atom1) and atomIsVar(atom2):
+	# Rule analyses carry precomputed kinds; plain var routes do not.
+	kind1 = var_routes1.kind(atom1) if isinstance(var_routes1, RuleAnalysis) else atom_kind(atom1)
+	kind2 = var_routes2.kind(atom2) if isinstance(var_routes2, RuleAnalysis) else atom_kind(atom2)
+	if kind1 & kind2 & VAR:
 		return var_distance(atom1.predicateName, atom2.predicateName, var_routes1, var_routes2)
-	elif atomIsConst(atom1) and atomIsConst(atom2): 
+	elif kind1 & kind2 & CONST:
 		return const_distance(atom1.predicateName, atom2.predicateName)
-	elif atomIsComp(atom1) and atomIsComp(atom2):
+	elif kind1 & kind2 & COMPOUND:
 		return comp_atom_distance(atom1, atom2, var_routes1, var_routes2, logger)
 	else:
 		return 1
 
-def pad_lists(list1, list2, pad_item):
-	def pad_list(mylist, n):
-		for _ in range(n):
-			mylist.append(pad_item)
-	if len(list1)>len(list2):
-		pad_list(list2, len(list1)-len(list2))
-	elif len(list2)>len(list1):
-		pad_list(list1, len(list2)-len(list1))
-
-# Moved to atom_utils.py to avoid circular imports
+# Memoized distances between compound atoms, shared by all comparisons in the process.
+# Inspect it with atom_distance_cache.stats() and bound it with atom_distance_cache.resize(max_entries=...).
+atom_distance_cache = LRUCache(max_entries=65536)
+
+def cached_atom_distance(atom1, atom2, var_routes1, var_routes2, logger, atom_cache=atom_distance_cache):
+	''' atom_distance, memoized in atom_cache when both var routes are RuleAnalysis objects.
+
+	The cache key is made of both atoms and their contexts, i.e. the route signatures of the variables
+	they contain, since these are all that var_distance depends on. atom_cache=None disables memoization.
+	'''
+	if atom_cache is None or not (isinstance(var_routes1, RuleAnalysis) and isinstance(var_routes2, RuleAnalysis)) or \
+	   not var_routes1.kind(atom1) & var_routes2.kind(atom2) & COMPOUND:
+		return atom_distance(atom1, atom2, var_routes1, var_routes2, logger)
+	key = (atom1, atom2, var_routes1.context(atom1), var_routes2.context(atom2))
+	distance = atom_cache.get(key)
+	if distance is None:
+		distance = atom_distance(atom1, atom2, var_routes1, var_routes2, logger)
+		atom_cache.put(key, distance)
+	return distance
+
+PAD_KEY = signature_key(PAD_ATOM)
+
+def build_cost_matrix(m, distance, candidates, known=1.0):
+	''' Builds an m x m cost matrix whose cell (i, j) is distance(i, j) where candidates[i, j] is True.
+
+	The other cells are taken from known (a scalar or an array broadcastable to m x m), so distance is
+	only called for the cells whose value is not known in advance.
+	'''
+	c_array = np.empty((m, m))
+	c_array[...] = known
+	for i, j in zip(*np.nonzero(candidates)):
+		c_array[i, j] = distance(i, j)
+	return c_array
+
+def atom_candidates(keys1, vars1, keys2, vars2):
+	''' Cells that need atom_distance: atoms with different (predicate, arity) signatures are at distance 1,
+	unless both are variables. '''
+	return (keys1[:, None] == keys2[None, :]) | (vars1[:, None] & vars2[None, :])
+
+def atom_signatures(atoms):
+	''' Returns the signature keys of the atoms and whether each atom is a variable, as NumPy arrays. '''
+	keys = np.array([signature_key(atom) for atom in atoms], dtype=np.int64)
+	variables = np.array([bool(atom_kind(atom) & VAR) for atom in atoms], dtype=bool)
+	return keys, variables
+
+def padded_body_signatures(analysis, m):
+	keys = np.full(m, PAD_KEY, dtype=np.int64)
+	keys[:len(analysis.body_keys)] = analysis.body_keys
+	variables = np.zeros(m, dtype=bool)
+	variables[:len(analysis.body_vars)] = analysis.body_vars
+	return keys, variables
+
+def dummy_rule_distance(rule):
+	''' The distance between a rule and DUMMY_RULE if it follows from the length of the body, otherwise None.
+
+	This is the case when the head of the rule is not a variable and the body does not contain PAD_ATOM,
+	so that the heads and all the body atoms are at distance 1.
+	'''
+	analysis = analyze_rule(rule)
+	n = len(rule.body)
+	if n == 0 or analysis.kind(rule.head) & VAR or PAD_ATOM in rule.body:
+		return None
+	# Same operations as rule_distance, so that the result is identical.
+	return 1/(n+1)*(1 + n*1.0)
+
+def rule_cost_matrix(rules1, rules2, m, logger, atom_cache=atom_distance_cache, body_assignments=None, stats=None):
+	''' Builds the matrix of rule distances between two lists of rules padded with DUMMY_RULE to length m.
+
+	The cells that pair a rule with DUMMY_RULE are computed from the length of the rule body when possible.
+	If body_assignments is a dict, the BodyAssignment of every computed cell (i, j) is stored in it.
+	The rule distances are counted in stats, a stats.PerformanceStats, if it is given.
+	'''
+	known, is_known = padding_cost_matrix(rules1, rules2, m)
+	if stats is not None:
+		stats.cells['rule_matrix'] += m * m
+	distance = rule_distance_function(rules1, rules2, logger, atom_cache, body_assignments, stats)
+	return build_cost_matrix(m, distance, ~is_known, known)
+
+def padding_cost_matrix(rules1, rules2, m):
+	''' Returns (known, is_known): the distances of the cells that pair a rule with DUMMY_RULE and follow
+	from the length of the rule body (see dummy_rule_distance), and the mask of these cells. '''
+	def padding_distances(rules):
+		distances = np.full(m, np.nan)
+		is_dummy = np.zeros(m, dtype=bool)
+		for i in range(m):
+			if rules[i] is DUMMY_RULE:
+				is_dummy[i] = True
+			else:
+				distance = dummy_rule_distance(rules[i])
+				if distance is not None:
+					distances[i] = distance
+		return distances, is_dummy
+
+	distances1, is_dummy1 = padding_distances(rules1)
+	distances2, is_dummy2 = padding_distances(rules2)
+	known1 = is_dummy1[:, None] & ~np.isnan(distances2)[None, :]
+	known2 = ~np.isnan(distances1)[:, None] & is_dummy2[None, :]
+	return np.where(known1, distances2[None, :], distances1[:, None]), known1 | known2
+
+def rule_distance_function(rules1, rules2, logger, atom_cache, body_assignments, stats):
+	''' The function (i, j) -> rule_distance(rules1[i], rules2[j]) of the cells of a rule cost matrix. '''
+	if body_assignments is None:
+		return lambda i, j: rule_distance(rules1[i], rules2[j], logger, atom_cache, stats=stats)
+	def distance(i, j):
+		distance, body_assignments[(i, j)] = rule_distance(rules1[i], rules2[j], logger, atom_cache, True, stats)
+		return distance
+	return distance
+
+def rule_distance_lower_bounds(rules1, rules2, m):
+	''' Lower bounds of the distances between two lists of rules padded with DUMMY_RULE to length m.
+
+	Heads with different signatures (unless both are variables) are at distance 1, and so are body atoms
+	of different classes (see RuleAnalysis.body_classes) and padding atoms. The number of atom pairs of
+	the same class thus bounds the body assignment of every rule pair from below without solving it.
+	'''
+	analyses1 = [analyze_rule(rule) for rule in rules1]
+	analyses2 = [analyze_rule(rule) for rule in rules2]
+	classes = dict()
+	for analysis in analyses1 + analyses2:
+		for body_class in analysis.body_classes:
+			classes.setdefault(body_class, len(classes))
+
+	def signatures(rules, analyses):
+		counts = np.zeros((m, len(classes)), dtype=np.int64)
+		for i, analysis in enumerate(analyses):
+			for body_class, count in analysis.body_classes.items():
+				counts[i, classes[body_class]] = count
+		lengths = np.array([len(rule.body) for rule in rules])
+		head_keys = np.array([signature_key(rule.head) for rule in rules], dtype=np.int64)
+		head_vars = np.array([bool(analysis.kind(rule.head) & VAR) for rule, analysis in zip(rules, analyses)])
+		return counts, lengths, head_keys, head_vars
+
+	counts1, lengths1, head_keys1, head_vars1 = signatures(rules1, analyses1)
+	counts2, lengths2, head_keys2, head_vars2 = signatures(rules2, analyses2)
+	compatible_pairs = np.empty((m, m))
+	for i in range(m):
+		compatible_pairs[i] = np.minimum(counts1[i], counts2).sum(axis=1)
+	body_length = np.maximum(lengths1[:, None], lengths2[None, :])
+	head_distance = (head_keys1[:, None] != head_keys2[None, :]) & ~(head_vars1[:, None] & head_vars2[None, :])
+	return (head_distance + body_length - compatible_pairs) / (body_length + 1)
 
+def approximate_rule_assignment(rules1, rules2, m, logger, atom_cache, body_assignments, stats, approximate):
+	''' Builds the rule cost matrix and its assignment as configured by approximate, an ApproximateAssignment.
 
-def rule_distance(rule1, rule2, logger):
+	Only the distances between every generated rule and the approximate.k ground rules with the lowest
+	lower bounds (see rule_distance_lower_bounds) are computed, then the assignment of the matrix whose
+	other cells hold their lower bounds is solved by approximate.method, and the distances of the
+	assigned pairs that were only bounded are computed. As the lower bound of the solver bounds the
+	optimal assignment of the true distances from below as well, it bounds the approximation gap.
 
-	var_routes1 = compute_var_routes(rule1)
-	var_routes2 = compute_var_routes(rule2)
+	Returns:
+		tuple: (cost_matrix, row_ind, col_ind, similarity_gap), where the cells of cost_matrix that were
+		not computed are NaN and similarity_gap bounds how much higher the similarity of the optimal
+		assignment can be.
+	'''
+	if stats is not None:
+		stage_start = perf_counter()
+		stats.cells['rule_matrix'] += m * m
+	known, is_known = padding_cost_matrix(rules1, rules2, m)
+	lower = rule_distance_lower_bounds(rules1, rules2, m)
+	lower[is_known] = known[is_known]
+	if approximate.k is None or approximate.k >= m:
+		candidates = ~is_known
+	else:
+		candidates = np.zeros((m, m), dtype=bool)
+		nearest = np.argpartition(lower, approximate.k - 1, axis=1)[:, :approximate.k]
+		candidates[np.arange(m)[:, None], nearest] = True
+		candidates &= ~is_known
+	distance = rule_distance_function(rules1, rules2, logger, atom_cache, body_assignments, stats)
+	c_array = build_cost_matrix(m, distance, candidates, np.where(is_known, known, np.nan))
+	if stats is not None:
+		stats.seconds['cost_matrix'] += perf_counter() - stage_start
+		stage_start = perf_counter()
+
+	row_ind, col_ind, lower_bound = approximate.solve(np.where(np.isnan(c_array), lower, c_array))
+	if stats is not None:
+		stats.seconds['assignment'] += perf_counter() - stage_start
+		stage_start = perf_counter()
+
+	for i in np.nonzero(np.isnan(c_array[row_ind, col_ind]))[0]:
+		c_array[i, col_ind[i]] = distance(i, col_ind[i])
+	if stats is not None:
+		stats.seconds['cost_matrix'] += perf_counter() - stage_start
+	similarity_gap = max(0.0, c_array[row_ind, col_ind].sum() - lower_bound) / m
+	return c_array, row_ind, col_ind, similarity_gap
+
+
+class BodyAssignment:
+	''' The body cost matrix of a rule pair and its optimal assignment, as computed by rule_distance. '''
+	__slots__ = ('cost_matrix', 'row_ind', 'col_ind')
+
+	def __init__(self, cost_matrix, row_ind, col_ind):
+		self.cost_matrix = cost_matrix
+		self.row_ind = row_ind
+		self.col_ind = col_ind
+
+def rule_distance(rule1, rule2, logger, atom_cache=atom_distance_cache, return_body_assignment=False, stats=None):
+	''' Distance between two rules; with return_body_assignment=True, returns (distance, BodyAssignment).
+
+	The call and the atom distances and assignment it computes are counted in stats, if it is given.
+	'''
+
+	var_routes1 = analyze_rule(rule1)
+	var_routes2 = analyze_rule(rule2)
 
 	head1 = rule1.head
 	head2 = rule2.head
 	
-	head_distance = atom_distance(head1, head2, var_routes1, var_routes2, logger)
+	heads_compared = signature_key(head1) == signature_key(head2) or bool(var_routes1.kind(head1) & var_routes2.kind(head2) & VAR)
+	if not heads_compared:
+		head_distance = 1
+	else:
+		head_distance = cached_atom_distance(head1, head2, var_routes1, var_routes2, logger, atom_cache)
 	#logger.info("Distance between rule heads: ")
 	#logger.info(head_distance)
 
-	body1 = deepcopy(rule1.body)
-	body2 = deepcopy(rule2.body)
-
-	m, k = get_lists_size_and_pad(body1, body2, Atom("&", []))
+	body1, body2, m, k = get_padded_views(rule1.body, rule2.body, PAD_ATOM)
 	
-	c_array = np.array([[0.0 for _ in range(m)] for _ in range(m)])
-
-	for i in range(m):
-		for j in range(m):
-			c_array[i][j] = atom_distance(body1[i], body2[j], var_routes1, var_routes2, logger)
+	keys1, vars1 = padded_body_signatures(var_routes1, m)
+	keys2, vars2 = padded_body_signatures(var_routes2, m)
+	candidates = atom_candidates(keys1, vars1, keys2, vars2)
+	c_array = build_cost_matrix(m,
+								lambda i, j: cached_atom_distance(body1[i], body2[j], var_routes1, var_routes2, logger, atom_cache),
+								candidates)
 	#logger.info("Body atom distances: ")
 	#logger.info(c_array)
 
 	row_ind, col_ind = linear_sum_assignment(c_array)
+	if stats is not None:
+		stats.calls['rule_distance'] += 1
+		stats.calls['atom_distance'] += heads_compared + int(np.count_nonzero(candidates))
+		stats.calls['linear_sum_assignment'] += 1
+		stats.cells['body_matrix'] += m * m
 	#logger.info("Optimal Body Condition Assignment: ")
 	#logger.info(col_ind)
 
@@ -104,9 +309,12 @@ def rule_distance(rule1, rule2, logger):
 	#logger.info("Similarity of rules: ")
 	#logger.info(rule_similarity)
 
+	if return_body_assignment:
+		return rule_distance, BodyAssignment(c_array, row_ind, col_ind)
 	return rule_distance
 
-def event_description_distance(event_description1, event_description2, logger, generate_feedback=False):
+def event_description_distance(event_description1, event_description2, logger, generate_feedback=False, atom_cache=atom_distance_cache,
+							   approximate=None):
 	"""
 	Calculate the distance between two event descriptions (sets of Prolog rules).
 	
@@ -121,6 +329,11 @@ def event_description_distance(event_description1, event_description2, logger, g
 		logger (logging.Logger): Logger instance for recording detailed comparison information.
 		generate_feedback (bool, optional): If True, generates detailed actionable feedback
 			for improving the generated rules. Defaults to False.
+		atom_cache (LRUCache, optional): Cache of atom distances shared across rule pairs and
+			comparisons. Defaults to atom_distance_cache; None disables memoization.
+		approximate (ApproximateAssignment, optional): If given and the event descriptions have at least
+			approximate.exact_below rules, the rule assignment is approximate (see
+			approximate_rule_assignment). Defaults to None (optimal assignment).
 	
 	Returns:
 		tuple: A 4-tuple containing:
@@ -157,10 +370,107 @@ def event_description_distance(event_description1, event_description2, logger, g
 		>>> print(f"Similarity: {similarity:.2%}")
 	"""
 
-	rules1 = event_description1.rules
-	rules2 = event_description2.rules
-
-	m, k = get_lists_size_and_pad(rules1, rules2, Rule(Atom("_dummy_rule", []), []))
+	return compare_event_descriptions(event_description1, event_description2, logger, generate_feedback,
+									  atom_cache, approximate=approximate).as_tuple()
+
+class ComparisonResult:
+	''' Everything computed by one comparison of two event descriptions, see compare_event_descriptions.
+
+	Attributes:
+		event_description1, event_description2 (EventDescription): The compared event descriptions.
+		rules1, rules2 (PaddedView): The rules of both event descriptions, padded with DUMMY_RULE.
+		cost_matrix (np.ndarray): The rule distances; with an approximate assignment, NaN where they were
+			not computed.
+		row_ind, col_ind (np.ndarray): The optimal rule assignment.
+		similarity (float): The similarity of the event descriptions.
+		similarity_gap (float or None): With an approximate assignment, a bound of how much higher the
+			similarity of the optimal assignment can be; None when the assignment is optimal.
+		body_assignments (dict): (i, j) -> BodyAssignment of rules1[i] and rules2[j], for the rule
+			pairs whose distance was computed; recorded only when feedback is requested.
+		feedback_data (dict or None): The feedback of FeedbackGenerator.generate_event_description_feedback,
+			once generate_feedback has been called.
+		formatted_feedback (str or None): feedback_data formatted by FeedbackGenerator.format_feedback_for_llm,
+			once format_feedback has been called.
+		stats (PerformanceStats or None): The stats of the comparison, if it was instrumented.
+	'''
+
+	def __init__(self, event_description1, event_description2, rules1, rules2, cost_matrix, row_ind, col_ind,
+				 similarity, body_assignments=None, similarity_gap=None):
+		self.event_description1 = event_description1
+		self.event_description2 = event_description2
+		self.rules1 = rules1
+		self.rules2 = rules2
+		self.cost_matrix = cost_matrix
+		self.row_ind = row_ind
+		self.col_ind = col_ind
+		self.similarity = similarity
+		self.similarity_gap = similarity_gap
+		self.body_assignments = body_assignments if body_assignments is not None else dict()
+		self.feedback_data = None
+		self.formatted_feedback = None
+		self.stats = None
+		self._feedback_generator = None
+
+	@property
+	def distances(self):
+		''' Distances of the matched rule pairs. '''
+		return self.cost_matrix[self.row_ind, self.col_ind]
+
+	def as_tuple(self):
+		''' The 4-tuple returned by event_description_distance. '''
+		return self.col_ind, self.distances, self.similarity, self.feedback_data
+
+	def feedback_generator(self, logger=None, atom_cache=None):
+		''' The FeedbackGenerator of this comparison, created on the first call. '''
+		if self._feedback_generator is None:
+			# Import here to avoid circular dependency
+			from .feedback_generator import FeedbackGenerator
+			self._feedback_generator = FeedbackGenerator(logger, atom_cache, self.stats)
+		return self._feedback_generator
+
+	def generate_feedback(self, logger=None, atom_cache=None):
+		''' Returns feedback_data, generating it from the recorded assignments on the first call. '''
+		if self.feedback_data is None:
+			if self.stats is not None:
+				start = perf_counter()
+			self.feedback_data = self.feedback_generator(logger, atom_cache).generate_event_description_feedback(
+				self.event_description1, self.event_description2, self)
+			if self.stats is not None:
+				self.stats.seconds['feedback'] += perf_counter() - start
+		return self.feedback_data
+
+	def format_feedback(self, logger=None, atom_cache=None):
+		''' Returns formatted_feedback, generating and formatting feedback_data on the first call. '''
+		if self.formatted_feedback is None:
+			feedback_data = self.generate_feedback(logger, atom_cache)
+			if self.stats is not None:
+				start = perf_counter()
+			self.formatted_feedback = self.feedback_generator().format_feedback_for_llm(feedback_data)
+			if self.stats is not None:
+				self.stats.seconds['feedback'] += perf_counter() - start
+		return self.formatted_feedback
+
+def compare_event_descriptions(event_description1, event_description2, logger, generate_feedback=False,
+							   atom_cache=atom_distance_cache, defer_feedback=False, instrument=False, approximate=None):
+	''' Computes and logs what event_description_distance does, and returns it as a ComparisonResult.
+
+	With generate_feedback=True, the body assignments of the rule pairs are recorded and the feedback is
+	generated from this result, instead of computing the cost matrices again. With defer_feedback=True as
+	well, the feedback is neither generated nor logged; ComparisonResult.generate_feedback generates it
+	when it is needed. With instrument=True, the result carries the PerformanceStats of the comparison.
+	With approximate, an ApproximateAssignment, concepts with at least approximate.exact_below rules are
+	compared by approximate_rule_assignment instead of the optimal assignment of all rule distances.
+	'''
+	stats = None
+	if instrument:
+		from .stats import PerformanceStats, cache_counts
+		stats = PerformanceStats()
+		start = perf_counter()
+		if atom_cache is not None:
+			atom_cache_counts = cache_counts(atom_cache)
+
+	# Pad by index; the event descriptions may be shared (e.g. cached ground truth).
+	rules1, rules2, m, k = get_padded_views(event_description1.rules, event_description2.rules, DUMMY_RULE)
 
 	logger.info("Generated Definition: ")
 	logger.info(event_description1)
@@ -169,29 +479,44 @@ def event_description_distance(event_description1, event_description2, logger, g
 	logger.info(event_description2)
 	logger.info("")
 
-	c_array = np.array([[0.0 for _ in range(m)] for _ in range(m)])
-
-	for i in range(m):
-		for j in range(m):
-			#logger.info("\nComparing rules:\n " + str(rules1[i]) + " and\n" + str(rules2[j]))
-			c_array[i][j] = rule_distance(rules1[i], rules2[j], logger)
+	body_assignments = dict() if generate_feedback else None
+	similarity_gap = None
+	if approximate is not None and approximate.applies(m):
+		c_array, row_ind, col_ind, similarity_gap = approximate_rule_assignment(
+			rules1, rules2, m, logger, atom_cache, body_assignments, stats, approximate)
+	else:
+		if stats is not None:
+			stage_start = perf_counter()
+		c_array = rule_cost_matrix(rules1, rules2, m, logger, atom_cache, body_assignments, stats)
+		if stats is not None:
+			stats.seconds['cost_matrix'] += perf_counter() - stage_start
 
 	logger.info("Rule distances: ")
 	logger.info(c_array)
 	logger.info("\n")
 
-	row_ind, col_ind = linear_sum_assignment(c_array)
+	if similarity_gap is None:
+		if stats is not None:
+			stage_start = perf_counter()
+		row_ind, col_ind = linear_sum_assignment(c_array)
+		if stats is not None:
+			stats.seconds['assignment'] += perf_counter() - stage_start
+			stats.calls['linear_sum_assignment'] += 1
+	else:
+		logger.info("Approximate rule assignment (%s): the similarity is at most %s below the optimal one",
+					approximate, similarity_gap)
 	logger.info("Optimal Rule Assignment: ")
 	logger.info(col_ind)
 	logger.info("\n")
 
-	for i in range(len(col_ind)):
+	# Messages are formatted by the logger, only if it is enabled
+	for i in range(len(col_ind) if logger.isEnabledFor(logging.INFO) else 0):
 		logger.info("We matched rule:")
-		logger.info(event_description1.rules[i])
-		logger.info("which has the distance array: " + str(c_array[i]) + "\n") 
+		logger.info(rules1[i])
+		logger.info("which has the distance array: %s\n", c_array[i]) 
 		logger.info("with the following rule: ")
-		logger.info(event_description2.rules[col_ind[i]])
-		logger.info("Their distance is: " + str(c_array[i, col_ind[i]]) + "\n")
+		logger.info(rules2[col_ind[i]])
+		logger.info("Their distance is: %s\n", c_array[i, col_ind[i]])
 		logger.info("\n")
 
 	optimal_dist_sum = c_array[row_ind, col_ind].sum()
@@ -207,18 +532,23 @@ def event_description_distance(event_description1, event_description2, logger, g
 	logger.info(event_description_similarity)
 	logger.info("")
 	
+	comparison = ComparisonResult(event_description1, event_description2, rules1, rules2, c_array, row_ind, col_ind,
+								  event_description_similarity, body_assignments, similarity_gap)
+	comparison.stats = stats
+
 	# Generate feedback if requested
-	feedback_data = None
-	if generate_feedback:
-		# Import here to avoid circular dependency
-		from .feedback_generator import FeedbackGenerator
-		feedback_gen = FeedbackGenerator(logger)
-		feedback_data = feedback_gen.generate_event_description_feedback(event_description1, event_description2)
-		formatted_feedback = feedback_gen.format_feedback_for_llm(feedback_data)
+	if generate_feedback and not defer_feedback:
+		comparison.format_feedback(logger, atom_cache)
 		logger.info("\n\n=== AUTOMATED FEEDBACK FOR LLM ===\n")
-		logger.info(formatted_feedback)
+		logger.info(comparison.formatted_feedback)
 		logger.info("\n=== END OF FEEDBACK ===\n")
 
-	return col_ind, c_array[row_ind, col_ind], event_description_similarity, feedback_data
-
-
+	if stats is not None:
+		stats.total_seconds = perf_counter() - start
+		stats.seconds['logging'] = stats.total_seconds - stats.seconds['cost_matrix'] - stats.seconds['assignment'] \
+			- stats.seconds['feedback']
+		stats.matrix_size = m
+		stats.similarity_gap = similarity_gap
+		if atom_cache is not None:
+			stats.add_cache_lookups('atom_distance_cache', atom_cache, atom_cache_counts)
+	return comparison
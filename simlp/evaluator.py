@@ -0,0 +1,148 @@
+# Evaluation sessions against a fixed ground truth.
+#
+# A refinement loop scores many generated programs against the same ground truth. An Evaluator parses,
+# partitions and analyzes the ground truth once, keeps the compact encoding of the ground
+# partitions for worker processes and, if asked, its own process pool, and then runs only the part of
+# parse_and_compute_distance that depends on the generated program.
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from .atom_utils import analyze_rule
+from .compact import compile_event_description
+from .rtec_parser import PARSER_BACKENDS
+from .run import parse_event_description, compare_partitions, setup_logger
+
+
+class Evaluator:
+	"""Scores generated event descriptions against one preloaded ground truth.
+
+	Args:
+		ground (str, optional): Prolog code of the ground truth event description.
+		ground_rules_file (str, optional): Path to the ground truth, used if ground is None.
+		generate_feedback (bool, optional): Default of evaluate. Defaults to False.
+		parser_backend (str, optional): 'ply' or 'descent'. Defaults to 'ply'.
+		use_cache (bool, optional): Reuse parsed generated programs through
+			run.event_description_cache. Defaults to True.
+		use_atom_cache (bool, optional): Memoize atom distances in distance_metric.atom_distance_cache.
+			Defaults to True.
+		workers (int, optional): If greater than 1, the shared concepts are evaluated in a process pool
+			that the evaluator starts on first use and keeps until close(). Defaults to None (serial).
+		executor (concurrent.futures.Executor, optional): Executor that evaluates the shared concepts;
+			takes precedence over workers and is not shut down by close(). Defaults to None.
+		feedback_report (bool, optional): Return the feedback as a FeedbackReport. Defaults to False.
+		log_file (str, optional): Default log file of evaluate; None writes no file. Defaults to None.
+		log_level (int, optional): Level of the log file; ignored without one. Defaults to logging.INFO.
+		trace (bool, optional): Log the per-concept trace. Defaults to True.
+		approximate (ApproximateAssignment, optional): Compare the concepts with many rules with an
+			approximate rule assignment, as parse_and_compute_distance does. Defaults to None.
+
+	Raises:
+		ValueError: If parser_backend is unknown.
+		ParseError, OSError: If the ground truth cannot be read or parsed.
+
+	Example:
+		>>> with Evaluator(ground_rules_file='rules/rtec/maritime_rules.prolog') as evaluator:
+		...     for program in programs:
+		...         matching, distances, similarity, feedback = evaluator.evaluate(program)
+	"""
+
+	def __init__(self, ground=None, ground_rules_file=None, generate_feedback=False, parser_backend='ply',
+				 use_cache=True, use_atom_cache=True, workers=None, executor=None, feedback_report=False,
+				 log_file=None, log_level=logging.INFO, trace=True, approximate=None):
+		if parser_backend not in PARSER_BACKENDS:
+			raise ValueError(f"Unknown parser backend {parser_backend!r}; expected one of {PARSER_BACKENDS}")
+		if ground is None:
+			with open(ground_rules_file) as f:
+				ground = f.read()
+		self.generate_feedback = generate_feedback
+		self.parser_backend = parser_backend
+		self.use_cache = use_cache
+		self.use_atom_cache = use_atom_cache
+		self.workers = workers
+		self.executor = executor
+		self.feedback_report = feedback_report
+		self.log_file = log_file
+		self.log_level = log_level
+		self.trace = trace
+		self.approximate = approximate
+		self.owned_executor = None
+
+		# The evaluator keeps its own reference, so the ground truth outlives its event_description_cache entry.
+		self.ground_event_description, self.ground_partitions = parse_event_description(ground, use_cache, parser_backend)
+		for rule in self.ground_event_description.rules:
+			analyze_rule(rule)
+		self.compact_ground_partitions = None
+		if executor is not None or (workers is not None and workers > 1):
+			self.compact_ground_partitions = {key: compile_event_description(partition)
+											  for key, partition in self.ground_partitions.items()}
+
+	def evaluate(self, generated=None, generated_rules_file=None, log_file=None, generate_feedback=None, stats=None):
+		"""Compare a generated event description with the ground truth.
+
+		Args:
+			generated (str, optional): Prolog code of the generated event description.
+			generated_rules_file (str, optional): Path to it, used if generated is None.
+			log_file (str, optional): Log file of this call, instead of the log file of the evaluator.
+			generate_feedback (bool, optional): Overrides generate_feedback for this call.
+			stats (PerformanceStats, optional): Filled with the stats of this call, as by
+				parse_and_compute_distance; the ground truth was parsed by the constructor.
+
+		Returns:
+			tuple: The 4-tuple of parse_and_compute_distance: (optimal_matching, distances, similarity,
+				feedback), or (None, None, None, None) if the generated event description cannot be
+				read or parsed.
+		"""
+		if log_file is None:
+			log_file = self.log_file
+		if generate_feedback is None:
+			generate_feedback = self.generate_feedback
+		if stats is not None:
+			start = perf_counter()
+		logger, handler = setup_logger(log_file, self.log_level)
+		try:
+			try:
+				if generated is None:
+					with open(generated_rules_file) as f:
+						generated = f.read()
+				generated_event_description, gen_ed_partitions = parse_event_description(generated, self.use_cache,
+																						  self.parser_backend, stats)
+			except Exception as e:
+				logger.error(f"Error parsing generated event description: {e}")
+				return None, None, None, None
+			for error in generated_event_description.errors:
+				logger.warning(f"Skipped malformed clause in generated event description at {error}")
+			for error in self.ground_event_description.errors:
+				logger.warning(f"Skipped malformed clause in ground event description at {error}")
+
+			return compare_partitions(logger, gen_ed_partitions, self.ground_partitions, generate_feedback,
+									  self.use_atom_cache, None, self._executor(), self.feedback_report, self.trace,
+									  self.compact_ground_partitions, stats, self.approximate)
+		finally:
+			if handler is not None:
+				logger.removeHandler(handler)
+				handler.close()
+			if stats is not None:
+				stats.total_seconds += perf_counter() - start
+
+	def _executor(self):
+		if self.executor is not None:
+			return self.executor
+		if self.workers is not None and self.workers > 1:
+			if self.owned_executor is None:
+				self.owned_executor = ProcessPoolExecutor(max_workers=self.workers)
+			return self.owned_executor
+		return None
+
+	def close(self):
+		''' Shuts down the process pool started by the evaluator, if any. '''
+		if self.owned_executor is not None:
+			self.owned_executor.shutdown()
+			self.owned_executor = None
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
@@ -1,7 +1,43 @@
+import sys
+import weakref
+
 class Atom:
-	def __init__(self, predicateName, args):
-		self.predicateName = predicateName
-		self.args= args
+	''' An immutable, hash-consed term: predicate name and tuple of argument atoms.
+
+	Atoms are interned when they are constructed, so structurally identical terms are the same
+	object, predicate names are interned strings and every atom keeps its hash. Equality and hashing
+	are therefore O(1) for interned atoms.
+	'''
+	__slots__ = ('predicateName', 'args', '_hash', '__weakref__')
+
+	_interned = weakref.WeakValueDictionary()
+
+	def __new__(cls, predicateName, args):
+		key = (sys.intern(predicateName), tuple(args))
+		atom = cls._interned.get(key)
+		if atom is None:
+			atom = object.__new__(cls)
+			object.__setattr__(atom, 'predicateName', key[0])
+			object.__setattr__(atom, 'args', key[1])
+			object.__setattr__(atom, '_hash', hash(key))
+			atom = cls._interned.setdefault(key, atom)
+		return atom
+
+	def __setattr__(self, name, value):
+		raise AttributeError("Atom is immutable")
+
+	def __delattr__(self, name):
+		raise AttributeError("Atom is immutable")
+
+	def __reduce__(self):
+		# Unpickled atoms are interned in the receiving process.
+		return (Atom, (self.predicateName, self.args))
+
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
 
 	def __repr__(self):
 		if len(self.args)>0:
@@ -10,17 +46,28 @@ class Atom:
 			return f'{self.predicateName}'
 
 	def __eq__(self, other):
+		if self is other:
+			return True
 		if not isinstance(other, Atom):
 			return False
-		return self.predicateName == other.predicateName and self.args == other.args
+		# Only reached for atoms interned concurrently by different threads
+		return self._hash == other._hash and self.predicateName == other.predicateName and self.args == other.args
 
 	def __hash__(self):
-		return hash(self.predicateName + str(self.args))
+		return self._hash
 
 class Rule:
 	def __init__(self, head, body):
 		self.head = head
 		self.body = body
+		# Cached atom_utils.RuleAnalysis, see atom_utils.analyze_rule
+		self.analysis = None
+
+	def __getstate__(self):
+		# The analysis is recomputed on demand rather than pickled.
+		state = self.__dict__.copy()
+		state['analysis'] = None
+		return state
 
 	def __repr__(self):
 		return f'{self.head} :- \n\t' + ',\n\t'.join(map(str,self.body)) + '.\n'
@@ -28,6 +75,8 @@ class Rule:
 class EventDescription:
 	def __init__(self):
 		self.rules = []
+		# Syntax errors (rtec_parser.ParseError) of the clauses that were skipped while parsing
+		self.errors = []
 	
 	def add_rule(self, head, body):
 		self.rules.append(Rule(head, body))
@@ -4,17 +4,16 @@
 from .event_description import Atom, Rule, EventDescription
 from .atom_utils import (
     atomIsVar, atomIsConst, atomIsComp, 
-    compute_var_routes, get_lists_size_and_pad
+    compute_var_routes, get_padded_views, analyze_rule
 )
-from scipy.optimize import linear_sum_assignment
+from .assignment import linear_sum_assignment
 import numpy as np
-from copy import deepcopy
 import logging
 
 # Import atom_distance separately to avoid circular import
 def get_atom_distance():
-    from .distance_metric import atom_distance
-    return atom_distance
+    from .distance_metric import cached_atom_distance
+    return cached_atom_distance
 
 class RuleFeedback:
     """Container for feedback about a single rule comparison"""
@@ -53,8 +52,12 @@ class RuleFeedback:
 class FeedbackGenerator:
     """Generates detailed feedback for LLM rule generation"""
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, atom_cache=None, stats=None):
         self.logger = logger or logging.getLogger(__name__)
+        # Cache of atom distances (distance_metric.atom_distance_cache), or None
+        self.atom_cache = atom_cache
+        # stats.PerformanceStats counting the distances and assignments computed here, or None
+        self.stats = stats
     
     def generate_fluent_type_feedback(self, mismatch):
         """Generate detailed feedback for fluent definition type mismatch.
@@ -138,32 +141,44 @@ class FeedbackGenerator:
                 
         return feedback
     
-    def analyze_body_matching(self, body1, body2, var_routes1, var_routes2):
-        """Analyze body atom matching and generate feedback"""
+    def analyze_body_matching(self, body1, body2, var_routes1, var_routes2, body_assignment=None):
+        """Analyze body atom matching and generate feedback
+
+        body_assignment is the distance_metric.BodyAssignment of the two bodies, if rule_distance has
+        already computed it; otherwise the body cost matrix and its assignment are computed here.
+        """
         feedback = []
         
-        # Copy bodies to avoid modifying originals
-        body1_copy = deepcopy(body1)
-        body2_copy = deepcopy(body2)
+        # Pad bodies to the same length by index, without copying or modifying them
+        body1_padded, body2_padded, m, k = get_padded_views(body1, body2, Atom("&", []))
         
-        # Pad lists to same length
-        m, k = get_lists_size_and_pad(body1_copy, body2_copy, Atom("&", []))
-        
-        # Compute cost matrix
-        c_array = np.array([[0.0 for _ in range(m)] for _ in range(m)])
-        for i in range(m):
-            for j in range(m):
-                atom_distance = get_atom_distance()
-                c_array[i][j] = atom_distance(body1_copy[i], body2_copy[j], var_routes1, var_routes2, self.logger)
-                
-        # Find optimal matching
-        row_ind, col_ind = linear_sum_assignment(c_array)
+        if body_assignment is not None:
+            c_array, col_ind = body_assignment.cost_matrix, body_assignment.col_ind
+        else:
+            # Compute cost matrix, calling atom_distance only for atoms with matching signatures
+            from .distance_metric import build_cost_matrix, atom_candidates, atom_signatures
+            atom_distance = get_atom_distance()
+            keys1, vars1 = atom_signatures(body1_padded)
+            keys2, vars2 = atom_signatures(body2_padded)
+            candidates = atom_candidates(keys1, vars1, keys2, vars2)
+            c_array = build_cost_matrix(
+                m,
+                lambda i, j: atom_distance(body1_padded[i], body2_padded[j], var_routes1, var_routes2, self.logger, self.atom_cache),
+                candidates
+            )
+                    
+            # Find optimal matching
+            row_ind, col_ind = linear_sum_assignment(c_array)
+            if self.stats is not None:
+                self.stats.calls['atom_distance'] += int(np.count_nonzero(candidates))
+                self.stats.calls['linear_sum_assignment'] += 1
+                self.stats.cells['body_matrix'] += m * m
         
         # Generate feedback based on matching
         matched_atoms = []
         for i in range(len(col_ind)):
-            gen_atom = body1_copy[i]
-            ground_atom = body2_copy[col_ind[i]]
+            gen_atom = body1_padded[i]
+            ground_atom = body2_padded[col_ind[i]]
             distance = c_array[i, col_ind[i]]
             
             if distance > 0:
@@ -186,12 +201,12 @@ class FeedbackGenerator:
         """Analyze variable usage patterns and provide feedback"""
         feedback = []
         
-        var_routes1 = compute_var_routes(rule1)
-        var_routes2 = compute_var_routes(rule2)
+        var_routes1 = analyze_rule(rule1)
+        var_routes2 = analyze_rule(rule2)
         
         # Check for singleton variables
-        singleton_vars1 = {var for var in var_routes1 if len(var_routes1[var]) == 1}
-        singleton_vars2 = {var for var in var_routes2 if len(var_routes2[var]) == 1}
+        singleton_vars1 = var_routes1.singletons
+        singleton_vars2 = var_routes2.singletons
         
         # Check for missing underscores
         if len(singleton_vars2) > len(singleton_vars1):
@@ -201,7 +216,7 @@ class FeedbackGenerator:
                 
         return feedback, var_routes1, var_routes2
     
-    def generate_rule_feedback(self, rule1, rule2):
+    def generate_rule_feedback(self, rule1, rule2, body_assignment=None):
         """Generate comprehensive feedback for a rule pair"""
         feedback = RuleFeedback(rule1, rule2, 0)
         
@@ -211,7 +226,7 @@ class FeedbackGenerator:
                 
         # Analyze body
         body_feedback, matched_atoms = self.analyze_body_matching(
-            rule1.body, rule2.body, var_routes1, var_routes2
+            rule1.body, rule2.body, var_routes1, var_routes2, body_assignment
         )
         feedback.body_feedback.extend(body_feedback)
         
@@ -230,8 +245,12 @@ class FeedbackGenerator:
                 
         return feedback
     
-    def generate_event_description_feedback(self, generated_ed, ground_ed):
-        """Generate feedback for entire event description"""
+    def generate_event_description_feedback(self, generated_ed, ground_ed, comparison=None):
+        """Generate feedback for entire event description
+
+        comparison is the distance_metric.ComparisonResult of the two event descriptions, if they have
+        already been compared; its rule and body assignments are reused instead of being computed again.
+        """
         all_feedback = {
             'rules': [],
             'summary': {},
@@ -239,19 +258,22 @@ class FeedbackGenerator:
         }
         
         # Match rules
-        rules1 = generated_ed.rules
-        rules2 = ground_ed.rules
-        
-        m, k = get_lists_size_and_pad(rules1, rules2, Rule(Atom("_dummy_rule", []), []))
-        
-        # Compute distances for optimal matching
-        from .distance_metric import rule_distance
-        c_array = np.array([[0.0 for _ in range(m)] for _ in range(m)])
-        for i in range(m):
-            for j in range(m):
-                c_array[i][j] = rule_distance(rules1[i], rules2[j], self.logger)
-                
-        row_ind, col_ind = linear_sum_assignment(c_array)
+        # Pad the rule lists by index, since the event descriptions may be shared
+        if comparison is not None:
+            rules1, rules2 = comparison.rules1, comparison.rules2
+            c_array, col_ind = comparison.cost_matrix, comparison.col_ind
+            body_assignments = comparison.body_assignments
+        else:
+            from .distance_metric import rule_cost_matrix, DUMMY_RULE
+            rules1, rules2, m, k = get_padded_views(generated_ed.rules, ground_ed.rules, DUMMY_RULE)
+            
+            # Compute distances for optimal matching
+            body_assignments = dict()
+            c_array = rule_cost_matrix(rules1, rules2, m, self.logger, self.atom_cache, body_assignments, self.stats)
+                    
+            row_ind, col_ind = linear_sum_assignment(c_array)
+            if self.stats is not None:
+                self.stats.calls['linear_sum_assignment'] += 1
         
         # Generate feedback for each matched rule
         for i in range(len(col_ind)):
@@ -266,7 +288,7 @@ class FeedbackGenerator:
                 # LLM should have generated a rule but it didn't
                 all_feedback['overall_recommendations'].append(f" - Generated rule {str(gen_rule)} is not in the ground truth. It should not be defined.")
                 continue
-            rule_feedback = self.generate_rule_feedback(gen_rule, ground_rule)
+            rule_feedback = self.generate_rule_feedback(gen_rule, ground_rule, body_assignments.get((i, col_ind[i])))
             rule_feedback.distance = distance
             all_feedback['rules'].append(rule_feedback.to_dict())
                 
@@ -0,0 +1,159 @@
+# Structured feedback of parse_and_compute_distance, rendered on request.
+#
+# A FeedbackReport holds the fluent type mismatches and, per shared concept, the ComparisonResult of the
+# concept. The feedback of a concept (the RuleFeedback.to_dict entries, with the atom-level diffs of
+# FeedbackGenerator.analyze_atom_difference) is generated from the recorded assignments the first time
+# it is read, so a caller that only needs the similarity, or the feedback of one concept, pays for
+# nothing else.
+
+import json
+
+from .partitioner import format_concept_key
+
+
+def fluent_type_mismatch_text(mismatch):
+	''' The feedback line of a mismatch returned by partitioner.find_fluent_type_mismatches. '''
+	fluent_name = mismatch['fluent_name']
+	gen_predicates = [k[1] for k in mismatch['generated_keys']]
+	if mismatch['ground_type'] == 'static':
+		return (f"\n - FLUENT TYPE ERROR: Fluent '{fluent_name}' should be defined as a "
+				f"statically determined fluent using holdsFor/2, not as a simple fluent "
+				f"using {', '.join(gen_predicates)}. Statically determined fluents compute "
+				f"their intervals directly from conditions rather than through initiation/termination events.")
+	return (f"\n - FLUENT TYPE ERROR: Fluent '{fluent_name}' should be defined as a "
+			f"simple fluent using initiatedAt/2 and terminatedAt/2, not as a statically "
+			f"determined fluent using {', '.join(gen_predicates)}. Simple fluents are "
+			f"event-driven with explicit initiation and termination conditions.")
+
+
+class ConceptFeedback:
+	''' Feedback for one concept defined in both event descriptions.
+
+	Attributes:
+		key: The partition key of the concept, e.g. ('withinArea', 'initiatedAt').
+		comparison (ComparisonResult): The comparison of the concept, with its body assignments.
+	'''
+
+	def __init__(self, key, comparison):
+		self.key = key
+		self.comparison = comparison
+
+	@property
+	def name(self):
+		return format_concept_key(self.key)
+
+	@property
+	def similarity(self):
+		return self.comparison.similarity
+
+	@property
+	def evaluated(self):
+		''' Whether the feedback of the concept has been generated. '''
+		return self.comparison.feedback_data is not None
+
+	@property
+	def data(self):
+		''' The feedback of FeedbackGenerator.generate_event_description_feedback, generated on first access. '''
+		return self.comparison.generate_feedback()
+
+	@property
+	def rules(self):
+		''' The RuleFeedback.to_dict entries of the matched rule pairs. '''
+		return self.data['rules']
+
+	@property
+	def summary(self):
+		return self.data['summary']
+
+	@property
+	def overall_recommendations(self):
+		return self.data['overall_recommendations']
+
+	def to_text(self):
+		''' The feedback formatted by FeedbackGenerator.format_feedback_for_llm. '''
+		return self.comparison.format_feedback()
+
+	def to_dict(self):
+		return {
+			'concept': self.name,
+			'similarity': float(self.similarity),
+			'rules': [dict(rule, distance=float(rule['distance'])) for rule in self.rules],
+			'summary': dict(self.summary, average_distance=float(self.summary['average_distance'])),
+			'overall_recommendations': self.overall_recommendations
+		}
+
+	def __repr__(self):
+		return f'ConceptFeedback({self.name}, similarity={self.similarity})'
+
+
+class FeedbackReport:
+	''' Feedback of parse_and_compute_distance(..., generate_feedback=True, feedback_report=True).
+
+	Concepts are indexed by their partition key or its formatted name, e.g. report['initiatedAt/withinArea'],
+	in the order in which parse_and_compute_distance evaluated them. to_text() returns the text that
+	parse_and_compute_distance returns without feedback_report.
+
+	Attributes:
+		fluent_type_mismatches (list): The mismatches found by partitioner.find_fluent_type_mismatches.
+	'''
+
+	def __init__(self, fluent_type_mismatches=()):
+		self.fluent_type_mismatches = list(fluent_type_mismatches)
+		self.concepts = dict()
+
+	def add_concept(self, key, comparison):
+		self.concepts[key] = ConceptFeedback(key, comparison)
+
+	def keys(self):
+		return list(self.concepts.keys())
+
+	def __len__(self):
+		return len(self.concepts)
+
+	def __iter__(self):
+		return iter(self.concepts.values())
+
+	def __contains__(self, key):
+		return self._find(key) is not None
+
+	def __getitem__(self, key):
+		concept = self._find(key)
+		if concept is None:
+			raise KeyError(key)
+		return concept
+
+	def _find(self, key):
+		if key in self.concepts:
+			return self.concepts[key]
+		for concept in self.concepts.values():
+			if concept.name == key:
+				return concept
+		return None
+
+	def to_text(self):
+		text = "".join(fluent_type_mismatch_text(mismatch) for mismatch in self.fluent_type_mismatches)
+		for concept in self.concepts.values():
+			text += concept.to_text() + "\n"
+		return text
+
+	def __str__(self):
+		return self.to_text()
+
+	def to_dict(self):
+		return {
+			'fluent_type_mismatches': [{'fluent_name': mismatch['fluent_name'],
+										'generated_type': mismatch['generated_type'],
+										'ground_type': mismatch['ground_type'],
+										'feedback': fluent_type_mismatch_text(mismatch).strip()}
+									   for mismatch in self.fluent_type_mismatches],
+			'concepts': [concept.to_dict() for concept in self.concepts.values()]
+		}
+
+	def to_json(self, **kwargs):
+		''' The report as JSON; keyword arguments are passed to json.dumps. '''
+		return json.dumps(self.to_dict(), **kwargs)
+
+	def __repr__(self):
+		evaluated = sum(concept.evaluated for concept in self.concepts.values())
+		return f'FeedbackReport({len(self.concepts)} concepts, {evaluated} evaluated, ' \
+			   f'{len(self.fluent_type_mismatches)} fluent type mismatches)'
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('COMMA', 'DISJ', 'DIV', 'DOT', 'EQUAL', 'GE', 'GEQ', 'IMPL', 'IS', 'LE', 'LEQ', 'LISTEND', 'LISTSTART', 'LOWCASESTR', 'LPAREN', 'MINUS', 'NEQUAL', 'NOT', 'NUMBER', 'NUMERICEQ', 'NUMERICNEQ', 'PLUS', 'RPAREN', 'STRING', 'TIMES', 'VAR'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NOT>\\\\\\+|not\\ )|(?P<t_LOWCASESTR>(?!\\b(?:is|not)\\b)([a-z][a-zA-Z0-9_]*))|(?P<t_STRING>"([^"\\n]|(\\\\"))*"|\\\'([^"\\n]|(\\\\"))*\\\')|(?P<t_NUMBER>[+-]?[0-9]+([.][0-9]+)?)|(?P<t_VAR>[A-Z_][a-zA-Z0-9_]*)|(?P<t_ignore_MULTILINECOMMENT>/\\*[\\s\\S]*?\\*/)|(?P<t_NUMERICEQ>\\=\\:\\=)|(?P<t_NUMERICNEQ>\\=\\\\\\=)|(?P<t_ignore_LINECOMMENT>%.*\\n)|(?P<t_IMPL>\\:\\-)|(?P<t_NEQUAL>\\\\\\=)|(?P<t_GEQ>>\\=)|(?P<t_IS>is )|(?P<t_LEQ>\\=<)|(?P<t_DIV>\\/)|(?P<t_DOT>\\.)|(?P<t_EQUAL>\\=)|(?P<t_LISTEND>\\])|(?P<t_LISTSTART>\\[)|(?P<t_LPAREN>\\()|(?P<t_MINUS>\\-)|(?P<t_PLUS>\\+)|(?P<t_RPAREN>\\))|(?P<t_TIMES>\\*)|(?P<t_ignore_NL>\\n)|(?P<t_COMMA>,)|(?P<t_DISJ>;)|(?P<t_GE>>)|(?P<t_LE><)', [None, ('t_NOT', 'NOT'), (None, 'LOWCASESTR'), None, (None, 'STRING'), None, None, None, None, (None, 'NUMBER'), None, (None, 'VAR'), (None, None), (None, 'NUMERICEQ'), (None, 'NUMERICNEQ'), (None, None), (None, 'IMPL'), (None, 'NEQUAL'), (None, 'GEQ'), (None, 'IS'), (None, 'LEQ'), (None, 'DIV'), (None, 'DOT'), (None, 'EQUAL'), (None, 'LISTEND'), (None, 'LISTSTART'), (None, 'LPAREN'), (None, 'MINUS'), (None, 'PLUS'), (None, 'RPAREN'), (None, 'TIMES'), (None, None), (None, 'COMMA'), (None, 'DISJ'), (None, 'GE'), (None, 'LE')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,70 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'COMMA DISJ DIV DOT EQUAL GE GEQ IMPL IS LE LEQ LISTEND LISTSTART LOWCASESTR LPAREN MINUS NEQUAL NOT NUMBER NUMERICEQ NUMERICNEQ PLUS RPAREN STRING TIMES VAR event_description : domain_rule \n\t\t\t\t\t\t\t  | domain_rule event_description  domain_rule : atom IMPL\t\t\t\t\t\t\t\t body  body : literal DOT  body : literal COMMA body  literal : atom  literal : NOT atom  literal : NOT LPAREN args_list RPAREN  literal : atom IS atom  atom : LOWCASESTR LPAREN args_list RPAREN  atom : LPAREN args_list RPAREN  atom : term  atom : list  atom : atom DISJ atom  atom : atom comp atom  atom : atom arithmetic_operation atom  atom : MINUS atom  atom : LPAREN atom RPAREN  args_list : literal  args_list : literal COMMA args_list  list : LISTSTART args_list LISTEND  list : LISTSTART LISTEND  term : LOWCASESTR \n\t\t\t\t | VAR \n\t\t\t\t | NUMBER \n\t\t\t\t | STRING  arithmetic_operation : PLUS\n\t\t\t\t\t             | MINUS\n\t\t\t\t\t             | TIMES\n\t\t\t\t\t             | DIV  comp : EQUAL\n\t\t\t     | NEQUAL\n\t\t\t\t | EQUAL EQUAL\n\t\t\t\t | EQUAL EQUAL EQUAL\n\t\t\t     | NUMERICEQ\n\t\t\t     | NUMERICNEQ\n\t\t\t     | GE\n\t\t\t     | GEQ\n\t\t\t     | LE\n\t\t\t     | LEQ '
+    
+_lr_action_items = {'LOWCASESTR':([0,2,5,8,12,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,34,39,44,48,49,51,53,54,55,60,],[4,4,4,4,4,4,4,4,4,-31,-32,-35,-36,-37,-38,-39,-40,-27,-28,-29,-30,4,4,-3,-33,4,4,4,-4,4,-34,-5,]),'LPAREN':([0,2,4,5,8,12,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,34,39,44,48,49,51,53,54,55,60,],[5,5,30,5,5,5,5,5,5,5,-31,-32,-35,-36,-37,-38,-39,-40,-27,-28,-29,-30,5,51,-3,-33,5,5,5,-4,5,-34,-5,]),'MINUS':([0,2,3,4,5,6,7,8,9,10,11,12,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,32,34,35,37,38,39,41,42,43,44,46,47,48,49,50,51,52,53,54,55,56,57,60,61,],[8,8,27,-23,8,-12,-13,8,-24,-25,-26,8,8,8,8,8,-31,-32,-35,-36,-37,-38,-39,-40,-27,-28,-29,-30,8,27,8,27,-22,27,-3,27,27,27,-33,-11,-18,8,8,27,8,-21,-4,8,-34,-10,27,-5,-11,]),'VAR':([0,2,5,8,12,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,34,39,44,48,49,51,53,54,55,60,],[9,9,9,9,9,9,9,9,9,-31,-32,-35,-36,-37,-38,-39,-40,-27,-28,-29,-30,9,9,-3,-33,9,9,9,-4,9,-34,-5,]),'NUMBER':([0,2,5,8,12,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,34,39,44,48,49,51,53,54,55,60,],[10,10,10,10,10,10,10,10,10,-31,-32,-35,-36,-37,-38,-39,-40,-27,-28,-29,-30,10,10,-3,-33,10,10,10,-4,10,-34,-5,]),'STRING':([0,2,5,8,12,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,34,39,44,48,49,51,53,54,55,60,],[11,11,11,11,11,11,11,11,11,-31,-32,-35,-36,-37,-38,-39,-40,-27,-28,-29,-30,11,11,-3,-33,11,11,11,-4,11,-34,-5,]),'LISTSTART':([0,2,5,8,12,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,34,39,44,48,49,51,53,54,55,60,],[12,12,12,12,12,12,12,12,12,-31,-32,-35,-36,-37,-38,-39,-40,-27,-28,-29,-30,12,12,-3,-33,12,12,12,-4,12,-34,-5,]),'$end':([1,2,13,39,53,60,],[0,-1,-2,-3,-4,-5,]),'IMPL':([3,4,6,7,9,10,11,35,37,41,42,43,46,47,52,56,],[14,-23,-12,-13,-24,-25,-26,-17,-22,-14,-15,-16,-11,-18,-21,-10,]),'DISJ':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[15,-23,-12,-13,-24,-25,-26,15,15,-22,15,15,15,15,-11,-18,15,-21,-10,15,-11,]),'EQUAL':([3,4,6,7,9,10,11,18,32,35,37,38,41,42,43,44,46,47,50,52,56,57,61,],[18,-23,-12,-13,-24,-25,-26,44,18,18,-22,18,18,18,18,55,-11,-18,18,-21,-10,18,-11,]),'NEQUAL':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[19,-23,-12,-13,-24,-25,-26,19,19,-22,19,19,19,19,-11,-18,19,-21,-10,19,-11,]),'NUMERICEQ':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[20,-23,-12,-13,-24,-25,-26,20,20,-22,20,20,20,20,-11,-18,20,-21,-10,20,-11,]),'NUMERICNEQ':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[21,-23,-12,-13,-24,-25,-26,21,21,-22,21,21,21,21,-11,-18,21,-21,-10,21,-11,]),'GE':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[22,-23,-12,-13,-24,-25,-26,22,22,-22,22,22,22,22,-11,-18,22,-21,-10,22,-11,]),'GEQ':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[23,-23,-12,-13,-24,-25,-26,23,23,-22,23,23,23,23,-11,-18,23,-21,-10,23,-11,]),'LE':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[24,-23,-12,-13,-24,-25,-26,24,24,-22,24,24,24,24,-11,-18,24,-21,-10,24,-11,]),'LEQ':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[25,-23,-12,-13,-24,-25,-26,25,25,-22,25,25,25,25,-11,-18,25,-21,-10,25,-11,]),'PLUS':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[26,-23,-12,-13,-24,-25,-26,26,26,-22,26,26,26,26,-11,-18,26,-21,-10,26,-11,]),'TIMES':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[28,-23,-12,-13,-24,-25,-26,28,28,-22,28,28,28,28,-11,-18,28,-21,-10,28,-11,]),'DIV':([3,4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,50,52,56,57,61,],[29,-23,-12,-13,-24,-25,-26,29,29,-22,29,29,29,29,-11,-18,29,-21,-10,29,-11,]),'RPAREN':([4,6,7,9,10,11,31,32,33,35,37,38,41,42,43,45,46,47,50,52,56,57,58,59,61,],[-23,-12,-13,-24,-25,-26,46,47,-19,-17,-22,-6,-14,-15,-16,56,-11,-18,-7,-21,-10,-9,-20,61,-8,]),'IS':([4,6,7,9,10,11,32,35,37,38,41,42,43,46,47,52,56,],[-23,-12,-13,-24,-25,-26,48,-17,-22,48,-14,-15,-16,-11,-18,-21,-10,]),'COMMA':([4,6,7,9,10,11,32,33,35,37,38,40,41,42,43,46,47,50,52,56,57,61,],[-23,-12,-13,-24,-25,-26,-6,49,-17,-22,-6,54,-14,-15,-16,-11,-18,-7,-21,-10,-9,-8,]),'LISTEND':([4,6,7,9,10,11,12,33,35,36,37,38,41,42,43,46,47,50,52,56,57,58,61,],[-23,-12,-13,-24,-25,-26,37,-19,-17,52,-22,-6,-14,-15,-16,-11,-18,-7,-21,-10,-9,-20,-8,]),'DOT':([4,6,7,9,10,11,35,37,38,40,41,42,43,46,47,50,52,56,57,61,],[-23,-12,-13,-24,-25,-26,-17,-22,-6,53,-14,-15,-16,-11,-18,-7,-21,-10,-9,-8,]),'NOT':([5,12,14,30,49,51,54,],[34,34,34,34,34,34,34,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'event_description':([0,2,],[1,13,]),'domain_rule':([0,2,],[2,2,]),'atom':([0,2,5,8,12,14,15,16,17,30,34,48,49,51,54,],[3,3,32,35,38,38,41,42,43,38,50,57,38,32,38,]),'term':([0,2,5,8,12,14,15,16,17,30,34,48,49,51,54,],[6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,]),'list':([0,2,5,8,12,14,15,16,17,30,34,48,49,51,54,],[7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,]),'comp':([3,32,35,38,41,42,43,50,57,],[16,16,16,16,16,16,16,16,16,]),'arithmetic_operation':([3,32,35,38,41,42,43,50,57,],[17,17,17,17,17,17,17,17,17,]),'args_list':([5,12,30,49,51,],[31,36,45,58,59,]),'literal':([5,12,14,30,49,51,54,],[33,33,40,33,33,33,40,]),'body':([14,54,],[39,60,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> event_description","S'",1,None,None,None),
+  ('event_description -> domain_rule','event_description',1,'p_event_description','rtec_parser.py',33),
+  ('event_description -> domain_rule event_description','event_description',2,'p_event_description','rtec_parser.py',34),
+  ('domain_rule -> atom IMPL body','domain_rule',3,'p_domain_rule','rtec_parser.py',39),
+  ('body -> literal DOT','body',2,'p_singleton_body','rtec_parser.py',44),
+  ('body -> literal COMMA body','body',3,'p_body','rtec_parser.py',48),
+  ('literal -> atom','literal',1,'p_positive_literal','rtec_parser.py',52),
+  ('literal -> NOT atom','literal',2,'p_negative_literal1','rtec_parser.py',56),
+  ('literal -> NOT LPAREN args_list RPAREN','literal',4,'p_negative_literal2','rtec_parser.py',60),
+  ('literal -> atom IS atom','literal',3,'p_is_literal','rtec_parser.py',64),
+  ('atom -> LOWCASESTR LPAREN args_list RPAREN','atom',4,'p_atom','rtec_parser.py',68),
+  ('atom -> LPAREN args_list RPAREN','atom',3,'p_atom_comma','rtec_parser.py',74),
+  ('atom -> term','atom',1,'p_atom_term','rtec_parser.py',80),
+  ('atom -> list','atom',1,'p_atom_list','rtec_parser.py',84),
+  ('atom -> atom DISJ atom','atom',3,'p_atom_disj','rtec_parser.py',88),
+  ('atom -> atom comp atom','atom',3,'p_atom_comp','rtec_parser.py',94),
+  ('atom -> atom arithmetic_operation atom','atom',3,'p_arithmetic_expression_op','rtec_parser.py',100),
+  ('atom -> MINUS atom','atom',2,'p_arithmetic_expression_minus','rtec_parser.py',104),
+  ('atom -> LPAREN atom RPAREN','atom',3,'p_arithmetic_expression_paren','rtec_parser.py',108),
+  ('args_list -> literal','args_list',1,'p_args_list_singleton_atom','rtec_parser.py',118),
+  ('args_list -> literal COMMA args_list','args_list',3,'p_args_list_many_atom','rtec_parser.py',133),
+  ('list -> LISTSTART args_list LISTEND','list',3,'p_list','rtec_parser.py',143),
+  ('list -> LISTSTART LISTEND','list',2,'p_list_empty','rtec_parser.py',147),
+  ('term -> LOWCASESTR','term',1,'p_term','rtec_parser.py',151),
+  ('term -> VAR','term',1,'p_term','rtec_parser.py',152),
+  ('term -> NUMBER','term',1,'p_term','rtec_parser.py',153),
+  ('term -> STRING','term',1,'p_term','rtec_parser.py',154),
+  ('arithmetic_operation -> PLUS','arithmetic_operation',1,'p_arithmetic_operation','rtec_parser.py',158),
+  ('arithmetic_operation -> MINUS','arithmetic_operation',1,'p_arithmetic_operation','rtec_parser.py',159),
+  ('arithmetic_operation -> TIMES','arithmetic_operation',1,'p_arithmetic_operation','rtec_parser.py',160),
+  ('arithmetic_operation -> DIV','arithmetic_operation',1,'p_arithmetic_operation','rtec_parser.py',161),
+  ('comp -> EQUAL','comp',1,'p_comp','rtec_parser.py',165),
+  ('comp -> NEQUAL','comp',1,'p_comp','rtec_parser.py',166),
+  ('comp -> EQUAL EQUAL','comp',2,'p_comp','rtec_parser.py',167),
+  ('comp -> EQUAL EQUAL EQUAL','comp',3,'p_comp','rtec_parser.py',168),
+  ('comp -> NUMERICEQ','comp',1,'p_comp','rtec_parser.py',169),
+  ('comp -> NUMERICNEQ','comp',1,'p_comp','rtec_parser.py',170),
+  ('comp -> GE','comp',1,'p_comp','rtec_parser.py',171),
+  ('comp -> GEQ','comp',1,'p_comp','rtec_parser.py',172),
+  ('comp -> LE','comp',1,'p_comp','rtec_parser.py',173),
+  ('comp -> LEQ','comp',1,'p_comp','rtec_parser.py',174),
+]
@@ -26,6 +26,20 @@ def get_fluent_name(key):
 	return None
 
 
+def format_concept_key(key):
+	"""Format a partition key for display.
+	
+	Args:
+		key: A partition key, either a tuple (fluent_name, predicate_type) or "other"
+	
+	Returns:
+		str: e.g. 'initiatedAt/withinArea' for ('withinArea', 'initiatedAt'), or the key itself
+	"""
+	if isinstance(key, tuple):
+		return f'{key[1]}/{key[0]}'
+	return str(key)
+
+
 def get_fluent_definition_type(key):
 	"""Get the definition type (simple vs static) from a partition key.
 	
@@ -0,0 +1,245 @@
+# Threshold and top-k queries over event description similarity.
+#
+# parse_and_compute_distance solves every body and rule assignment of every shared concept. When only
+# the outcome of a comparison matters (does a generated program reach a similarity threshold, which k
+# candidates are the most similar to the ground truth), cheap bounds on the similarity of each concept
+# usually decide it, and only the concepts that can still change the outcome are evaluated exactly.
+
+import logging
+
+import numpy as np
+from .assignment import linear_sum_assignment
+
+from .atom_utils import analyze_rule, get_padded_views, signature_key
+from .distance_metric import (atom_distance_cache, cached_atom_distance, dummy_rule_distance,
+							  event_description_distance, rule_distance, DUMMY_RULE, PAD_ATOM)
+from .run import parse_event_description, concept_plan
+
+logger = logging.getLogger(__name__)
+
+# Slack added to every bound, so that rounding never excludes the exact value.
+BOUND_SLACK = 1e-9
+
+PAD_CLASS = signature_key(PAD_ATOM)
+
+
+class BoundedSimilarity:
+	''' Similarity of a generated event description to the ground truth, known to lie in [lower, upper].
+
+	Attributes:
+		lower, upper (float): Bounds of the similarity; they are equal if exact is True.
+		exact (bool): Whether every shared concept was evaluated exactly, in which case lower and upper
+			are the similarity computed by parse_and_compute_distance.
+		concepts_evaluated (int): Number of shared concepts evaluated exactly.
+		concepts_total (int): Number of concepts defined in both event descriptions.
+	'''
+
+	def __init__(self, lower, upper, exact, concepts_evaluated, concepts_total):
+		self.lower = lower
+		self.upper = upper
+		self.exact = exact
+		self.concepts_evaluated = concepts_evaluated
+		self.concepts_total = concepts_total
+
+	@property
+	def similarity(self):
+		''' The exact similarity, or None if it is only bounded. '''
+		return self.lower if self.exact else None
+
+	def __repr__(self):
+		if self.exact:
+			return f'BoundedSimilarity(similarity={self.lower}, exact)'
+		return f'BoundedSimilarity(lower={self.lower}, upper={self.upper}, ' \
+			   f'evaluated {self.concepts_evaluated} of {self.concepts_total} concepts)'
+
+
+class ThresholdResult(BoundedSimilarity):
+	''' Result of similarity_at_least: reached is whether the similarity is at least the threshold. '''
+
+	def __init__(self, reached, bounds):
+		super().__init__(bounds.lower, bounds.upper, bounds.exact, bounds.concepts_evaluated, bounds.concepts_total)
+		self.reached = reached
+
+	def __bool__(self):
+		return self.reached
+
+	def __repr__(self):
+		return f'ThresholdResult(reached={self.reached}, ' + super().__repr__() + ')'
+
+
+class RankedCandidate(BoundedSimilarity):
+	''' Entry of the result of top_k: index is the position of the candidate in the candidates list. '''
+
+	def __init__(self, index, bounds):
+		super().__init__(bounds.lower, bounds.upper, bounds.exact, bounds.concepts_evaluated, bounds.concepts_total)
+		self.index = index
+
+	def __repr__(self):
+		return f'RankedCandidate(index={self.index}, ' + super().__repr__() + ')'
+
+
+def rule_distance_bounds(rule1, rule2, atom_cache=atom_distance_cache):
+	''' Returns (lower, upper) bounds of rule_distance(rule1, rule2) without solving the body assignment.
+
+	The head distance is computed exactly. In the body, padding atoms and atoms of different classes
+	(signatures, or variables) are at distance 1, which bounds the optimal assignment from below, while
+	pairing identical plain atoms whose variables have the same context, at distance 0, bounds it from above.
+	'''
+	if rule1 is DUMMY_RULE or rule2 is DUMMY_RULE:
+		distance = dummy_rule_distance(rule2 if rule1 is DUMMY_RULE else rule1)
+		if distance is not None:
+			return distance, distance
+	m = max(len(rule1.body), len(rule2.body))
+	if m == 0:
+		distance = rule_distance(rule1, rule2, logger, atom_cache)
+		return distance, distance
+	analysis1 = analyze_rule(rule1)
+	analysis2 = analyze_rule(rule2)
+	head_distance = cached_atom_distance(rule1.head, rule2.head, analysis1, analysis2, logger, atom_cache)
+	classes1 = analysis1.body_classes.copy()
+	classes2 = analysis2.body_classes.copy()
+	classes1[PAD_CLASS] += m - len(rule1.body)
+	classes2[PAD_CLASS] += m - len(rule2.body)
+	compatible_pairs = sum((classes1 & classes2).values())
+	zero_pairs = sum(count for atom, count in (analysis1.plain_body_atoms & analysis2.plain_body_atoms).items()
+					 if analysis1.context(atom) == analysis2.context(atom))
+	lower = 1/(m+1)*(head_distance + m - compatible_pairs)
+	upper = 1/(m+1)*(head_distance + m - zero_pairs)
+	return max(0.0, lower - BOUND_SLACK), min(1.0, upper + BOUND_SLACK)
+
+
+def concept_similarity_bounds(event_description1, event_description2, atom_cache=atom_distance_cache):
+	''' Returns (lower, upper) bounds of the similarity computed by event_description_distance. '''
+	rules1, rules2, m, _ = get_padded_views(event_description1.rules, event_description2.rules, DUMMY_RULE)
+	lower_distances = np.empty((m, m))
+	upper_distances = np.empty((m, m))
+	for i in range(m):
+		for j in range(m):
+			lower_distances[i, j], upper_distances[i, j] = rule_distance_bounds(rules1[i], rules2[j], atom_cache)
+	# Any assignment bounds the optimal one from above; row and column minima bound it from below.
+	row_ind, col_ind = linear_sum_assignment(upper_distances)
+	upper_sum = upper_distances[row_ind, col_ind].sum()
+	lower_sum = max(lower_distances.min(axis=1).sum(), lower_distances.min(axis=0).sum())
+	return max(0.0, 1 - upper_sum/m - BOUND_SLACK), min(1.0, 1 - lower_sum/m + BOUND_SLACK)
+
+
+class SimilarityEvaluation:
+	''' Incremental evaluation of the similarity of a generated event description to the ground truth.
+
+	The concepts are combined as in parse_and_compute_distance: the similarity is the sum of the
+	similarities of the shared concepts over the number of ground concepts (including concepts missing
+	from the generated event description and concepts with a mismatched fluent type).
+	'''
+
+	def __init__(self, generated_event_description, ground_event_description, use_cache=True,
+				 parser_backend='ply', atom_cache=atom_distance_cache):
+		_, self.gen_partitions = parse_event_description(generated_event_description, use_cache, parser_backend)
+		_, self.ground_partitions = parse_event_description(ground_event_description, use_cache, parser_backend)
+		self.atom_cache = atom_cache
+		similarity_keys, shared_keys, self.num_ground_concepts = concept_plan(self.gen_partitions.keys(),
+																			   self.ground_partitions.keys())
+		# Shared concepts, in the order in which parse_and_compute_distance adds up their similarities
+		shared_keys = set(shared_keys)
+		self.keys = [key for key in similarity_keys if key in shared_keys]
+
+		self.lower = dict()
+		self.upper = dict()
+		self.exact = dict()
+		for key in self.keys:
+			self.lower[key], self.upper[key] = concept_similarity_bounds(self.gen_partitions[key],
+																		 self.ground_partitions[key], atom_cache)
+
+	def refine(self):
+		''' Evaluates exactly the concept with the widest bounds; returns False if all concepts are exact. '''
+		pending = [key for key in self.keys if key not in self.exact]
+		if not pending:
+			return False
+		key = max(pending, key=lambda key: self.upper[key] - self.lower[key])
+		similarity = event_description_distance(self.gen_partitions[key], self.ground_partitions[key], logger,
+												atom_cache=self.atom_cache)[2]
+		self.exact[key] = self.lower[key] = self.upper[key] = similarity
+		return True
+
+	def bounds(self):
+		if self.num_ground_concepts == 0:
+			return BoundedSimilarity(0, 0, True, 0, 0)
+		if len(self.exact) == len(self.keys):
+			similarity = sum(self.exact[key] for key in self.keys) / self.num_ground_concepts
+			return BoundedSimilarity(similarity, similarity, True, len(self.exact), len(self.keys))
+		lower = sum(self.lower.values()) / self.num_ground_concepts
+		upper = sum(self.upper.values()) / self.num_ground_concepts
+		return BoundedSimilarity(max(0.0, lower), min(1.0, upper), False, len(self.exact), len(self.keys))
+
+
+def similarity_at_least(generated_event_description, ground_event_description, tau, use_cache=True,
+						parser_backend='ply', atom_cache=atom_distance_cache):
+	"""Decide whether the similarity of two event descriptions is at least tau.
+
+	Concepts are evaluated exactly, widest bounds first, only until the bounds decide the outcome.
+
+	Args:
+		generated_event_description (str): Prolog code of the generated event description.
+		ground_event_description (str): Prolog code of the ground truth event description.
+		tau (float): Similarity threshold.
+		use_cache (bool, optional): Reuse parsed event descriptions through
+			run.event_description_cache. Defaults to True.
+		parser_backend (str, optional): 'ply' or 'descent'. Defaults to 'ply'.
+		atom_cache (LRUCache, optional): Cache of atom distances; None disables memoization.
+
+	Returns:
+		ThresholdResult: reached is the outcome (the result is also truthy iff reached); lower and
+			upper bound the similarity and exact tells whether it was computed in full.
+	"""
+	evaluation = SimilarityEvaluation(generated_event_description, ground_event_description, use_cache,
+									  parser_backend, atom_cache)
+	while True:
+		bounds = evaluation.bounds()
+		if bounds.lower >= tau:
+			return ThresholdResult(True, bounds)
+		if bounds.upper < tau or not evaluation.refine():
+			return ThresholdResult(bounds.exact and bounds.lower >= tau, bounds)
+
+
+def top_k(candidates, ground_event_description, k, use_cache=True, parser_backend='ply',
+		  atom_cache=atom_distance_cache):
+	"""Find the k candidate event descriptions most similar to the ground truth.
+
+	Candidates are refined one concept at a time, always the one with the widest bounds among those
+	that may still enter or leave the top k, until the top k is separated from the rest.
+
+	Args:
+		candidates (list): Prolog code of the candidate event descriptions.
+		ground_event_description (str): Prolog code of the ground truth event description.
+		k (int): Number of candidates to return.
+		use_cache (bool, optional): Reuse parsed event descriptions through
+			run.event_description_cache. Defaults to True.
+		parser_backend (str, optional): 'ply' or 'descent'. Defaults to 'ply'.
+		atom_cache (LRUCache, optional): Cache of atom distances; None disables memoization.
+
+	Returns:
+		list: RankedCandidate entries of the top k candidates, by decreasing lower bound of the
+			similarity (ties by index). Membership in the top k is always decided; the similarity
+			of an entry is exact only if its exact attribute is True. Ties at the k-th place are
+			broken by candidate index.
+	"""
+	evaluations = [SimilarityEvaluation(candidate, ground_event_description, use_cache, parser_backend, atom_cache)
+				   for candidate in candidates]
+	k = min(k, len(evaluations))
+	if k <= 0:
+		return []
+	while True:
+		bounds = [evaluation.bounds() for evaluation in evaluations]
+		order = sorted(range(len(bounds)), key=lambda index: (-bounds[index].lower, index))
+		top, rest = order[:k], order[k:]
+		threshold = min(bounds[index].lower for index in top)
+		if not rest or threshold > max(bounds[index].upper for index in rest):
+			break
+		# Candidates that may still swap places with a member of the top k
+		contenders = [index for index in range(len(bounds))
+					  if not bounds[index].exact and bounds[index].upper >= threshold]
+		if not contenders:
+			# Every contender is exact: the order, with ties broken by index, is final.
+			break
+		index = max(contenders, key=lambda index: (bounds[index].upper - bounds[index].lower, -index))
+		evaluations[index].refine()
+	return [RankedCandidate(index, bounds[index]) for index in top]
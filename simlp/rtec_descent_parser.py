@@ -0,0 +1,314 @@
+# Hand-written tokenizer and recursive-descent parser for RTEC programs.
+#
+# This backend accepts the same language as RTECLexer/RTECParser and builds the same Atom/Rule trees,
+# including the way PLY resolves the conflicts of the grammar:
+#   - all binary operators (;, comparisons, arithmetic) have the same precedence and group to the right,
+#     e.g. A = B + C is =(A,+(B,C)) and A + B = C is +(A,=(B,C)),
+#   - unary minus applies to the whole expression that follows it, e.g. - A + B is -(+(A,B)),
+#   - (Atom) is Atom itself, while (L1, ..., Ln) is comma(L1, ..., Ln),
+#   - \+ (L1, ..., Ln) is -(L1, ..., Ln), unless it is the left operand of a binary operator.
+# The tokenizer visits every character once; block comments end at the first */.
+
+import re
+
+from .event_description import Atom, Rule
+from .rtec_parser import ClauseParser, ParseError
+
+_WORD_CHARS = re.compile(r'[a-zA-Z0-9_]*')
+_DIGITS = re.compile(r'[0-9]+')
+
+_SINGLE_CHAR_TOKENS = {
+	'(': 'LPAREN',
+	')': 'RPAREN',
+	',': 'COMMA',
+	'.': 'DOT',
+	'[': 'LISTSTART',
+	']': 'LISTEND',
+	'*': 'TIMES',
+	';': 'DISJ',
+	'<': 'LE',
+}
+
+_COMPARISON_TOKENS = {'EQUAL', 'NEQUAL', 'NUMERICEQ', 'NUMERICNEQ', 'GE', 'GEQ', 'LE', 'LEQ'}
+_ARITHMETIC_TOKENS = {'PLUS', 'MINUS', 'TIMES', 'DIV'}
+_BINARY_OPERATOR_TOKENS = _COMPARISON_TOKENS | _ARITHMETIC_TOKENS | {'DISJ'}
+
+
+class Token:
+	__slots__ = ('type', 'value', 'lexpos')
+
+	def __init__(self, type, value, lexpos):
+		self.type = type
+		self.value = value
+		self.lexpos = lexpos
+
+	def __repr__(self):
+		return f'Token({self.type},{self.value!r},{self.lexpos})'
+
+
+def _is_digit(char):
+	return '0' <= char <= '9'
+
+def _is_word_char(char):
+	return char.isalnum() or char == '_'
+
+def _is_keyword_at(text, pos, keyword):
+	''' Whether keyword appears at pos as a whole word (the \\b(?:is|not)\\b test of t_LOWCASESTR). '''
+	end = pos + len(keyword)
+	return text.startswith(keyword, pos) and \
+		   (pos == 0 or not _is_word_char(text[pos-1])) and \
+		   (end == len(text) or not _is_word_char(text[end]))
+
+def _string_end(text, pos):
+	''' Returns the end of the quoted string that starts at pos, or -1, following t_STRING. '''
+	quote = text[pos]
+	end = pos + 1
+	if quote == '"':
+		while end < len(text) and text[end] not in '"\n':
+			end += 1
+		return end + 1 if end < len(text) and text[end] == '"' else -1
+	# Single-quoted strings span the longest run without newlines and unescaped double quotes,
+	# and end at the last single quote of that run.
+	closing = -1
+	while end < len(text) and text[end] != '\n' and (text[end] != '"' or text[end-1] == '\\'):
+		if text[end] == "'":
+			closing = end
+		end += 1
+	return closing + 1 if closing >= 0 else -1
+
+def tokenize(text):
+	''' Yields the tokens of an RTEC program; the token types and values are those of RTECLexer. '''
+	pos = 0
+	length = len(text)
+	while pos < length:
+		char = text[pos]
+		if char in ' \t\n':
+			pos += 1
+			continue
+		start = pos
+		if _is_digit(char) or (char in '+-' and pos + 1 < length and _is_digit(text[pos+1])):
+			pos = _DIGITS.match(text, pos + 1 if char in '+-' else pos).end()
+			if pos + 1 < length and text[pos] == '.' and _is_digit(text[pos+1]):
+				pos = _DIGITS.match(text, pos + 1).end()
+			yield Token('NUMBER', text[start:pos], start)
+			continue
+		if char == '\\':
+			if text.startswith('+', pos + 1):
+				pos += 2
+				yield Token('NOT', '-', start)
+				continue
+			if text.startswith('=', pos + 1):
+				pos += 2
+				yield Token('NEQUAL', '\\=', start)
+				continue
+		elif char == 'n' and text.startswith('not ', pos):
+			pos += 4
+			yield Token('NOT', '-', start)
+			continue
+		if 'a' <= char <= 'z':
+			if not (_is_keyword_at(text, pos, 'is') or _is_keyword_at(text, pos, 'not')):
+				pos = _WORD_CHARS.match(text, pos + 1).end()
+				yield Token('LOWCASESTR', text[start:pos], start)
+				continue
+			if _is_keyword_at(text, pos, 'is'):
+				pos += 2
+				yield Token('IS', 'is', start)
+				continue
+		elif 'A' <= char <= 'Z' or char == '_':
+			pos = _WORD_CHARS.match(text, pos + 1).end()
+			yield Token('VAR', text[start:pos], start)
+			continue
+		elif char in '"\'':
+			end = _string_end(text, pos)
+			if end >= 0:
+				pos = end
+				yield Token('STRING', text[start:pos], start)
+				continue
+		elif char == '/':
+			if text.startswith('*', pos + 1):
+				end = text.find('*/', pos + 2)
+				if end >= 0:
+					pos = end + 2
+					continue
+			pos += 1
+			yield Token('DIV', '/', start)
+			continue
+		elif char == '%':
+			end = text.find('\n', pos)
+			if end >= 0:
+				pos = end + 1
+				continue
+		elif char == '=':
+			for value, type in (('=:=', 'NUMERICEQ'), ('=\\=', 'NUMERICNEQ'), ('=<', 'LEQ'), ('=', 'EQUAL')):
+				if text.startswith(value, pos):
+					pos += len(value)
+					yield Token(type, value, start)
+					break
+			continue
+		elif char == ':':
+			if text.startswith('-', pos + 1):
+				pos += 2
+				yield Token('IMPL', ':-', start)
+				continue
+		elif char == '>':
+			if text.startswith('=', pos + 1):
+				pos += 2
+				yield Token('GEQ', '>=', start)
+			else:
+				pos += 1
+				yield Token('GE', '>', start)
+			continue
+		elif char in '+-':
+			pos += 1
+			yield Token('PLUS' if char == '+' else 'MINUS', char, start)
+			continue
+		elif char in _SINGLE_CHAR_TOKENS:
+			pos += 1
+			yield Token(_SINGLE_CHAR_TOKENS[char], char, start)
+			continue
+		# Tokenization stops here: the parser reports the character once it reaches it
+		yield Token('ILLEGAL', char, start)
+		return
+
+
+class RTECDescentParser(ClauseParser):
+	''' Recursive-descent parser for RTEC programs that produces the same trees as RTECParser. '''
+
+	def parse_clause(self, clause):
+		''' Parses the text of one clause and returns the list of its rules.
+
+		Raises ParseError, with the position of the error relative to the clause text, if the
+		clause is malformed. Text without any token (e.g. only comments) yields no rules.
+		'''
+		self.tokens = list(tokenize(clause))
+		self.illegal = self.tokens.pop() if self.tokens and self.tokens[-1].type == 'ILLEGAL' else None
+		self.position = 0
+		rules = []
+		while self.position < len(self.tokens):
+			rules.append(self.parse_rule())
+		if self.illegal is not None:
+			self.error()
+		return rules
+
+	def peek(self):
+		return self.tokens[self.position].type if self.position < len(self.tokens) else None
+
+	def advance(self):
+		token = self.tokens[self.position]
+		self.position += 1
+		return token
+
+	def advance_if(self, type):
+		if self.peek() == type:
+			self.position += 1
+			return True
+		return False
+
+	def expect(self, type):
+		if self.peek() != type:
+			self.error()
+		return self.advance()
+
+	def error(self):
+		if self.position >= len(self.tokens):
+			if self.illegal is not None:
+				# Like the PLY lexer, an illegal character is only reported when the parser reaches it
+				raise ParseError(f"Illegal character {self.illegal.value!r}", token=self.illegal)
+			raise ParseError("Syntax error at end of clause (missing '.'?)")
+		token = self.tokens[self.position]
+		raise ParseError(f"Syntax error at token {token.type} ({token.value!r})", token=token)
+
+	# Grammar
+	def parse_rule(self):
+		''' domain_rule : atom IMPL body '''
+		head = self.parse_atom()
+		self.expect('IMPL')
+		body = []
+		while True:
+			body.append(self.parse_literal()[0])
+			if self.advance_if('DOT'):
+				return Rule(head, body)
+			self.expect('COMMA')
+
+	def parse_literal(self):
+		''' Returns the literal and whether it is a plain atom (not a negation or an 'is' literal). '''
+		if self.peek() == 'NOT':
+			operator = self.advance().value
+			if self.peek() == 'LPAREN':
+				self.advance()
+				args, atom = self.parse_parenthesized()
+				if atom is None and self.peek() not in _BINARY_OPERATOR_TOKENS:
+					# \+ (L1, ..., Ln) is a negation with n arguments
+					return Atom(operator, args), False
+				if atom is None:
+					atom = Atom("comma", args)
+				return Atom(operator, [self.parse_binary_operation(atom)]), False
+			return Atom(operator, [self.parse_atom()]), False
+		atom = self.parse_atom()
+		if self.peek() == 'IS':
+			operator = self.advance().value
+			return Atom(operator, [atom, self.parse_atom()]), False
+		return atom, True
+
+	def parse_atom(self):
+		if self.peek() == 'MINUS':
+			operator = self.advance().value
+			return Atom(operator, [self.parse_atom()])
+		return self.parse_binary_operation(self.parse_primary())
+
+	def parse_binary_operation(self, left):
+		type = self.peek()
+		if type not in _BINARY_OPERATOR_TOKENS:
+			return left
+		operator = self.advance().value
+		if type == 'EQUAL':
+			# comp : EQUAL | EQUAL EQUAL | EQUAL EQUAL EQUAL
+			for _ in range(2):
+				if not self.advance_if('EQUAL'):
+					break
+				operator += '='
+		return Atom(operator, [left, self.parse_atom()])
+
+	def parse_parenthesized(self):
+		''' Parses what follows an opening parenthesis up to the closing one.
+
+		Returns (None, atom) for (Atom) and (args, None) for (L1, ..., Ln).
+		'''
+		literal, is_atom = self.parse_literal()
+		if is_atom and self.advance_if('RPAREN'):
+			return None, literal
+		args = [literal]
+		while self.advance_if('COMMA'):
+			args.append(self.parse_literal()[0])
+		self.expect('RPAREN')
+		return args, None
+
+	def parse_args_list(self):
+		args = [self.parse_literal()[0]]
+		while self.advance_if('COMMA'):
+			args.append(self.parse_literal()[0])
+		return args
+
+	def parse_primary(self):
+		type = self.peek()
+		if type == 'LOWCASESTR':
+			name = self.advance().value
+			if self.advance_if('LPAREN'):
+				args = self.parse_args_list()
+				self.expect('RPAREN')
+				return Atom(name, args)
+			return Atom(name, [])
+		if type in ('VAR', 'NUMBER', 'STRING'):
+			return Atom(self.advance().value, [])
+		if type == 'LISTSTART':
+			self.advance()
+			if self.advance_if('LISTEND'):
+				return Atom("list", [])
+			args = self.parse_args_list()
+			self.expect('LISTEND')
+			return Atom("list", args)
+		if type == 'LPAREN':
+			self.advance()
+			args, atom = self.parse_parenthesized()
+			return atom if atom is not None else Atom("comma", args)
+		self.error()
@@ -5,7 +5,9 @@ class RTECLexer():
 
 	def __init__(self):
 		#print('Constructing lexer for RTEC programs.')
-		self.lexer=lex.lex(module=self)
+		# The master regex is read from the packaged lextab module instead of being rebuilt.
+		# Delete simlp/lextab.py after changing a token rule and it is regenerated on the next build.
+		self.lexer=lex.lex(module=self, optimize=True, lextab=__package__ + '.lextab')
 
 	#def __del__(self):
 		#print('Lexer destructor called.')
@@ -87,7 +89,7 @@ class RTECLexer():
 
 	t_ignore_NL = r'\n'
 	t_ignore_LINECOMMENT = r'%.*\n'
-	t_ignore_MULTILINECOMMENT= r'/\*[\s\S]*\*/'
+	t_ignore_MULTILINECOMMENT= r'/\*[\s\S]*?\*/'
 
 	#t_OPER = r'(\=)|(\=\\\=)'
 
@@ -99,7 +101,10 @@ class RTECLexer():
 	# Ignored characters (whitespace)
 	t_ignore = ' \t'
 
-	# Error handling function
+	# Error handling function: the clause is skipped as malformed (see ClauseParser.iter_rules)
 	def t_error(self, t):
-		print("Illegal character '%s'" % t.value[0])
-		t.lexer.skip(1)
+		# Import here to avoid circular dependency
+		from .rtec_parser import ParseError
+		t.type = 'ILLEGAL'
+		t.value = t.value[0]
+		raise ParseError(f"Illegal character {t.value!r}", token=t)
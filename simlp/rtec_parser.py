@@ -1,18 +1,198 @@
 from .rtec_lexer import *
 from ply import yacc
+from abc import ABC, abstractmethod
+import re
+import threading
 #from event_description import Atom
 #from propositional_logic import Proposition, Literal, ConjunctionOfLiterals, DNF
 #from dependency_graph import DependencyGraph
 from .event_description import Atom, EventDescription
 
-class RTECParser:
-	
+
+class ParseError(Exception):
+	''' A syntax error in an RTEC program. line and column are 1-based positions in the whole program. '''
+
+	def __init__(self, message, line=None, column=None, token=None):
+		super().__init__(message)
+		self.message = message
+		self.line = line
+		self.column = column
+		self.token = token
+
+	def __str__(self):
+		if self.line is None:
+			return self.message
+		return f"line {self.line}, column {self.column}: {self.message}"
+
+
+# Characters that may change the meaning of a '.' that follows them: comments and quoted strings.
+_CLAUSE_SCAN = re.compile(r'''[.%/'"]''')
+
+def split_clauses(chunks):
+	''' Splits a stream of RTEC source chunks into clauses.
+
+	A clause ends at a '.' that is followed by layout, a line comment or the end of the input (as in
+	Prolog), outside comments and quoted strings. Only the text of the current clause is buffered.
+	Yields (clause, line, column) triples, where line and column locate the first character of the
+	clause in the whole input. The trailing text after the last clause is yielded as well.
+	'''
+	# The current clause starts at buffer[start]; the clauses before it are only dropped from the buffer
+	# when the next chunk is appended, so a whole program given as one string is not copied per clause.
+	buffer = ''
+	start = 0
+	position = 0
+	line, column = 1, 1
+	chunks = iter(chunks)
+	final = False
+	while not final:
+		chunk = next(chunks, None)
+		if chunk is None:
+			final = True
+		else:
+			buffer = buffer[start:] + chunk
+			position -= start
+			start = 0
+		while True:
+			match = _CLAUSE_SCAN.search(buffer, position)
+			if match is None:
+				position = len(buffer)
+				break
+			index = match.start()
+			char = match.group()
+			if char == '.':
+				if index + 1 == len(buffer) and not final:
+					position = index
+					break
+				if index + 1 < len(buffer) and not (buffer[index+1].isspace() or buffer[index+1] == '%'):
+					position = index + 1
+					continue
+				clause = buffer[start:index+1]
+				yield clause, line, column
+				newlines = clause.count('\n')
+				if newlines > 0:
+					line += newlines
+					column = len(clause) - clause.rfind('\n')
+				else:
+					column += len(clause)
+				start = position = index + 1
+				continue
+			if char == '/':
+				if index + 1 == len(buffer) and not final:
+					position = index
+					break
+				if not buffer.startswith('*', index + 1):
+					position = index + 1
+					continue
+				end = buffer.find('*/', index + 2)
+				end = end + 2 if end >= 0 else -1
+			elif char == '%':
+				end = buffer.find('\n', index + 1)
+				end = end + 1 if end >= 0 else -1
+			else:
+				# Quoted strings end at the matching quote and never span lines.
+				end = index + 1
+				while end < len(buffer) and buffer[end] not in (char, '\n'):
+					end += 1
+				end = end + 1 if end < len(buffer) else -1
+			if end < 0:
+				# Comment or string continues in the next chunk
+				position = len(buffer) if final else index
+				break
+			position = end
+	if buffer[start:].strip():
+		yield buffer[start:], line, column
+
+def _iter_chunks(source, chunk_size=1 << 16):
+	if isinstance(source, str):
+		yield source
+	elif hasattr(source, 'read'):
+		for chunk in iter(lambda: source.read(chunk_size), ''):
+			yield chunk
+	else:
+		yield from source
+
+
+class ClauseParser(ABC):
+	''' Drives a parser over an RTEC program one clause at a time.
+
+	Subclasses implement parse_clause, which parses the text of a single clause and raises
+	ParseError (located relative to the clause text) when the clause is malformed.
+	'''
+
 	def __init__(self):
-		self.parser = yacc.yacc(module=self)
 		self.event_description = EventDescription()
 
+	def reset(self):
+		''' Discards the rules collected by previous parses. '''
+		self.event_description = EventDescription()
+
+	def parse(self, source):
+		''' Parses an RTEC program and returns a fresh EventDescription.
+
+		source may be a string, a file handle or an iterable of text chunks. Clauses with syntax
+		errors are skipped; the errors are kept in the errors list of the returned EventDescription.
+		'''
+		self.reset()
+		event_description = self.event_description
+		for rule in self.iter_rules(source, event_description.errors):
+			event_description.rules.append(rule)
+		return event_description
+
+	@abstractmethod
+	def parse_clause(self, clause):
+		''' Parses the text of one clause and returns the list of its rules. '''
+
+	def iter_rules(self, source, errors=None):
+		''' Parses an RTEC program clause by clause and yields its rules as they are parsed.
+
+		source may be a string, a file handle or an iterable of text chunks, which are read lazily
+		so that memory use is bounded by the longest clause. After a syntax error, parsing resumes
+		at the next clause. Each error is appended, as a ParseError located in the whole program,
+		to errors if it is given.
+		'''
+		for clause, line, column in split_clauses(_iter_chunks(source)):
+			try:
+				rules = self.parse_clause(clause)
+			except ParseError as error:
+				offset = len(clause) if error.token is None else error.token.lexpos
+				last_newline = clause.rfind('\n', 0, offset)
+				error.line = line + clause.count('\n', 0, offset)
+				error.column = offset - last_newline if last_newline >= 0 else column + offset
+				if errors is not None:
+					errors.append(error)
+				continue
+			yield from rules
+
+
+class RTECParser(ClauseParser):
+	
+	def __init__(self, write_tables=False):
+		# The LALR tables are loaded from the packaged parsetab module. They are only regenerated
+		# (in memory) when the grammar no longer matches their signature; after changing the grammar,
+		# run RTECParser(write_tables=True) once to refresh simlp/parsetab.py.
+		super().__init__()
+		self.lexer = RTECLexer().lexer
+		self.parser = yacc.yacc(module=self, tabmodule='parsetab', debug=False, write_tables=write_tables)
+
 	tokens = RTECLexer.tokens
-		
+
+	def parse_clause(self, clause):
+		''' Parses the text of one clause and returns the list of its rules.
+
+		Raises ParseError, with the position of the error relative to the clause text, if the
+		clause is malformed. Text without any token (e.g. only comments) yields no rules.
+		'''
+		self.lexer.input(clause)
+		if self.lexer.token() is None:
+			return []
+		collected = self.event_description
+		self.event_description = EventDescription()
+		try:
+			self.parser.parse(clause, lexer=self.lexer)
+			return self.event_description.rules
+		finally:
+			self.event_description = collected
+
 	# Grammar 
 	def p_event_description(self,p):
 		''' event_description : domain_rule 
@@ -162,4 +342,34 @@ class RTECParser:
 
 	# Error handling
 	def p_error(self,p):
-		print("Syntax error at token", p.type)
+		# Abort the clause; iter_rules locates the error and resumes at the next clause.
+		if p is None:
+			raise ParseError("Syntax error at end of clause (missing '.'?)")
+		raise ParseError(f"Syntax error at token {p.type} ({p.value!r})", token=p)
+
+
+# Values of the parser_backend option: the PLY (LALR) parser and the hand-written recursive-descent parser
+PARSER_BACKENDS = ('ply', 'descent')
+
+_local = threading.local()
+
+def get_parser(backend='ply'):
+	''' Returns the parser of the given backend for the calling thread, building it on first use.
+
+	The parsers keep their state on the instance, so one parser per backend is shared by all parses
+	of a thread instead of constructing a new lexer and parser for every program.
+	'''
+	parsers = getattr(_local, 'parsers', None)
+	if parsers is None:
+		parsers = _local.parsers = dict()
+	parser = parsers.get(backend)
+	if parser is None:
+		if backend == 'ply':
+			parser = RTECParser()
+		elif backend == 'descent':
+			from .rtec_descent_parser import RTECDescentParser
+			parser = RTECDescentParser()
+		else:
+			raise ValueError(f"Unknown parser backend {backend!r}; expected one of {PARSER_BACKENDS}")
+		parsers[backend] = parser
+	return parser
@@ -1,10 +1,329 @@
-from .rtec_lexer import RTECLexer
-from .rtec_parser import RTECParser
-from .distance_metric import event_description_distance
+from .rtec_parser import get_parser, PARSER_BACKENDS
+from .distance_metric import compare_event_descriptions, atom_distance_cache
 from .partitioner import partition_event_description, find_fluent_type_mismatches
+from .cache import LRUCache
+from .compact import compile_event_description
+from concurrent.futures import ProcessPoolExecutor
 from sys import argv
+from time import perf_counter
+import hashlib
 import logging
 
+# Parsed and partitioned event descriptions, keyed by the parser backend and the SHA-256 of their normalised source.
+# The cached objects are shared between comparisons, so the metric never modifies its inputs.
+# Bound it with event_description_cache.resize(max_entries=..., max_bytes=...); sizes are source bytes.
+event_description_cache = LRUCache(max_entries=128)
+
+def normalize_source(source):
+	''' Unifies line endings, so that the same program saved on different platforms is parsed once. '''
+	return source.replace('\r\n', '\n')
+
+def parse_event_description(source, use_cache=True, parser_backend='ply', stats=None):
+	"""
+	Parse an RTEC program and partition it by defined concept.
+
+	Args:
+		source (str): Raw Prolog code of the event description.
+		use_cache (bool, optional): If True, the result is looked up in (and stored to)
+			event_description_cache. Defaults to True.
+		parser_backend (str, optional): 'ply' for the PLY-generated parser or 'descent' for the
+			hand-written recursive-descent parser. Both produce identical trees. Defaults to 'ply'.
+		stats (PerformanceStats, optional): Receives the parse and partition times and the
+			event_description_cache lookup. Defaults to None.
+
+	Returns:
+		tuple: (event_description, partitions), where partitions is the output of
+		partition_event_description. Both must be treated as read-only, since they may be
+		shared with other callers through the cache.
+	"""
+	source = normalize_source(source)
+	if not use_cache:
+		return parse_and_partition(source, parser_backend, stats)
+
+	encoded_source = source.encode('utf-8')
+	key = (parser_backend, hashlib.sha256(encoded_source).hexdigest())
+	if stats is not None:
+		from .stats import cache_counts
+		counts = cache_counts(event_description_cache)
+	parsed = event_description_cache.get(key)
+	if stats is not None:
+		stats.add_cache_lookups('event_description_cache', event_description_cache, counts)
+	if parsed is None:
+		parsed = parse_and_partition(source, parser_backend, stats)
+		event_description_cache.put(key, parsed, len(encoded_source))
+	return parsed
+
+def parse_and_partition(source, parser_backend, stats=None):
+	if stats is None:
+		event_description = get_parser(parser_backend).parse(source)
+		return event_description, partition_event_description(event_description)
+	start = perf_counter()
+	event_description = get_parser(parser_backend).parse(source)
+	parsed = perf_counter()
+	partitions = partition_event_description(event_description)
+	stats.seconds['parse'] += parsed - start
+	stats.seconds['partition'] += perf_counter() - parsed
+	return event_description, partitions
+
+def concept_sort_key(key):
+	''' Orders partition keys: the (fluent, predicate) tuples in their natural order, then "other". '''
+	return (1, ()) if key == "other" else (0, key)
+
+def concept_plan(gen_ed_keys, ground_ed_keys):
+	"""
+	Describe how parse_and_compute_distance combines the concepts of two event descriptions.
+
+	Args:
+		gen_ed_keys: Partition keys of the generated event description.
+		ground_ed_keys: Partition keys of the ground event description.
+
+	Returns:
+		tuple: (similarity_keys, shared_keys, num_ground_concepts), where similarity_keys lists the
+		keys of the similarities dict of parse_and_compute_distance in insertion order, shared_keys
+		the sorted keys defined in both event descriptions (the only ones with a nonzero similarity)
+		and num_ground_concepts the denominator of the average similarity.
+	"""
+	shared_keys = sorted(set(ground_ed_keys) & set(gen_ed_keys), key=concept_sort_key)
+	similarity_keys = dict()
+	fluent_type_mismatches = find_fluent_type_mismatches(gen_ed_keys, ground_ed_keys)
+	for mismatch in fluent_type_mismatches:
+		for key in mismatch['generated_keys']:
+			similarity_keys[key] = None
+	for key in shared_keys:
+		similarity_keys[key] = None
+	ground_ed_only_keys = list(set(ground_ed_keys) - set(gen_ed_keys))
+	for key in ground_ed_only_keys:
+		similarity_keys[key] = None
+	num_ground_concepts = len(shared_keys) + len(ground_ed_only_keys)
+	for mismatch in fluent_type_mismatches:
+		for key in mismatch['ground_keys']:
+			if key not in similarity_keys:
+				similarity_keys[key] = None
+				num_ground_concepts += 1
+	return list(similarity_keys), shared_keys, num_ground_concepts
+
+def average_similarity(similarities, num_ground_concepts):
+	''' The event description similarity of parse_and_compute_distance, given its similarities dict. '''
+	return sum(similarities.values()) / num_ground_concepts if num_ground_concepts > 0 else 0
+
+# Receives the concept-level trace when it is turned off; nothing is formatted for a disabled logger.
+_quiet_logger = logging.Logger("simlp.quiet", logging.WARNING)
+
+class _MessageCollector(logging.Handler):
+	''' Keeps the messages logged in a worker process, to be replayed in the parent's logger. '''
+
+	def __init__(self):
+		super().__init__(logging.INFO)
+		self.messages = []
+
+	def emit(self, record):
+		self.messages.append(record.getMessage())
+
+def concept_result(comparison, defer_feedback=False):
+	''' The part of a ComparisonResult used by parse_and_compute_distance: (col_ind, distances,
+	similarity, feedback, similarity_gap), where feedback is the comparison itself if defer_feedback
+	is True, and its formatted feedback otherwise. '''
+	feedback = comparison if defer_feedback else comparison.formatted_feedback
+	return comparison.col_ind, comparison.distances, comparison.similarity, feedback, comparison.similarity_gap
+
+def evaluate_concept(generated_partition, ground_partition, generate_feedback, use_atom_cache, defer_feedback=False,
+					 trace=True, instrument=False, approximate=None):
+	''' Runs compare_event_descriptions for one concept in a worker process.
+
+	The partitions are CompactEventDescriptions. Returns the concept_result of the comparison, the
+	messages it logged, in order (none if trace is False), and its stats (None unless instrument is True).
+	'''
+	collector = _MessageCollector()
+	logger = logging.Logger("simlp.concept", logging.INFO if trace else logging.WARNING)
+	logger.addHandler(collector)
+	comparison = compare_event_descriptions(generated_partition.to_event_description(),
+											ground_partition.to_event_description(),
+											logger, generate_feedback,
+											atom_distance_cache if use_atom_cache else None,
+											defer_feedback, instrument, approximate)
+	return concept_result(comparison, defer_feedback), collector.messages, comparison.stats
+
+def compare_partitions(logger, gen_ed_partitions, ground_ed_partitions, generate_feedback=False, use_atom_cache=True,
+					   workers=None, executor=None, feedback_report=False, trace=True, compact_ground_partitions=None,
+					   stats=None, approximate=None):
+	"""
+	Compare two partitioned event descriptions; the part of parse_and_compute_distance after parsing.
+
+	Args:
+		logger (logging.Logger): Logger of the comparison.
+		gen_ed_partitions (dict): Partitions of the generated event description.
+		ground_ed_partitions (dict): Partitions of the ground truth event description.
+		compact_ground_partitions (dict, optional): The ground partitions in the compact encoding,
+			reused by the worker processes instead of encoding them again. Defaults to None.
+		The other arguments are those of parse_and_compute_distance.
+
+	Returns:
+		tuple: The 4-tuple returned by parse_and_compute_distance.
+	"""
+	# The concept-level trace (programs, cost matrices, matched rules) goes to a disabled logger when it is off
+	trace = trace and logger.isEnabledFor(logging.INFO)
+	concept_logger = logger if trace else _quiet_logger
+
+	# Event Description Preprocessing 
+	## We split an input event description into multiple event descriptions, each defining the initiations, the terminations or the intervals of a different FVP.
+	## The partitions are computed once per distinct program by parse_event_description.
+	gen_ed_keys = gen_ed_partitions.keys()
+	ground_ed_keys = ground_ed_partitions.keys()
+
+	similarity_keys, both_eds_keys, num_ground_concepts = concept_plan(gen_ed_keys, ground_ed_keys)
+
+	# Check for fluent type mismatches (simple defined vs statically determined fluents)
+	fluent_type_mismatches = find_fluent_type_mismatches(gen_ed_keys, ground_ed_keys)
+
+	similarities = dict()
+	similarity_gaps = dict()
+	all_feedback = ""
+	if generate_feedback:
+		# The feedback modules are only loaded when feedback is requested
+		from .feedback_report import FeedbackReport, fluent_type_mismatch_text
+	defer_feedback = generate_feedback and feedback_report
+	report = FeedbackReport(fluent_type_mismatches) if defer_feedback else None
+
+	# Initialize variables to avoid UnboundLocalError when no shared keys exist
+	optimal_matching = None
+	distances = None
+
+	# Log and generate feedback for fluent type mismatches
+	if fluent_type_mismatches:
+		logger.info("=" * 60)
+		logger.info("FLUENT DEFINITION TYPE MISMATCHES DETECTED:")
+		logger.info("=" * 60)
+		for mismatch in fluent_type_mismatches:
+			fluent_name = mismatch['fluent_name']
+			gen_type = mismatch['generated_type']
+			ground_type = mismatch['ground_type']
+			gen_predicates = [k[1] for k in mismatch['generated_keys']]
+			ground_predicates = [k[1] for k in mismatch['ground_keys']]
+		
+			logger.info("  Fluent '%s':", fluent_name)
+			logger.info("    Generated uses: %s definition (%s)", gen_type, ', '.join(gen_predicates))
+			logger.info("    Ground uses: %s definition (%s)", ground_type, ', '.join(ground_predicates))
+		
+			# Add to feedback
+			if generate_feedback:
+				all_feedback += fluent_type_mismatch_text(mismatch)
+		
+			# Assign 0 similarity for mismatched fluent types
+			for key in mismatch['generated_keys']:
+				similarities[key] = 0
+		logger.info("")
+
+	parallel = executor is not None or (workers is not None and workers > 1 and len(both_eds_keys) > 1)
+	if parallel:
+		# Concepts are shipped in the compact encoding; the results and the messages logged while computing
+		# them are merged back in key order, as in the serial loop.
+		tasks = ([compile_event_description(gen_ed_partitions[key]) for key in both_eds_keys],
+				 [compile_event_description(ground_ed_partitions[key]) if compact_ground_partitions is None
+				  else compact_ground_partitions[key] for key in both_eds_keys],
+				 [generate_feedback] * len(both_eds_keys),
+				 [use_atom_cache] * len(both_eds_keys),
+				 [defer_feedback] * len(both_eds_keys),
+				 [trace] * len(both_eds_keys),
+				 [stats is not None] * len(both_eds_keys),
+				 [approximate] * len(both_eds_keys))
+		if executor is None:
+			with ProcessPoolExecutor(max_workers=workers) as pool:
+				concept_results = list(pool.map(evaluate_concept, *tasks))
+		else:
+			concept_results = list(executor.map(evaluate_concept, *tasks))
+	else:
+		def evaluate(key):
+			comparison = compare_event_descriptions(gen_ed_partitions[key], ground_ed_partitions[key], concept_logger,
+													generate_feedback, atom_distance_cache if use_atom_cache else None,
+													defer_feedback, stats is not None, approximate)
+			return concept_result(comparison, defer_feedback), (), comparison.stats
+		concept_results = (evaluate(key) for key in both_eds_keys)
+
+	for key, (result, messages, concept_stats) in zip(both_eds_keys, concept_results):
+		if stats is not None:
+			replay_start = perf_counter()
+		for message in messages:
+			logger.info(message)
+		if stats is not None:
+			stats.seconds['logging'] += perf_counter() - replay_start
+			stats.add_concept(key, concept_stats)
+		optimal_matching, distances, similarity, feedback, similarity_gap = result
+		if similarity_gap is not None:
+			similarity_gaps[key] = similarity_gap
+		if defer_feedback:
+			report.add_concept(key, feedback)
+		elif generate_feedback:
+			# The comparison has already formatted its feedback
+			all_feedback += feedback + "\n"
+		similarities[key]=similarity
+
+	if stats is not None:
+		summary_start = perf_counter()
+	logger.info("Computed similarity values: ")
+	logger.info(similarities)
+	logger.info("")
+
+	logger.info("Concepts defined in both event descriptions: ")
+	logger.info(both_eds_keys)
+	logger.info("")
+
+	gen_ed_only_keys = list(set(gen_ed_keys) - set(ground_ed_keys))
+	logger.info("Concepts defined only in generated event description: ")
+	logger.info(gen_ed_only_keys)
+	logger.info("")
+
+	ground_ed_only_keys = list(set(ground_ed_keys) - set(gen_ed_keys))
+	logger.info("Concepts defined only in ground event description: ")
+	logger.info(ground_ed_only_keys)
+	logger.info("")
+
+	# The ground-only concepts and the ground side of the fluent type mismatches have similarity 0
+	similarities = {key: similarities.get(key, 0) for key in similarity_keys}
+	for key in similarities:
+		logger.info("Similarity for definition: %s is %s", key, similarities[key])
+
+	similarity = average_similarity(similarities, num_ground_concepts)
+	logger.info("Event Description Similarity is: ")
+	logger.info(similarity)
+	if similarity_gaps:
+		# The concepts compared by an approximate assignment bound the gap of the average similarity
+		similarity_gap = sum(similarity_gaps.values()) / num_ground_concepts
+		logger.info("Approximate rule assignments of %s concepts: the similarity is at most %s below the optimal one",
+					len(similarity_gaps), similarity_gap)
+		if stats is not None:
+			stats.similarity_gap = similarity_gap
+	if stats is not None:
+		stats.seconds['logging'] += perf_counter() - summary_start
+
+	if defer_feedback:
+		return optimal_matching, distances, similarity, report
+	elif generate_feedback:
+		return optimal_matching, distances, similarity, all_feedback
+	else:
+		return optimal_matching, distances, similarity, 0
+
+
+def setup_logger(log_file, level=logging.INFO):
+	''' Returns (logger, handler): the logger named after log_file with a new handler writing to it.
+
+	The caller owns the handler and must remove and close it when it is done. Without a log file,
+	returns the logger of this module and no handler, and level is ignored: the messages follow the
+	application's configuration of that logger, which by default drops everything below WARNING (so
+	the concept-level trace is not even formatted).
+	'''
+	if log_file is None:
+		return logging.getLogger(__name__), None
+
+	handler = logging.FileHandler(log_file, mode='w') 
+	formatter = logging.Formatter('%(message)s')
+	handler.setFormatter(formatter)
+
+	logger = logging.getLogger(log_file)
+	logger.setLevel(level)
+	logger.addHandler(handler)
+
+	return logger, handler
+
 def parse_and_compute_distance(
 							   generated_event_description=None,
 							   ground_event_description=None,
@@ -12,6 +331,16 @@ def parse_and_compute_distance(
 							   ground_rules_file = None, 
 							   log_file='../logs/log.txt', 
 							   generate_feedback=False,
+							   use_cache=True,
+							   parser_backend='ply',
+							   use_atom_cache=True,
+							   workers=None,
+							   executor=None,
+							   feedback_report=False,
+							   log_level=logging.INFO,
+							   trace=True,
+							   stats=None,
+							   approximate=None,
 							   ):
 	"""
 	Parse Prolog event descriptions and compute similarity metrics between them.
@@ -36,9 +365,43 @@ def parse_and_compute_distance(
 			Prolog rules. Used only if ground_event_description is None.
 			Defaults to None.
 		log_file (str, optional): Path to output log file where detailed comparison
-			results will be written. Defaults to '../logs/log.txt'.
+			results will be written; the file is closed before returning. If None, nothing is written
+			and messages go to the logger of this module. Defaults to '../logs/log.txt'.
 		generate_feedback (bool, optional): If True, generates detailed actionable
 			feedback for improving the generated rules. Defaults to False.
+		use_cache (bool, optional): If True, parsed event descriptions are reused through
+			event_description_cache, e.g. when the same ground truth is compared against many
+			generated programs. Defaults to True.
+		parser_backend (str, optional): Parser used for both event descriptions: 'ply' (the
+			PLY-generated LALR parser) or 'descent' (a hand-written tokenizer and recursive-descent
+			parser that builds the same trees in a single pass). Defaults to 'ply'.
+		use_atom_cache (bool, optional): If True, distances between compound atoms are memoized in
+			distance_metric.atom_distance_cache across rule pairs, concepts and calls. Defaults to True.
+		workers (int, optional): If greater than 1, the shared concepts are evaluated in a pool of
+			that many processes. The log file, similarities and feedback are identical to those of the
+			serial run. On platforms that spawn processes, call it under if __name__ == "__main__".
+			Defaults to None (serial).
+		executor (concurrent.futures.Executor, optional): Executor that evaluates the shared concepts,
+			e.g. a ProcessPoolExecutor reused across calls; takes precedence over workers.
+			Defaults to None.
+		feedback_report (bool, optional): If True (with generate_feedback=True), the feedback is
+			returned as a FeedbackReport, whose concept feedback is only generated when it is read, and
+			it is not written to the log file. Defaults to False.
+		log_level (int, optional): Level of the log file; e.g. logging.WARNING keeps only the parse
+			errors and skips formatting everything else. Ignored if log_file is None (see setup_logger).
+			Defaults to logging.INFO.
+		trace (bool, optional): If False, the per-concept trace (the compared programs, the rule
+			cost matrices, the matched rules and the feedback) is neither formatted nor logged, while the summary
+			of the similarities still is. Defaults to True.
+		stats (PerformanceStats, optional): If given, it is filled with the wall time of every stage,
+			the rule distance, atom distance and assignment counts, the cost matrix sizes and the cache
+			hit rates of the run, and with the stats of every shared concept in stats.concepts; export
+			them with stats.to_json(). Defaults to None (no instrumentation).
+		approximate (ApproximateAssignment, optional): If given, the concepts with at least
+			approximate.exact_below rules are compared with an approximate rule assignment, which only
+			computes the distances of the approximate.k most promising rule pairs per rule. The log (and
+			stats.similarity_gap) then reports a bound of how much higher the optimal similarity can be.
+			Defaults to None (optimal assignments).
 	
 	Returns:
 		tuple: A 4-tuple containing:
@@ -48,14 +411,14 @@ def parse_and_compute_distance(
 			  the last concept processed.
 			- similarity (float): Overall similarity score (0-1) for the last concept
 			  processed.
-			- all_feedback str: If generate_feedback=True, returns a dictionary
-			  mapping concept keys to their feedback data. If False, returns 0.
+			- all_feedback str: If generate_feedback=True, the feedback formatted for
+			  the LLM (a FeedbackReport if feedback_report=True). If False, returns 0.
 	
 	Workflow:
 		1. Sets up logging to the specified log file
 		2. Parses both event descriptions using RTEC parser
 		3. Partitions event descriptions by concept (FVP definitions)
-		4. Computes similarity for each shared concept using event_description_distance
+		4. Computes similarity for each shared concept using compare_event_descriptions
 		5. Identifies concepts unique to each event description
 		6. Calculates overall event description similarity across all concepts
 		7. Optionally generates and logs detailed feedback for rule improvement
@@ -79,174 +442,45 @@ def parse_and_compute_distance(
 		... )
 	"""
 	
-	def setup_logger(log_file, level=logging.INFO):
-		"""To setup as many loggers as you want"""
-
-		handler = logging.FileHandler(log_file, mode='w') 
-		formatter = logging.Formatter('%(message)s')
-		handler.setFormatter(formatter)
+	if parser_backend not in PARSER_BACKENDS:
+		raise ValueError(f"Unknown parser backend {parser_backend!r}; expected one of {PARSER_BACKENDS}")
 
-		logger = logging.getLogger(log_file)
-		logger.setLevel(logging.INFO)
-		logger.addHandler(handler)
-
-		return logger
-	logger = setup_logger(log_file)
-
-	# init lexer and parsers for RTEC programs
-	rtec_lexer = RTECLexer()
-	lex = rtec_lexer.lexer
-
-	rtec_parser1 = RTECParser()
-	parser = rtec_parser1.parser
+	if stats is not None:
+		start = perf_counter()
+	logger, handler = setup_logger(log_file, log_level)
 	try:
-		if generated_event_description is None:
-			with open(generated_rules_file) as f:
-				parser.parse(f.read())
-		else:
-			parser.parse(generated_event_description)
-	except Exception as e:
-		logger.error(f"Error parsing generated event description: {e}")
-		return None, None, None, None
+		try:
+			if generated_event_description is None:
+				with open(generated_rules_file) as f:
+					generated_event_description = f.read()
+			generated_event_description, gen_ed_partitions = parse_event_description(generated_event_description, use_cache,
+																					  parser_backend, stats)
+		except Exception as e:
+			logger.error(f"Error parsing generated event description: {e}")
+			return None, None, None, None
+		for error in generated_event_description.errors:
+			logger.warning(f"Skipped malformed clause in generated event description at {error}")
 
-	generated_event_description = rtec_parser1.event_description
+		try:
+			if ground_event_description is None:
+				with open(ground_rules_file) as f:
+					ground_event_description = f.read()
+			ground_event_description, ground_ed_partitions = parse_event_description(ground_event_description, use_cache,
+																					  parser_backend, stats)
+		except Exception as e:
+			logger.error(f"Error parsing ground event description: {e}")
+			return None, None, None, None
+		for error in ground_event_description.errors:
+			logger.warning(f"Skipped malformed clause in ground event description at {error}")
 
-	rtec_parser2 = RTECParser()
-	parser = rtec_parser2.parser
-	try:
-		if ground_event_description is None:
-			with open(ground_rules_file) as f:
-				parser.parse(f.read())
-		else:
-			parser.parse(ground_event_description)
-	except Exception as e:
-		logger.error(f"Error parsing ground event description: {e}")
-		return None, None, None, None
-
-	ground_event_description = rtec_parser2.event_description
-
-	# Event Description Preprocessing 
-	## We split an input event description into multiple event descriptions, each defining the initiations, the terminations or the intervals of a different FVP.
-	gen_ed_partitions = partition_event_description(generated_event_description)
-	gen_ed_keys = gen_ed_partitions.keys()
-
-	ground_ed_partitions = partition_event_description(ground_event_description)
-	ground_ed_keys = ground_ed_partitions.keys()
-
-	both_eds_keys = sorted(list(set(ground_ed_keys) & set(gen_ed_keys)))
-
-	# Check for fluent type mismatches (simple defined vs statically determined fluents)
-	fluent_type_mismatches = find_fluent_type_mismatches(gen_ed_keys, ground_ed_keys)
-
-	similarities = dict()
-	all_feedback = ""
-	
-	# Initialize variables to avoid UnboundLocalError when no shared keys exist
-	optimal_matching = None
-	distances = None
-	
-	# Log and generate feedback for fluent type mismatches
-	if fluent_type_mismatches:
-		logger.info("=" * 60)
-		logger.info("FLUENT DEFINITION TYPE MISMATCHES DETECTED:")
-		logger.info("=" * 60)
-		for mismatch in fluent_type_mismatches:
-			fluent_name = mismatch['fluent_name']
-			gen_type = mismatch['generated_type']
-			ground_type = mismatch['ground_type']
-			gen_predicates = [k[1] for k in mismatch['generated_keys']]
-			ground_predicates = [k[1] for k in mismatch['ground_keys']]
-			
-			logger.info(f"  Fluent '{fluent_name}':")
-			logger.info(f"    Generated uses: {gen_type} definition ({', '.join(gen_predicates)})")
-			logger.info(f"    Ground uses: {ground_type} definition ({', '.join(ground_predicates)})")
-			
-			# Add to feedback
-			if generate_feedback:
-				if ground_type == 'static':
-					all_feedback += (f"\n - FLUENT TYPE ERROR: Fluent '{fluent_name}' should be defined as a "
-								   f"statically determined fluent using holdsFor/2, not as a simple fluent "
-								   f"using {', '.join(gen_predicates)}. Statically determined fluents compute "
-								   f"their intervals directly from conditions rather than through initiation/termination events.")
-				else:
-					all_feedback += (f"\n - FLUENT TYPE ERROR: Fluent '{fluent_name}' should be defined as a "
-								   f"simple fluent using initiatedAt/2 and terminatedAt/2, not as a statically "
-								   f"determined fluent using {', '.join(gen_predicates)}. Simple fluents are "
-								   f"event-driven with explicit initiation and termination conditions.")
-			
-			# Assign 0 similarity for mismatched fluent types
-			for key in mismatch['generated_keys']:
-				similarities[key] = 0
-		logger.info("")
-	
-	for key in both_eds_keys:
-		result = event_description_distance(gen_ed_partitions[key], ground_ed_partitions[key], logger, generate_feedback)
-		if generate_feedback:
-			optimal_matching, distances, similarity, feedback_data = result
-			# Import FeedbackGenerator to format the full feedback
-			from .feedback_generator import FeedbackGenerator
-			feedback_gen = FeedbackGenerator(logger)
-			formatted_feedback = feedback_gen.format_feedback_for_llm(feedback_data)
-			all_feedback += formatted_feedback + "\n"
-		else:
-			optimal_matching, distances, similarity = result[:3]
-		similarities[key]=similarity
-
-	logger.info("Computed similarity values: ")
-	logger.info(similarities)
-	logger.info("")
-
-	logger.info("Concepts defined in both event descriptions: ")
-	logger.info(both_eds_keys)
-	logger.info("")
-	# print("Concepts defined in both event descriptions: ")
-	# print(both_eds_keys)
-	# print("")
-
-	gen_ed_only_keys = list(set(gen_ed_keys) - set(ground_ed_keys))
-	logger.info("Concepts defined only in generated event description: ")
-	logger.info(gen_ed_only_keys)
-	logger.info("")
-	# print("Concepts defined only in generated event description: ")
-	# print(gen_ed_only_keys)
-	# print("")
-
-	ground_ed_only_keys = list(set(ground_ed_keys) - set(gen_ed_keys))
-	logger.info("Concepts defined only in ground event description: ")
-	logger.info(ground_ed_only_keys)
-	logger.info("")
-	# print("Concepts defined only in ground event description: ")
-	# print(ground_ed_only_keys)
-	# print("")
-
-
-	for key in ground_ed_only_keys:
-		similarities[key]=0
-
-	for key in similarities:
-		# print("Similarity for definition: " + str(key) + " is " + str(similarities[key]))
-		logger.info("Similarity for definition: " + str(key) + " is " + str(similarities[key]))
-
-	# Calculate denominator for average similarity
-	# Include: shared concepts + ground-only concepts + mismatched fluent types (from ground side)
-	num_ground_concepts = len(both_eds_keys) + len(ground_ed_only_keys)
-	# Add ground keys from fluent type mismatches (these are concepts that exist but with wrong definition type)
-	for mismatch in fluent_type_mismatches:
-		for key in mismatch['ground_keys']:
-			if key not in similarities:
-				similarities[key] = 0
-				num_ground_concepts += 1
-
-	# print("Event Description Similarity is: ")
-	average_similarity = sum(similarities.values()) / num_ground_concepts if num_ground_concepts > 0 else 0
-	# print(average_similarity)
-	logger.info("Event Description Similarity is: ")
-	logger.info(average_similarity)
-	
-	if generate_feedback:
-		return optimal_matching, distances, average_similarity, all_feedback
-	else:
-		return optimal_matching, distances, average_similarity, 0
+		return compare_partitions(logger, gen_ed_partitions, ground_ed_partitions, generate_feedback, use_atom_cache,
+								  workers, executor, feedback_report, trace, stats=stats, approximate=approximate)
+	finally:
+		if handler is not None:
+			logger.removeHandler(handler)
+			handler.close()
+		if stats is not None:
+			stats.total_seconds += perf_counter() - start
 
 
 if __name__=="__main__":
@@ -263,8 +497,8 @@ if __name__=="__main__":
         greater(Speed, 5),
         holdsAt(withinArea(Vessel, nearCoast) = true, T).
     """
-	# optional 
-	log_file = "/Users/gphome/Desktop/projects/thesis-ds/simLP/unit_tests/test6/log.txt"
+	# optional: python -m simlp.run [log_file]
+	log_file = argv[1] if len(argv) > 1 else None
 	generate_feedback = True
 	print(generate_feedback)
 	result = parse_and_compute_distance(generated_event_description=rules_file1, ground_event_description=rules_file2, log_file=log_file, generate_feedback=generate_feedback)
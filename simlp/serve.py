@@ -0,0 +1,163 @@
+# Long-lived scoring of comparison requests given as JSON lines.
+#
+# Every line of the input is a request: a JSON object with the generated program ("generated", its
+# source, or "generated_file", a path), optionally the ground truth ("ground" or "ground_file"; the
+# server's default otherwise), an "id" echoed in the result and "feedback": true for the feedback
+# text. Every request gets one JSON line in the output, with the similarity, the per-concept scores
+# and matchings, and an error message instead if the request could not be served. Parsed ground
+# truths and the parsers stay warm in every worker process between requests.
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .batch import score_partitions
+from .cache import LRUCache
+from .run import parse_event_description
+
+ORDERS = ('input', 'completion')
+
+# Sources of ground truth files read in this (worker) process, keyed by path and modification time.
+ground_file_cache = LRUCache(max_entries=16)
+
+# The ground truth of requests that do not name one, set by set_defaults in every process.
+_defaults = {'ground': None, 'parser_backend': 'ply', 'use_atom_cache': True}
+
+
+def set_defaults(ground=None, parser_backend='ply', use_atom_cache=True):
+	''' Sets the default ground truth source and options of this process (the pool initializer). '''
+	_defaults.update(ground=ground, parser_backend=parser_backend, use_atom_cache=use_atom_cache)
+
+
+def read_ground_file(path):
+	key = (path, os.stat(path).st_mtime_ns)
+	source = ground_file_cache.get(key)
+	if source is None:
+		with open(path) as f:
+			source = f.read()
+		ground_file_cache.put(key, source)
+	return source
+
+
+def serve_request(request):
+	''' Serves one decoded request; returns its result as a JSON-serializable dict and never raises. '''
+	result = {'id': request.get('id'), 'similarity': None}
+	try:
+		if 'generated' in request:
+			generated = request['generated']
+		else:
+			with open(request['generated_file']) as f:
+				generated = f.read()
+		if 'ground' in request:
+			ground = request['ground']
+		elif 'ground_file' in request:
+			ground = read_ground_file(request['ground_file'])
+		elif _defaults['ground'] is not None:
+			ground = _defaults['ground']
+		else:
+			raise ValueError("the request has no ground truth and the server has no default ground truth")
+		parser_backend = request.get('parser_backend', _defaults['parser_backend'])
+		# Ground truths are shared by many requests and stay in the parse cache; generated programs do not.
+		_, ground_ed_partitions = parse_event_description(ground, True, parser_backend)
+		gen_ed, gen_ed_partitions = parse_event_description(generated, False, parser_backend)
+		scores = score_partitions(None, gen_ed_partitions, ground_ed_partitions, _defaults['use_atom_cache'],
+								  [str(error) for error in gen_ed.errors], bool(request.get('feedback', False)))
+	except Exception as e:
+		result['error'] = f'{type(e).__name__}: {e}'
+		return result
+	result.update(scores.to_dict())
+	del result['path']
+	return result
+
+
+def decode_request(line_number, line):
+	''' Returns the request of an input line, or the error result of a malformed line. '''
+	try:
+		request = json.loads(line)
+	except ValueError as e:
+		return None, {'id': line_number, 'similarity': None, 'error': f'Invalid JSON: {e}'}
+	if not isinstance(request, dict):
+		return None, {'id': line_number, 'similarity': None, 'error': 'A request must be a JSON object'}
+	request.setdefault('id', line_number)
+	return request, None
+
+
+def serve_jsonl(input_stream, output_stream, ground=None, workers=None, max_in_flight=None, order='input',
+				parser_backend='ply', use_atom_cache=True):
+	"""
+	Serve comparison requests read as JSON lines, writing one JSON result line per request.
+
+	Args:
+		input_stream: Text stream of requests, one JSON object per line; blank lines are ignored.
+		output_stream: Text stream the results are written to, flushed after every line.
+		ground (str, optional): Prolog code of the ground truth of requests that do not name one.
+		workers (int, optional): If greater than 1, requests are served by a pool of that many
+			processes. Defaults to None (served in this process).
+		max_in_flight (int, optional): Maximum number of requests read but not yet written; input is
+			read only as results are written. Defaults to four per worker.
+		order (str, optional): 'input' writes the results in the order of the requests, 'completion'
+			as soon as they are ready. Defaults to 'input'.
+		parser_backend (str, optional): Default parser backend, 'ply' or 'descent'. Defaults to 'ply'.
+		use_atom_cache (bool, optional): Memoize atom distances in every process. Defaults to True.
+
+	Returns:
+		int: The number of requests served.
+	"""
+	if order not in ORDERS:
+		raise ValueError(f"Unknown order {order!r}; expected one of {ORDERS}")
+	requests = (decode_request(line_number, line)
+				for line_number, line in enumerate(input_stream, 1) if line.strip())
+
+	def write(result):
+		output_stream.write(json.dumps(result) + "\n")
+		output_stream.flush()
+
+	if workers is None or workers <= 1:
+		set_defaults(ground, parser_backend, use_atom_cache)
+		served = 0
+		for request, error in requests:
+			write(error if request is None else serve_request(request))
+			served += 1
+		return served
+
+	max_in_flight = max(1, max_in_flight if max_in_flight is not None else 4 * workers)
+	with ProcessPoolExecutor(max_workers=workers, initializer=set_defaults,
+							 initargs=(ground, parser_backend, use_atom_cache)) as pool:
+		pending = dict()	# future -> (sequence number, id) of its request
+		ready = dict()		# sequence number -> result not written yet
+		submitted = written = 0
+
+		def collect(futures):
+			nonlocal written
+			for future in futures:
+				sequence, request_id = pending.pop(future)
+				try:
+					result = future.result()
+				except Exception as e:
+					# e.g. a worker process that died
+					result = {'id': request_id, 'similarity': None, 'error': f'{type(e).__name__}: {e}'}
+				ready[sequence] = result
+			if order == 'completion':
+				for sequence in list(ready):
+					write(ready.pop(sequence))
+					written += 1
+			else:
+				while written in ready:
+					write(ready.pop(written))
+					written += 1
+
+		for request, error in requests:
+			if request is None:
+				ready[submitted] = error
+				submitted += 1
+				collect(())
+				continue
+			pending[pool.submit(serve_request, request)] = (submitted, request['id'])
+			submitted += 1
+			while submitted - written >= max_in_flight:
+				done, _ = wait(pending, return_when=FIRST_COMPLETED)
+				collect(done)
+		while pending:
+			done, _ = wait(pending, return_when=FIRST_COMPLETED)
+			collect(done)
+		return submitted
@@ -0,0 +1,108 @@
+# Optional instrumentation of comparisons.
+#
+# A PerformanceStats records the wall time of every stage of a comparison, the number of rule distances,
+# atom distances and assignments computed, the sizes of the cost matrices and the hit rates of the caches
+# that were used. parse_and_compute_distance(..., stats=PerformanceStats()) fills it for the whole run,
+# with the stats of every shared concept in stats.concepts; compare_event_descriptions(..., instrument=True)
+# puts the stats of one concept on the ComparisonResult. The instrumented functions take their stats
+# object as an argument and only test it against None when it is not given, so a comparison without
+# stats does no extra work.
+
+import json
+
+STAGES = ('parse', 'partition', 'cost_matrix', 'assignment', 'feedback', 'logging')
+
+# atom_distance counts the atom pairs compared by rule_distance (rule heads and the body cells whose
+# signatures match), whether their distance comes from atom_distance_cache or is computed.
+CALLS = ('rule_distance', 'atom_distance', 'linear_sum_assignment')
+
+
+def cache_counts(cache):
+	''' The (hits, misses) of an LRUCache, to be passed to PerformanceStats.add_cache_lookups later. '''
+	return cache.hits, cache.misses
+
+
+class PerformanceStats:
+	''' Wall time per stage, call counts, matrix sizes and cache hit rates of one or more comparisons.
+
+	Attributes:
+		seconds (dict): Stage name (see STAGES) -> wall time in seconds. Within a comparison, logging is
+			the time not spent in the other stages, almost all of it building and writing the trace.
+		total_seconds (float): Wall time of the whole comparison.
+		calls (dict): Function name (see CALLS) -> number of calls.
+		cells (dict): Total number of cells of the rule ('rule_matrix') and body ('body_matrix') cost matrices.
+		matrix_size (int or None): Side of the rule cost matrix, for the stats of one concept.
+		caches (dict): Cache name -> {'hits': ..., 'misses': ...} of the lookups made by the comparison.
+		concepts (dict): Formatted concept key -> PerformanceStats of the comparison of that concept.
+		similarity_gap (float or None): With approximate rule assignments, the bound of how much higher
+			the similarity of the optimal assignments can be (see ComparisonResult.similarity_gap).
+
+	Stats are only approximate for caches shared with other threads, whose lookups are counted as well.
+	'''
+
+	def __init__(self):
+		self.seconds = dict.fromkeys(STAGES, 0.0)
+		self.total_seconds = 0.0
+		self.calls = dict.fromkeys(CALLS, 0)
+		self.cells = {'rule_matrix': 0, 'body_matrix': 0}
+		self.matrix_size = None
+		self.caches = dict()
+		self.concepts = dict()
+		self.similarity_gap = None
+
+	def add_cache_lookups(self, name, cache, before):
+		''' Adds the lookups of cache since before, a cache_counts tuple. '''
+		hits, misses = cache_counts(cache)
+		counts = self.caches.setdefault(name, {'hits': 0, 'misses': 0})
+		counts['hits'] += hits - before[0]
+		counts['misses'] += misses - before[1]
+
+	def add(self, other):
+		''' Adds the times, calls, cells and cache lookups of other to these stats. '''
+		for stage, seconds in other.seconds.items():
+			self.seconds[stage] += seconds
+		for name, calls in other.calls.items():
+			self.calls[name] += calls
+		for name, cells in other.cells.items():
+			self.cells[name] += cells
+		for name, counts in other.caches.items():
+			total = self.caches.setdefault(name, {'hits': 0, 'misses': 0})
+			total['hits'] += counts['hits']
+			total['misses'] += counts['misses']
+
+	def add_concept(self, key, concept_stats):
+		''' Records the stats of the comparison of one concept and adds them to these stats. '''
+		# Import here: the partitioner is not needed by comparisons without stats
+		from .partitioner import format_concept_key
+		self.concepts[format_concept_key(key)] = concept_stats
+		self.add(concept_stats)
+
+	def hit_rates(self):
+		''' Cache name -> fraction of its lookups that were hits. '''
+		return {name: counts['hits'] / (counts['hits'] + counts['misses']) if counts['hits'] + counts['misses'] else 0.0
+				for name, counts in self.caches.items()}
+
+	def to_dict(self):
+		hit_rates = self.hit_rates()
+		data = {
+			'total_seconds': self.total_seconds,
+			'seconds': dict(self.seconds),
+			'calls': dict(self.calls),
+			'cells': dict(self.cells),
+			'caches': {name: dict(counts, hit_rate=hit_rates[name]) for name, counts in self.caches.items()},
+		}
+		if self.matrix_size is not None:
+			data['matrix_size'] = self.matrix_size
+		if self.similarity_gap is not None:
+			data['similarity_gap'] = self.similarity_gap
+		if self.concepts:
+			data['concepts'] = {name: stats.to_dict() for name, stats in self.concepts.items()}
+		return data
+
+	def to_json(self, **kwargs):
+		''' The stats as JSON; keyword arguments are passed to json.dumps. '''
+		return json.dumps(self.to_dict(), **kwargs)
+
+	def __repr__(self):
+		return f'PerformanceStats({self.total_seconds:.4f}s, {len(self.concepts)} concepts, ' \
+			   f'{self.calls["rule_distance"]} rule distances)'
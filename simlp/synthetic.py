@@ -0,0 +1,356 @@
+# Seeded synthetic RTEC programs for scaling tests.
+#
+# generate_event_description builds a random but valid event description: simple fluents defined by
+# initiatedAt/terminatedAt rules whose bodies start with a happensAt event and continue with holdsAt,
+# background and threshold conditions, and statically determined fluents defined by holdsFor rules over
+# nested union_all/intersect_all/relative_complement_all interval expressions. mutate_event_description
+# derives a "generated" program from a base program by renaming predicates, replacing variables, toggling
+# negations and dropping or adding literals and rules, so that the pair has a known, tunable similarity.
+# to_prolog renders an event description as source accepted by RTECParser; generate_pair does all three.
+# The same seed and parameters always give the same programs.
+
+import random
+
+from .event_description import Atom, EventDescription
+
+SIMPLE_FLUENT_PREDICATES = ('initiatedAt', 'terminatedAt')
+INTERVAL_OPERATORS = ('union_all', 'intersect_all', 'relative_complement_all')
+COMPARISONS = ('>', '<', '>=', '=<')
+INFIX_OPERATORS = frozenset(('=', '\\=', '=:=', '=\\=', '<', '=<', '>', '>=', '+', '-', '*', '/'))
+FLUENT_PREDICATES = ('holdsAt', 'holdsFor')
+TIME_VARIABLES = ('T', 'I')
+
+
+def leaf(name):
+	''' The atom without arguments named name: a variable if it starts with an uppercase letter or _
+	(see is_variable), and a constant otherwise. '''
+	return Atom(name, [])
+
+
+def fluent_value(fluent, entities, value):
+	''' The fluent-value pair fluent(entities...)=value. '''
+	return Atom('=', [Atom(fluent, entities), leaf(value)])
+
+
+def is_variable(atom):
+	return not atom.args and (atom.predicateName[0].isupper() or atom.predicateName[0] == '_')
+
+
+def to_prolog(event_description):
+	''' The source of an event description, in the syntax accepted by RTECParser. '''
+	return "\n".join(f"{term_to_prolog(rule.head)} :-\n    " + ",\n    ".join(map(term_to_prolog, rule.body)) + ".\n"
+					 for rule in event_description.rules)
+
+
+def term_to_prolog(atom):
+	name, args = atom.predicateName, atom.args
+	if name == 'list':
+		return '[' + ', '.join(map(term_to_prolog, args)) + ']'
+	if name == '-' and len(args) == 1:
+		# The parser reads \+ (and not) as the predicate '-'
+		return '\\+' + term_to_prolog(args[0])
+	if name in INFIX_OPERATORS and len(args) == 2:
+		return f'{infix_argument(args[0])}{name}{infix_argument(args[1])}'
+	if args:
+		return f'{name}(' + ', '.join(map(term_to_prolog, args)) + ')'
+	return name
+
+
+def infix_argument(atom):
+	# The parser reads chains of infix operators right-associatively and without precedence, so an
+	# infix term nested in another one is parenthesized
+	if atom.predicateName in INFIX_OPERATORS and len(atom.args) == 2:
+		return f'({term_to_prolog(atom)})'
+	return term_to_prolog(atom)
+
+
+class _Vocabulary:
+	''' The fluents, events, background predicates and thresholds of a synthetic program. '''
+
+	def __init__(self, rng, fluents, static_fraction):
+		self.fluents = []		# (name, arity, values, static)
+		for i in range(fluents):
+			values = ('true',) if rng.random() < 0.6 else tuple(f'value{j}' for j in range(rng.randint(2, 3)))
+			self.fluents.append((f'fluent{i}', rng.randint(1, 2), values, rng.random() < static_fraction))
+		self.events = [(f'event{i}', rng.randint(1, 3)) for i in range(max(4, fluents))]
+		self.relations = [f'relation{i}' for i in range(max(4, fluents // 2))]
+		self.thresholds = [f'threshold{i}' for i in range(max(2, fluents // 4))]
+
+
+class _RuleBuilder:
+	''' The variables of one rule under construction. '''
+
+	def __init__(self, rng, entities, variable_reuse):
+		self.rng = rng
+		self.entities = entities
+		self.variable_reuse = variable_reuse
+		self.variables = list(entities)
+		self.fresh = 0
+
+	def new_variable(self, prefix='X'):
+		self.fresh += 1
+		new = leaf(f'{prefix}{self.fresh}')
+		self.variables.append(new)
+		return new
+
+	def any_variable(self):
+		''' An existing variable with probability variable_reuse, a new one otherwise. '''
+		if self.rng.random() < self.variable_reuse:
+			return self.rng.choice(self.variables)
+		return self.new_variable()
+
+	def entity_arguments(self, arity):
+		return [self.rng.choice(self.entities) for _ in range(arity)]
+
+
+def _fluent_literal(rng, builder, vocabulary, predicate, time):
+	name, arity, values, _ = rng.choice(vocabulary.fluents)
+	return Atom(predicate, [fluent_value(name, builder.entity_arguments(arity), rng.choice(values)), time])
+
+
+def _simple_fluent_body(rng, builder, vocabulary, body_length):
+	time = leaf('T')
+	event, arity = rng.choice(vocabulary.events)
+	body = [Atom('happensAt', [Atom(event, [builder.entities[0]] + [builder.any_variable() for _ in range(arity - 1)]),
+							   time])]
+	while len(body) < body_length:
+		kind = rng.random()
+		if kind < 0.35:
+			body.append(_fluent_literal(rng, builder, vocabulary, 'holdsAt', time))
+		elif kind < 0.5:
+			body.append(Atom('-', [_fluent_literal(rng, builder, vocabulary, 'holdsAt', time)]))
+		elif kind < 0.75 or len(body) + 2 > body_length:
+			body.append(Atom(rng.choice(vocabulary.relations), [builder.any_variable(), builder.any_variable()]))
+		else:
+			value = builder.any_variable()
+			threshold = builder.new_variable('Threshold')
+			body.append(Atom('thresholds', [leaf(rng.choice(vocabulary.thresholds)), threshold]))
+			body.append(Atom(rng.choice(COMPARISONS), [value, threshold]))
+	return body
+
+
+def _interval_expression(rng, builder, vocabulary, leaves, depth, output, body):
+	''' Appends the literals that compute the intervals output from leaves holdsFor literals to body. '''
+	if leaves == 1:
+		name, arity, values, _ = rng.choice(vocabulary.fluents)
+		body.append(Atom('holdsFor', [fluent_value(name, builder.entity_arguments(arity), rng.choice(values)), output]))
+		return
+	if depth == 1 or leaves == 2:
+		groups = [1] * leaves
+	else:
+		first = rng.randint(1, leaves - 1)
+		groups = [first, leaves - first]
+	inputs = []
+	for group in groups:
+		inputs.append(builder.new_variable('I'))
+		_interval_expression(rng, builder, vocabulary, group, depth - 1, inputs[-1], body)
+	operator = rng.choice(INTERVAL_OPERATORS)
+	if operator == 'relative_complement_all':
+		body.append(Atom(operator, [inputs[0], Atom('list', inputs[1:]), output]))
+	else:
+		body.append(Atom(operator, [Atom('list', inputs), output]))
+
+
+def _rule(rng, vocabulary, fluent, predicate, body_length, nesting_depth, variable_reuse):
+	name, arity, values, _ = fluent
+	entities = [leaf(f'Entity{i + 1}') for i in range(arity)]
+	builder = _RuleBuilder(rng, entities, variable_reuse)
+	if predicate == 'holdsFor':
+		body = []
+		_interval_expression(rng, builder, vocabulary, body_length, nesting_depth, leaf('I'), body)
+		return Atom(predicate, [fluent_value(name, entities, rng.choice(values)), leaf('I')]), body
+	body = _simple_fluent_body(rng, builder, vocabulary, body_length)
+	return Atom(predicate, [fluent_value(name, entities, rng.choice(values)), leaf('T')]), body
+
+
+def generate_event_description(fluents=10, rules_per_concept=3, body_length=4, nesting_depth=2, variable_reuse=0.5,
+							   static_fraction=0.3, seed=0):
+	"""
+	Generate a random, valid RTEC event description.
+
+	Args:
+		fluents (int, optional): Number of defined fluents. Defaults to 10.
+		rules_per_concept (int, optional): Rules per concept, i.e. per initiatedAt, terminatedAt or holdsFor
+			definition of a fluent. Defaults to 3.
+		body_length (int, optional): Literals per initiatedAt/terminatedAt body, and holdsFor literals
+			(leaves of the interval expression) per holdsFor body. Defaults to 4.
+		nesting_depth (int, optional): Maximum depth of the interval expressions of holdsFor rules.
+			Defaults to 2.
+		variable_reuse (float, optional): Probability that an argument reuses a variable of the rule
+			instead of introducing a new one. Defaults to 0.5.
+		static_fraction (float, optional): Probability that a fluent is statically determined (holdsFor)
+			rather than simple. Defaults to 0.3.
+		seed (int, optional): Seed of the generator. Defaults to 0.
+
+	Returns:
+		EventDescription: The rules, grouped by concept.
+
+	Raises:
+		ValueError: If a count is out of range or a probability is not within [0, 1].
+	"""
+	if fluents < 1 or rules_per_concept < 1 or body_length < 1 or nesting_depth < 1:
+		raise ValueError("fluents, rules_per_concept, body_length and nesting_depth must be at least 1")
+	if not (0 <= variable_reuse <= 1 and 0 <= static_fraction <= 1):
+		raise ValueError("variable_reuse and static_fraction must be within [0, 1]")
+	rng = random.Random(seed)
+	vocabulary = _Vocabulary(rng, fluents, static_fraction)
+	event_description = EventDescription()
+	for fluent in vocabulary.fluents:
+		for predicate in (('holdsFor',) if fluent[3] else SIMPLE_FLUENT_PREDICATES):
+			for _ in range(rules_per_concept):
+				event_description.add_rule(*_rule(rng, vocabulary, fluent, predicate, body_length, nesting_depth,
+												  variable_reuse))
+	return event_description
+
+
+class _Mutator:
+	''' Mutations of the rules of one program, with replacements drawn from the program itself. '''
+
+	def __init__(self, rng, event_description, mutation_rate):
+		self.rng = rng
+		self.mutation_rate = mutation_rate
+		self.names = dict()		# (role, arity) -> names of the events, background predicates and fluents
+		self.values = dict()	# fluent name -> values
+		for rule in event_description.rules:
+			self.collect(rule.head)
+			for literal in rule.body:
+				self.collect(literal)
+		self.names = {key: sorted(names) for key, names in self.names.items()}
+		self.values = {key: sorted(values) for key, values in self.values.items()}
+
+	def collect(self, literal):
+		if literal.predicateName == '-' and len(literal.args) == 1:
+			literal = literal.args[0]
+		name, args = literal.predicateName, literal.args
+		if name == 'happensAt' and args:
+			self.names.setdefault(('event', len(args[0].args)), set()).add(args[0].predicateName)
+		elif name in FLUENT_PREDICATES + SIMPLE_FLUENT_PREDICATES and args and args[0].predicateName == '=':
+			fluent, value = args[0].args
+			self.names.setdefault(('fluent', len(fluent.args)), set()).add(fluent.predicateName)
+			self.values.setdefault(fluent.predicateName, set()).add(value.predicateName)
+		elif args and name not in INFIX_OPERATORS and name not in INTERVAL_OPERATORS and name != 'thresholds':
+			self.names.setdefault(('relation', len(args)), set()).add(name)
+
+	def mutate_rule(self, rule):
+		variables = sorted({atom for literal in rule.body for atom in self.variables_of(literal)} - set(rule.head.args[1:]),
+						   key=lambda atom: atom.predicateName)
+		body = []
+		for literal in rule.body:
+			if self.rng.random() >= self.mutation_rate:
+				body.append(literal)
+				continue
+			mutation = self.rng.choice(('rename', 'replace_variable', 'negate', 'drop'))
+			if mutation == 'drop':
+				continue
+			body.append(getattr(self, mutation)(literal, variables))
+		if not body or self.rng.random() < self.mutation_rate:
+			body.insert(self.rng.randint(0, len(body)), self.rng.choice(rule.body))
+		return rule.head, body
+
+	def variables_of(self, atom):
+		if is_variable(atom):
+			yield atom
+		for arg in atom.args:
+			yield from self.variables_of(arg)
+
+	def rename(self, literal, variables):
+		''' Replaces the event, fluent or background predicate of the literal with another one of its arity. '''
+		if literal.predicateName == '-' and len(literal.args) == 1:
+			return Atom('-', [self.rename(literal.args[0], variables)])
+		name, args = literal.predicateName, literal.args
+		if name == 'happensAt' and args:
+			return Atom(name, [self.renamed(args[0], 'event')] + list(args[1:]))
+		if name in FLUENT_PREDICATES and args and args[0].predicateName == '=':
+			fluent = self.renamed(args[0].args[0], 'fluent')
+			value = leaf(self.rng.choice(self.values.get(fluent.predicateName, [args[0].args[1].predicateName])))
+			return Atom(name, [Atom('=', [fluent, value])] + list(args[1:]))
+		if name in ('union_all', 'intersect_all'):
+			return Atom('intersect_all' if name == 'union_all' else 'union_all', args)
+		if name in COMPARISONS:
+			return Atom(self.rng.choice(COMPARISONS), args)
+		if args and name not in INFIX_OPERATORS and name not in INTERVAL_OPERATORS and name != 'thresholds':
+			return self.renamed(literal, 'relation')
+		return literal
+
+	def renamed(self, atom, role):
+		names = self.names.get((role, len(atom.args)), [atom.predicateName])
+		return Atom(self.rng.choice(names), atom.args)
+
+	def replace_variable(self, literal, variables):
+		''' Replaces one (non-time) variable of the literal with another variable of the rule or a new one. '''
+		occurrences = [atom for atom in self.variables_of(literal) if atom.predicateName not in TIME_VARIABLES]
+		if not occurrences:
+			return literal
+		old = self.rng.choice(occurrences)
+		candidates = [atom for atom in variables if atom is not old and atom.predicateName not in TIME_VARIABLES]
+		new = self.rng.choice(candidates) if candidates and self.rng.random() < 0.5 else leaf(f'Mutated{self.rng.randrange(10**6)}')
+		return self.substitute(literal, old, new)
+
+	def substitute(self, atom, old, new):
+		if atom is old:
+			return new
+		if not atom.args:
+			return atom
+		return Atom(atom.predicateName, [self.substitute(arg, old, new) for arg in atom.args])
+
+	def negate(self, literal, variables):
+		''' Adds or removes the negation of a holdsAt or background literal. '''
+		if literal.predicateName == '-' and len(literal.args) == 1:
+			return literal.args[0]
+		name = literal.predicateName
+		if name == 'holdsAt' or (literal.args and name not in INFIX_OPERATORS and name not in INTERVAL_OPERATORS
+								 and name not in ('happensAt', 'holdsFor')):
+			return Atom('-', [literal])
+		return self.rename(literal, variables)
+
+
+def mutate_event_description(event_description, mutation_rate=0.1, seed=0):
+	"""
+	Derive a generated program from a base program, as an LLM might write it.
+
+	Every body literal is mutated with probability mutation_rate: its event, fluent or background
+	predicate is renamed, one of its variables is replaced, its negation is toggled, or it is dropped.
+	With the same probability, every rule gains a copy of one of its literals and every concept loses a
+	rule or gains another mutation of one of its rules. The rules of every concept are shuffled.
+	Replacement names are drawn from the base program, so any parsed program can be mutated.
+
+	Args:
+		event_description (EventDescription): The base program; it is not modified.
+		mutation_rate (float, optional): Probability of every mutation. Defaults to 0.1.
+		seed (int, optional): Seed of the mutations. Defaults to 0.
+
+	Returns:
+		EventDescription: The mutated program; with mutation_rate=0, the base rules in shuffled order.
+
+	Raises:
+		ValueError: If mutation_rate is not within [0, 1].
+	"""
+	if not 0 <= mutation_rate <= 1:
+		raise ValueError("mutation_rate must be within [0, 1]")
+	rng = random.Random(seed)
+	mutator = _Mutator(rng, event_description, mutation_rate)
+	concepts = dict()
+	for rule in event_description.rules:
+		concepts.setdefault((rule.head.predicateName, rule.head.args[0].args[0].predicateName
+							 if rule.head.args and rule.head.args[0].args else None), []).append(rule)
+	mutated = EventDescription()
+	for rules in concepts.values():
+		new_rules = [mutator.mutate_rule(rule) for rule in rules]
+		if rng.random() < mutation_rate:
+			if len(new_rules) > 1 and rng.random() < 0.5:
+				del new_rules[rng.randrange(len(new_rules))]
+			else:
+				new_rules.append(mutator.mutate_rule(rng.choice(rules)))
+		rng.shuffle(new_rules)
+		for head, body in new_rules:
+			mutated.add_rule(head, body)
+	return mutated
+
+
+def generate_pair(mutation_rate=0.1, seed=0, **parameters):
+	''' Returns the sources (generated, ground) of a synthetic ground truth and its mutation.
+
+	The keyword parameters are those of generate_event_description; the mutation is seeded with seed as well.
+	'''
+	ground = generate_event_description(seed=seed, **parameters)
+	return to_prolog(mutate_event_description(ground, mutation_rate, seed)), to_prolog(ground)
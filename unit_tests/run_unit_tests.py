@@ -3,8 +3,8 @@ import os
 from os import walk
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(os.path.join(current_dir, "../src"))
-import run
+sys.path.insert(0, os.path.join(current_dir, ".."))
+from simlp import run
 
 if __name__=="__main__":
 	subfolder_names = [f for f in list(walk(current_dir))[0][1] if f != "__pycache__" and os.path.isdir(os.path.join(current_dir, f))]
@@ -13,7 +13,7 @@ if __name__=="__main__":
 		print("--------------------------------")
 		print("Running unit test for: " + subfolder)
 		print("--------------------------------")
-		matching, distances, similarity, feedback = run.parse_and_compute_distance(subfolder + "/generated.prolog", subfolder + "/ground.prolog", subfolder + "/log.txt", generate_feedback=True)
+		matching, distances, similarity, feedback = run.parse_and_compute_distance(generated_rules_file=subfolder + "/generated.prolog", ground_rules_file=subfolder + "/ground.prolog", log_file=subfolder + "/log.txt", generate_feedback=True)
 		print(subfolder)
 		print(matching)
 		print(distances)
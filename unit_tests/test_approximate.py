@@ -0,0 +1,95 @@
+import logging
+
+import numpy as np
+import pytest
+
+from simlp.assignment import ApproximateAssignment, linear_sum_assignment, greedy_assignment, auction_assignment, \
+	assignment_lower_bound
+from simlp.atom_utils import get_padded_views
+from simlp.distance_metric import compare_event_descriptions, rule_cost_matrix, rule_distance_lower_bounds, DUMMY_RULE
+from simlp.partitioner import partition_event_description
+from simlp.rtec_parser import get_parser
+from simlp.run import parse_and_compute_distance
+from simlp.stats import PerformanceStats
+from simlp.synthetic import generate_pair
+
+LOGGER = logging.Logger("test_approximate", logging.WARNING)
+KEY = ('fluent0', 'initiatedAt')
+
+
+def synthetic_concept(rules, seed=0):
+	generated, ground = generate_pair(0.3, seed=seed, fluents=1, rules_per_concept=rules, static_fraction=0.0)
+	parser = get_parser()
+	return (partition_event_description(parser.parse(generated))[KEY],
+			partition_event_description(parser.parse(ground))[KEY])
+
+
+def test_solvers_return_permutations_within_bounds():
+	rng = np.random.default_rng(0)
+	for m in (1, 2, 7, 40):
+		cost_matrix = rng.random((m, m))
+		row_ind, col_ind = linear_sum_assignment(cost_matrix)
+		optimal = cost_matrix[row_ind, col_ind].sum()
+		for method in ('greedy', 'auction'):
+			row_ind, col_ind, lower_bound = ApproximateAssignment(method, epsilon=0.001).solve(cost_matrix)
+			assert sorted(col_ind) == list(range(m))
+			assert lower_bound <= optimal + 1e-9 <= cost_matrix[row_ind, col_ind].sum() + 2e-9
+		row_ind, col_ind, prices = auction_assignment(cost_matrix, 0.001)
+		assert cost_matrix[row_ind, col_ind].sum() <= optimal + m * 0.001 + 1e-9
+		assert assignment_lower_bound(cost_matrix, prices) >= optimal - m * 0.001 - 1e-9
+		assert greedy_assignment(cost_matrix)[0].tolist() == list(range(m))
+
+
+def test_invalid_options():
+	with pytest.raises(ValueError):
+		ApproximateAssignment('hungarian')
+	with pytest.raises(ValueError):
+		ApproximateAssignment(epsilon=0)
+	with pytest.raises(ValueError):
+		ApproximateAssignment(k=0)
+
+
+def test_lower_bounds_of_rule_distances():
+	generated, ground = synthetic_concept(30)
+	rules1, rules2, m, _ = get_padded_views(generated.rules, ground.rules, DUMMY_RULE)
+	exact = rule_cost_matrix(rules1, rules2, m, LOGGER, atom_cache=None)
+	lower = rule_distance_lower_bounds(rules1, rules2, m)
+	real = np.array([rule is not DUMMY_RULE for rule in rules1])[:, None] \
+		& np.array([rule is not DUMMY_RULE for rule in rules2])[None, :]
+	assert np.all(lower[real] <= exact[real] + 1e-12)
+
+
+def test_small_concepts_are_compared_exactly():
+	generated, ground = synthetic_concept(10)
+	exact = compare_event_descriptions(generated, ground, LOGGER)
+	approximate = compare_event_descriptions(generated, ground, LOGGER, approximate=ApproximateAssignment())
+	assert approximate.similarity == exact.similarity and approximate.similarity_gap is None
+	assert np.array_equal(approximate.cost_matrix, exact.cost_matrix)
+
+
+@pytest.mark.parametrize("approximate", [ApproximateAssignment('greedy', exact_below=1),
+										 ApproximateAssignment('auction', exact_below=1),
+										 ApproximateAssignment('greedy', k=5, exact_below=1),
+										 ApproximateAssignment('auction', k=3, exact_below=1)])
+def test_gap_bounds_the_approximation(approximate):
+	generated, ground = synthetic_concept(60, seed=1)
+	exact = compare_event_descriptions(generated, ground, LOGGER)
+	result = compare_event_descriptions(generated, ground, LOGGER, generate_feedback=True, instrument=True,
+										approximate=approximate)
+	assert sorted(result.col_ind) == list(range(len(result.col_ind)))
+	assert result.similarity <= exact.similarity + 1e-12
+	assert exact.similarity - result.similarity <= result.similarity_gap + 1e-12
+	assert not np.isnan(result.distances).any() and result.feedback_data is not None
+	if approximate.k is not None:
+		assert result.stats.calls['rule_distance'] < len(result.col_ind) ** 2 / 4
+
+
+def test_run_reports_the_gap():
+	generated, ground = generate_pair(0.3, seed=2, fluents=2, rules_per_concept=40)
+	stats = PerformanceStats()
+	approximate = parse_and_compute_distance(generated_event_description=generated, ground_event_description=ground,
+											 log_file=None, stats=stats, approximate=ApproximateAssignment(k=8))
+	exact = parse_and_compute_distance(generated_event_description=generated, ground_event_description=ground,
+									   log_file=None)
+	assert 0 <= exact[2] - approximate[2] <= stats.similarity_gap + 1e-12
+	assert stats.to_dict()['similarity_gap'] == stats.similarity_gap
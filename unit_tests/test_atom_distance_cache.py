@@ -0,0 +1,33 @@
+import logging
+import os
+
+from simlp.cache import LRUCache
+from simlp.distance_metric import event_description_distance
+from simlp.partitioner import partition_event_description
+from simlp.rtec_parser import get_parser
+
+LOGGER = logging.getLogger("test_atom_distance_cache")
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+
+
+def load(path):
+	with open(path) as rules_file:
+		return partition_event_description(get_parser().parse(rules_file.read()))
+
+
+def test_memoized_distances_equal_uncached_distances():
+	generated = load(os.path.join(rules_dir, "llms/executable_version/gpt4o_cot.prolog"))
+	ground = load(os.path.join(rules_dir, "rtec/maritime_rules.prolog"))
+	atom_cache = LRUCache(max_entries=1024)
+	for key in generated.keys() & ground.keys():
+		for _ in range(2):
+			cached = event_description_distance(generated[key], ground[key], LOGGER, True, atom_cache)
+			uncached = event_description_distance(generated[key], ground[key], LOGGER, True, None)
+			assert list(cached[0]) == list(uncached[0])
+			assert list(cached[1]) == list(uncached[1])
+			assert cached[2] == uncached[2]
+			assert cached[3] == uncached[3]
+	stats = atom_cache.stats()
+	assert stats['hits'] > 0 and stats['entries'] <= 1024
@@ -0,0 +1,27 @@
+import copy
+import pickle
+
+import pytest
+
+from simlp.event_description import Atom
+from simlp.rtec_parser import get_parser
+
+RULE = "initiatedAt(gap(Vessel)=true, T) :- happensAt(gap_start(Vessel), T), holdsAt(gap(Vessel)=false, T)."
+
+
+def test_identical_terms_are_shared():
+	first = get_parser().parse(RULE).rules[0]
+	second = get_parser('descent').parse(RULE).rules[0]
+	assert first.head is second.head
+	assert first.body[0] is Atom("happensAt", [Atom("gap_start", [Atom("Vessel", [])]), Atom("T", ())])
+	# gap(Vessel) appears in the head and in the body
+	assert first.head.args[0].args[0] is first.body[1].args[0].args[0]
+	assert hash(first.head) == hash(Atom("initiatedAt", first.head.args))
+
+
+def test_atoms_are_immutable_and_keep_identity_when_copied():
+	atom = get_parser().parse(RULE).rules[0].head
+	with pytest.raises(AttributeError):
+		atom.predicateName = "terminatedAt"
+	assert copy.deepcopy(atom) is atom
+	assert pickle.loads(pickle.dumps(atom)) is atom
@@ -0,0 +1,56 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from simlp.batch import evaluate_corpus, resolve_candidates
+from simlp.run import parse_and_compute_distance
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GROUND = os.path.join(rules_dir, "rtec/maritime_rules.prolog")
+CANDIDATES = os.path.join(rules_dir, "llms/executable_version")
+
+
+def test_batch_scores_match_parse_and_compute_distance(tmp_path):
+	broken = tmp_path / "broken.prolog"
+	broken.write_text("initiatedAt(foo :- bar.\n")
+	paths = resolve_candidates(CANDIDATES) + [str(broken), str(tmp_path / "missing.prolog")]
+	assert paths[:-2] == sorted(glob.glob(os.path.join(CANDIDATES, "*.prolog")))
+
+	serial = evaluate_corpus(paths, ground_rules_file=GROUND)
+	parallel = evaluate_corpus(paths, ground_rules_file=GROUND, workers=2)
+	assert list(serial.rows()) == list(parallel.rows())
+	with ProcessPoolExecutor(max_workers=2) as pool:
+		assert list(evaluate_corpus(paths, ground_rules_file=GROUND, executor=pool).rows()) == list(serial.rows())
+
+	for candidate in serial.candidates[:-2]:
+		expected = parse_and_compute_distance(generated_rules_file=candidate.path, ground_rules_file=GROUND,
+											  log_file=str(tmp_path / "log.txt"))
+		assert candidate.ok and candidate.similarity == expected[2]
+	assert [candidate.path for candidate in serial.failures()] == [str(tmp_path / "missing.prolog")]
+	assert "FileNotFoundError" in serial.candidates[-1].error
+	assert serial.candidates[-2].ok and len(serial.candidates[-2].skipped_clauses) == 1
+
+	concept_rows = [row for row in serial.rows() if row['concept'] == 'initiatedAt/withinArea']
+	assert [row['matching'] is not None for row in concept_rows] == [True] * (len(paths) - 2) + [False]
+
+
+def test_similarity_matrix_matches_pairwise_comparisons(tmp_path):
+	from simlp.batch import similarity_matrix
+	import numpy as np
+
+	paths = sorted(glob.glob(os.path.join(CANDIDATES, "*.prolog"))) + [GROUND]
+	serial = similarity_matrix(paths)
+	parallel = similarity_matrix(paths, workers=2)
+	assert np.array_equal(serial.overall, parallel.overall, equal_nan=True)
+	with ProcessPoolExecutor(max_workers=2) as pool:
+		assert np.array_equal(similarity_matrix(paths, executor=pool).overall, serial.overall, equal_nan=True)
+	assert serial.concepts.keys() == parallel.concepts.keys()
+	assert all(np.array_equal(serial.concepts[key], parallel.concepts[key], equal_nan=True) for key in serial.concepts)
+	assert serial.pair_errors == {} and not np.isnan(serial.overall).any()
+	for i, generated in enumerate(paths):
+		for j, ground in enumerate(paths):
+			expected = parse_and_compute_distance(generated_rules_file=generated, ground_rules_file=ground,
+												  log_file=str(tmp_path / "log.txt"))[2]
+			assert serial.overall[i, j] == expected
+	assert serial.overall[0, -1] != serial.overall[-1, 0]
@@ -0,0 +1,30 @@
+import csv
+import io
+import json
+import os
+
+from simlp.cli import main
+from simlp.run import parse_and_compute_distance
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GROUND = os.path.join(rules_dir, "rtec/maritime_rules.prolog")
+GENERATED = os.path.join(rules_dir, "llms/executable_version")
+
+
+def test_score_json_and_csv(tmp_path, capsys):
+	assert main(["score", GENERATED, "-g", GROUND, "--log-dir", str(tmp_path), "--feedback"]) == 0
+	results = json.loads(capsys.readouterr().out)
+	assert len(results) == len(list(tmp_path.iterdir())) == 3
+	for result in results:
+		expected = parse_and_compute_distance(generated_rules_file=result['path'], ground_rules_file=GROUND,
+											  log_file=str(tmp_path / "expected.txt"), generate_feedback=True)
+		assert result['ground'] == GROUND
+		assert (result['similarity'], result['feedback']) == expected[2:]
+
+	assert main(["--profile", "score", GENERATED, "-g", GROUND, "--format", "csv", "--no-log", "-j", "2"]) == 0
+	captured = capsys.readouterr()
+	rows = list(csv.DictReader(io.StringIO(captured.out)))
+	overall = {row['path']: float(row['similarity']) for row in rows if not row['concept']}
+	assert overall == {result['path']: result['similarity'] for result in results}
+	assert "cumulative" in captured.err
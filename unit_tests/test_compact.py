@@ -0,0 +1,38 @@
+import glob
+import os
+import pickle
+
+from simlp.compact import compile_event_description
+from simlp.partitioner import partition_event_description
+from simlp.rtec_parser import get_parser
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+RULE_FILES = sorted(glob.glob(os.path.join(current_dir, "../rules/**/*.prolog"), recursive=True))[:6]
+
+
+def parse(path):
+	with open(path) as rules_file:
+		return get_parser().parse(rules_file.read())
+
+
+def test_rule_files_found():
+	assert RULE_FILES
+
+
+def test_round_trip_and_pickle():
+	for path in RULE_FILES:
+		event_description = parse(path)
+		compact = pickle.loads(pickle.dumps(compile_event_description(event_description)))
+		restored = compact.to_event_description()
+		assert len(restored.rules) == len(event_description.rules)
+		for original, rule in zip(event_description.rules, restored.rules):
+			assert rule.head is original.head
+			assert all(a is b for a, b in zip(rule.body, original.body)) and len(rule.body) == len(original.body)
+
+
+def test_partitions_round_trip():
+	# The worker processes receive every concept as its own compact event description
+	for path in RULE_FILES:
+		for key, partition in partition_event_description(parse(path)).items():
+			restored = pickle.loads(pickle.dumps(compile_event_description(partition))).to_event_description()
+			assert [str(rule) for rule in restored.rules] == [str(rule) for rule in partition.rules]
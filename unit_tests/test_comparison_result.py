@@ -0,0 +1,54 @@
+import logging
+import os
+
+from simlp.distance_metric import compare_event_descriptions
+from simlp.feedback_generator import FeedbackGenerator
+from simlp.partitioner import partition_event_description
+from simlp.rtec_parser import get_parser
+
+LOGGER = logging.getLogger("test_comparison_result")
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GENERATED = os.path.join(rules_dir, "llms/executable_version/gpt4o_cot.prolog")
+GROUND = os.path.join(rules_dir, "rtec/maritime_rules.prolog")
+
+
+def load(path):
+	with open(path) as rules_file:
+		return partition_event_description(get_parser().parse(rules_file.read()))
+
+
+def test_feedback_reuses_comparison():
+	generated = load(GENERATED)
+	ground = load(GROUND)
+	for key in generated.keys() & ground.keys():
+		comparison = compare_event_descriptions(generated[key], ground[key], LOGGER, generate_feedback=True)
+		assert comparison.body_assignments
+		# Feedback computed from scratch matches the feedback built from the comparison
+		feedback_gen = FeedbackGenerator(LOGGER)
+		feedback_data = feedback_gen.generate_event_description_feedback(generated[key], ground[key])
+		assert feedback_data == comparison.feedback_data
+		assert feedback_gen.format_feedback_for_llm(feedback_data) == comparison.formatted_feedback
+		assert list(comparison.distances) == list(comparison.cost_matrix[comparison.row_ind, comparison.col_ind])
+
+
+def test_no_body_assignments_without_feedback():
+	generated = load(GENERATED)
+	ground = load(GROUND)
+	key = sorted(generated.keys() & ground.keys(), key=str)[0]
+	comparison = compare_event_descriptions(generated[key], ground[key], LOGGER)
+	assert comparison.body_assignments == {} and comparison.feedback_data is None
+	assert comparison.as_tuple()[3] is None
+
+
+def test_deferred_feedback_is_formatted_on_request():
+	generated = load(GENERATED)
+	ground = load(GROUND)
+	key = sorted(generated.keys() & ground.keys(), key=str)[0]
+	eager = compare_event_descriptions(generated[key], ground[key], LOGGER, generate_feedback=True)
+	deferred = compare_event_descriptions(generated[key], ground[key], LOGGER, generate_feedback=True,
+										  defer_feedback=True)
+	assert deferred.feedback_data is None and deferred.formatted_feedback is None
+	assert deferred.format_feedback() == eager.formatted_feedback
+	assert deferred.feedback_data == eager.feedback_data
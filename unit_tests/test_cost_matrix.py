@@ -0,0 +1,32 @@
+import glob
+import logging
+import os
+
+import numpy as np
+
+from simlp.atom_utils import get_padded_views
+from simlp.distance_metric import rule_cost_matrix, rule_distance, DUMMY_RULE
+from simlp.partitioner import partition_event_description
+from simlp.rtec_parser import get_parser
+
+LOGGER = logging.getLogger("test_cost_matrix")
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+
+
+def partitions(path):
+	with open(path) as rules_file:
+		return partition_event_description(get_parser().parse(rules_file.read()))
+
+
+def test_prefiltered_matrices_equal_the_full_computation():
+	generated = partitions(os.path.join(rules_dir, "llms/executable_version/gpt4o_cot.prolog"))
+	ground = partitions(sorted(glob.glob(os.path.join(rules_dir, "rtec/*.prolog")))[0])
+	compared = 0
+	for key in generated.keys() & ground.keys():
+		rules1, rules2, m, _ = get_padded_views(generated[key].rules, ground[key].rules, DUMMY_RULE)
+		expected = np.array([[rule_distance(rules1[i], rules2[j], LOGGER) for j in range(m)] for i in range(m)])
+		assert np.array_equal(rule_cost_matrix(rules1, rules2, m, LOGGER), expected)
+		compared += 1
+	assert compared > 0
@@ -0,0 +1,33 @@
+import os
+
+import numpy as np
+
+from simlp import Evaluator
+from simlp.run import parse_and_compute_distance
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GROUND = os.path.join(rules_dir, "rtec/maritime_rules.prolog")
+GENERATED = [os.path.join(rules_dir, "llms/executable_version/gpt4o_cot.prolog"),
+			 os.path.join(rules_dir, "llms/executable_version/gpto1_fewshot.prolog")]
+
+
+def test_evaluator_matches_parse_and_compute_distance(tmp_path):
+	with open(GROUND) as ground_file:
+		evaluator = Evaluator(ground_file.read(), generate_feedback=True)
+	for path in GENERATED:
+		expected = parse_and_compute_distance(generated_rules_file=path, ground_rules_file=GROUND,
+											  log_file=str(tmp_path / "expected.txt"), generate_feedback=True)
+		result = evaluator.evaluate(generated_rules_file=path, log_file=str(tmp_path / "evaluator.txt"))
+		assert np.array_equal(result[0], expected[0]) and np.array_equal(result[1], expected[1])
+		assert result[2:] == expected[2:]
+		assert (tmp_path / "evaluator.txt").read_bytes() == (tmp_path / "expected.txt").read_bytes()
+	assert evaluator.evaluate(generated_rules_file=str(tmp_path / "missing.prolog")) == (None, None, None, None)
+
+
+def test_evaluator_with_workers():
+	with Evaluator(ground_rules_file=GROUND, workers=2) as evaluator:
+		similarity = evaluator.evaluate(generated_rules_file=GENERATED[0])[2]
+		assert evaluator.owned_executor is not None
+	assert evaluator.owned_executor is None
+	assert similarity == Evaluator(ground_rules_file=GROUND).evaluate(generated_rules_file=GENERATED[0])[2]
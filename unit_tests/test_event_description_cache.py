@@ -0,0 +1,38 @@
+import os
+
+from simlp.cache import LRUCache
+from simlp.run import event_description_cache, parse_and_compute_distance, parse_event_description
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_lru_cache_bounds_and_counters():
+	cache = LRUCache(max_entries=2, max_bytes=10)
+	cache.put("a", 1, 4)
+	cache.put("b", 2, 4)
+	assert cache.get("a") == 1
+	cache.put("c", 3, 4)
+	# "b" is the least recently used entry and the byte bound (10) is exceeded
+	assert "b" not in cache and "a" in cache and "c" in cache
+	assert cache.get("b") is None
+	assert cache.stats() == {'entries': 2, 'bytes': 8, 'hits': 1, 'misses': 1, 'evictions': 1, 'hit_rate': 0.5}
+
+
+def test_cached_event_descriptions_are_shared_and_left_intact(tmp_path):
+	with open(os.path.join(current_dir, "test2/ground.prolog")) as f:
+		ground = f.read()
+	with open(os.path.join(current_dir, "test2/generated.prolog")) as f:
+		generated = f.read()
+
+	event_description_cache.clear()
+	event_description, partitions = parse_event_description(ground)
+	assert parse_event_description(ground.replace("\n", "\r\n"))[0] is event_description
+	rules_per_partition = {key: list(partition.rules) for key, partition in partitions.items()}
+
+	log_file = str(tmp_path / "log.txt")
+	first = parse_and_compute_distance(generated, ground, log_file=log_file, generate_feedback=True)
+	second = parse_and_compute_distance(generated, ground, log_file=log_file, generate_feedback=True)
+
+	assert first[2] == second[2]
+	assert {key: partition.rules for key, partition in partitions.items()} == rules_per_partition
+	assert event_description_cache.stats()['hits'] >= 4
@@ -0,0 +1,39 @@
+import json
+import os
+
+from simlp.feedback_report import FeedbackReport
+from simlp.run import parse_and_compute_distance
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GENERATED = os.path.join(rules_dir, "llms/executable_version/gpt4o_cot.prolog")
+GROUND = os.path.join(rules_dir, "rtec/maritime_rules.prolog")
+
+
+def run(tmp_path, **options):
+	return parse_and_compute_distance(generated_rules_file=GENERATED, ground_rules_file=GROUND,
+									  log_file=str(tmp_path / "log.txt"), generate_feedback=True, **options)
+
+
+def test_report_is_lazy_and_renders_the_feedback_text(tmp_path):
+	_, _, similarity, feedback = run(tmp_path)
+	_, _, report_similarity, report = run(tmp_path, feedback_report=True)
+	assert isinstance(report, FeedbackReport) and report_similarity == similarity
+	assert len(report) > 1 and not any(concept.evaluated for concept in report)
+
+	key = report.keys()[0]
+	concept = report[key]
+	assert report[concept.name] is concept
+	assert concept.rules and concept.evaluated
+	assert sum(concept.evaluated for concept in report) == 1
+
+	assert report.to_text() == feedback
+	data = json.loads(report.to_json())
+	assert [concept['concept'] for concept in data['concepts']] == [concept.name for concept in report]
+
+
+def test_report_from_worker_processes(tmp_path):
+	_, _, _, report = run(tmp_path, feedback_report=True)
+	_, _, _, parallel_report = run(tmp_path, feedback_report=True, workers=2)
+	assert parallel_report.keys() == report.keys()
+	assert parallel_report.to_text() == report.to_text()
@@ -0,0 +1,45 @@
+import logging
+import os
+
+from simlp.run import parse_and_compute_distance, setup_logger
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GENERATED = os.path.join(rules_dir, "llms/executable_version/gpt4o_cot.prolog")
+GROUND = os.path.join(rules_dir, "rtec/maritime_rules.prolog")
+
+
+def run(log_file, **options):
+	return parse_and_compute_distance(generated_rules_file=GENERATED, ground_rules_file=GROUND,
+									  log_file=None if log_file is None else str(log_file), **options)
+
+
+def test_log_handler_is_closed_after_each_call(tmp_path):
+	log_file = tmp_path / "log.txt"
+	run(log_file)
+	first_log = log_file.read_text()
+	run(log_file)
+	assert log_file.read_text() == first_log
+	assert logging.getLogger(str(log_file)).handlers == []
+
+
+def test_trace_and_log_level(tmp_path):
+	similarity = run(tmp_path / "full.txt")[2]
+	assert run(tmp_path / "summary.txt", trace=False)[2] == similarity
+	summary = (tmp_path / "summary.txt").read_text()
+	assert "Event Description Similarity is: " in summary
+	assert "Rule distances: " not in summary and "We matched rule:" not in summary
+	assert len(summary) < len((tmp_path / "full.txt").read_text()) / 4
+
+	assert run(tmp_path / "warnings.txt", log_level=logging.WARNING)[2] == similarity
+	assert all(line.startswith("Skipped malformed clause") for line in (tmp_path / "warnings.txt").read_text().splitlines())
+	assert run(None)[2] == similarity
+
+
+def test_log_level_without_log_file():
+	module_logger = logging.getLogger("simlp.run")
+	level = module_logger.level
+	logger, handler = setup_logger(None, logging.DEBUG)
+	# The level only applies to a log file; the module logger keeps the application's configuration
+	assert logger is module_logger and handler is None and logger.level == level
+	assert not logger.isEnabledFor(logging.INFO)
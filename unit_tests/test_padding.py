@@ -0,0 +1,34 @@
+import logging
+
+from simlp.atom_utils import get_padded_views
+from simlp.distance_metric import event_description_distance
+from simlp.rtec_parser import get_parser
+
+GENERATED = """
+initiatedAt(gap(Vessel)=true, T) :- happensAt(gap_start(Vessel), T).
+"""
+GROUND = """
+initiatedAt(gap(Vessel)=true, T) :- happensAt(gap_start(Vessel), T), holdsAt(coord(Vessel, _, _)=true, T).
+terminatedAt(gap(Vessel)=true, T) :- happensAt(gap_end(Vessel), T).
+"""
+
+
+def test_padded_views():
+	items = ["a", "b"]
+	view1, view2, m, k = get_padded_views(items, ["c"], "&")
+	assert (m, k) == (2, 1)
+	assert list(view1) == ["a", "b"] and list(view2) == ["c", "&"]
+	assert view2[1] == "&" and view2[-1] == "&"
+	assert items == ["a", "b"]
+
+
+def test_distance_does_not_modify_event_descriptions():
+	generated = get_parser().parse(GENERATED)
+	ground = get_parser().parse(GROUND)
+	body = generated.rules[0].body
+	logger = logging.getLogger("test_padding")
+	_, _, similarity, feedback = event_description_distance(generated, ground, logger, generate_feedback=True)
+	assert len(generated.rules) == 1 and len(ground.rules) == 2
+	assert generated.rules[0].body is body and len(body) == 1
+	assert 0 < similarity < 1
+	assert feedback['summary']['total_rules_generated'] == 1
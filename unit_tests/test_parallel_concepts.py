@@ -0,0 +1,34 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simlp.run import parse_and_compute_distance
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GENERATED = os.path.join(rules_dir, "llms/executable_version/gpt4o_cot.prolog")
+GROUND = os.path.join(rules_dir, "rtec/maritime_rules.prolog")
+
+
+def run(tmp_path, name, **options):
+	log_file = tmp_path / name
+	result = parse_and_compute_distance(generated_rules_file=GENERATED, ground_rules_file=GROUND,
+										log_file=str(log_file), generate_feedback=True, **options)
+	return result, log_file.read_bytes()
+
+
+def test_parallel_run_is_identical_to_the_serial_run(tmp_path):
+	(matching, distances, similarity, feedback), log = run(tmp_path, "serial.txt")
+	(parallel_matching, parallel_distances, parallel_similarity, parallel_feedback), parallel_log = \
+		run(tmp_path, "parallel.txt", workers=2)
+	assert similarity > 0
+	assert np.array_equal(matching, parallel_matching)
+	assert np.array_equal(distances, parallel_distances)
+	assert similarity == parallel_similarity
+	assert feedback == parallel_feedback
+	assert log == parallel_log
+
+	with ProcessPoolExecutor(max_workers=2) as pool:
+		(_, _, executor_similarity, executor_feedback), executor_log = run(tmp_path, "executor.txt", executor=pool)
+	assert (executor_similarity, executor_feedback, executor_log) == (similarity, feedback, log)
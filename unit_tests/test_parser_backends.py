@@ -0,0 +1,76 @@
+import glob
+import os
+
+import pytest
+
+from simlp.rtec_parser import get_parser, ParseError
+from simlp.rtec_descent_parser import tokenize
+from simlp.run import parse_and_compute_distance
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+prolog_files = sorted(glob.glob(os.path.join(rules_dir, "**/*.prolog"), recursive=True)) + \
+			   sorted(glob.glob(os.path.join(current_dir, "*/*.prolog")))
+
+
+def tree(atom):
+	return (atom.predicateName, tuple(tree(arg) for arg in atom.args))
+
+
+def lexer_tokens(text):
+	lexer = get_parser('ply').lexer
+	lexer.input(text)
+	tokens = []
+	try:
+		tokens.extend((token.type, token.value, token.lexpos) for token in iter(lexer.token, None))
+	except ParseError as error:
+		# Both tokenizers stop at the first illegal character
+		tokens.append((error.token.type, error.token.value, error.token.lexpos))
+	return tokens
+
+
+@pytest.mark.parametrize("prolog_file", prolog_files, ids=lambda path: os.path.relpath(path, current_dir))
+def test_backends_produce_identical_trees(prolog_file):
+	with open(prolog_file) as f:
+		source = f.read()
+	ply_event_description = get_parser('ply').parse(source)
+	descent_event_description = get_parser('descent').parse(source)
+
+	assert [(token.type, token.value, token.lexpos) for token in tokenize(source)] == lexer_tokens(source)
+	assert [(tree(rule.head), tuple(tree(atom) for atom in rule.body)) for rule in descent_event_description.rules] == \
+		   [(tree(rule.head), tuple(tree(atom) for atom in rule.body)) for rule in ply_event_description.rules]
+	assert [str(error) for error in descent_event_description.errors] == [str(error) for error in ply_event_description.errors]
+
+
+@pytest.mark.parametrize("source, expected", [
+	("h(X) :- a = b + c, a + b = c, - a + b, X is Y + 1.", "h(X) :- =(a,+(b,c)),+(a,=(b,c)),-(+(a,b)),is(X,+(Y,1))"),
+	("h(X) :- \\+ (a, b), \\+ (a, b) ; c, not (a), (a), (a, b), X == Y, [], [a|b].", None),
+	("h(X) :- \\+ (a, b), \\+ (a, b) ; c, not (a), (a), (a, b), X == Y, [].",
+	 "h(X) :- -(a,b),-(;(comma(a,b),c)),-(a),a,comma(a,b),==(X,Y),list"),
+])
+def test_conflict_resolution(source, expected):
+	for backend in ('ply', 'descent'):
+		event_description = get_parser(backend).parse(source)
+		if expected is None:
+			assert event_description.rules == [] and len(event_description.errors) == 1
+		else:
+			rule = event_description.rules[0]
+			assert str(rule.head) + " :- " + ",".join(map(str, rule.body)) == expected
+
+
+def test_parse_and_compute_distance_backend_option(tmp_path):
+	log_file = str(tmp_path / "log.txt")
+	results = [parse_and_compute_distance(generated_rules_file=os.path.join(current_dir, "test3/generated.prolog"),
+										  ground_rules_file=os.path.join(current_dir, "test3/ground.prolog"),
+										  log_file=log_file, parser_backend=backend) for backend in ('ply', 'descent')]
+	assert results[0][2] == results[1][2]
+	with pytest.raises(ValueError):
+		parse_and_compute_distance("", "", log_file=log_file, parser_backend="lalr")
+
+
+def test_illegal_character_is_a_parse_error():
+	source = "h(X) :- a(X).\nh(X) :-\n  a(X) | b(X).\nh(Y) :- b(Y).\n"
+	for backend in ('ply', 'descent'):
+		event_description = get_parser(backend).parse(source)
+		assert [str(rule.head) for rule in event_description.rules] == ["h(X)", "h(Y)"]
+		assert [str(error) for error in event_description.errors] == ["line 3, column 8: Illegal character '|'"]
@@ -0,0 +1,59 @@
+import glob
+import os
+
+from simlp.query import similarity_at_least, top_k, SimilarityEvaluation
+from simlp.run import parse_and_compute_distance
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GENERATED_FILES = sorted(glob.glob(os.path.join(rules_dir, "llms/executable_version/*.prolog")))
+
+
+def read(path):
+	with open(path) as rules_file:
+		return rules_file.read()
+
+
+GROUND = read(os.path.join(rules_dir, "rtec/maritime_rules.prolog"))
+
+
+def exact_similarity(source, tmp_path):
+	return parse_and_compute_distance(source, GROUND, log_file=str(tmp_path / "log.txt"))[2]
+
+
+def test_bounds_contain_the_exact_similarity_and_refine_to_it(tmp_path):
+	assert GENERATED_FILES
+	for path in GENERATED_FILES:
+		source = read(path)
+		exact = exact_similarity(source, tmp_path)
+		evaluation = SimilarityEvaluation(source, GROUND)
+		bounds = evaluation.bounds()
+		assert bounds.lower <= exact <= bounds.upper and not bounds.exact
+		while evaluation.refine():
+			pass
+		assert evaluation.bounds().exact and evaluation.bounds().similarity == exact
+
+
+def test_threshold_queries(tmp_path):
+	source = read(GENERATED_FILES[0])
+	exact = exact_similarity(source, tmp_path)
+	assert similarity_at_least(source, GROUND, 0.5)
+	assert not similarity_at_least(source, GROUND, 0.9)
+	at_exact = similarity_at_least(source, GROUND, exact)
+	assert at_exact.reached and at_exact.lower <= exact <= at_exact.upper
+	above = similarity_at_least(source, GROUND, exact + 1e-6)
+	assert not above.reached
+	rule = "initiatedAt(gap(Vessel)=true, T) :- happensAt(gap_start(Vessel), T), holdsAt(coord(Vessel, _, _)=true, T)."
+	identical = similarity_at_least(rule, rule, 1.0)
+	assert identical.reached and identical.exact and identical.similarity == 1.0
+
+
+def test_top_k_matches_the_exact_ranking(tmp_path):
+	sources = [read(path) for path in sorted(glob.glob(os.path.join(rules_dir, "llms/**/*.prolog"), recursive=True))]
+	assert len(sources) > 4
+	similarities = [exact_similarity(source, tmp_path) for source in sources]
+	expected = sorted(range(len(sources)), key=lambda index: (-similarities[index], index))[:4]
+	ranked = top_k(sources, GROUND, 4)
+	assert sorted(entry.index for entry in ranked) == sorted(expected)
+	for entry in ranked:
+		assert entry.lower <= similarities[entry.index] <= entry.upper
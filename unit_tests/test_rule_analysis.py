@@ -0,0 +1,47 @@
+import pickle
+
+from simlp.atom_utils import analyze_rule, compute_var_routes, VAR, CONST, COMPOUND
+from simlp.distance_metric import var_distance
+from simlp.event_description import Atom
+from simlp.rtec_parser import get_parser
+
+RULES = """
+initiatedAt(withinArea(Vessel, AreaType)=true, T) :- happensAt(entersArea(Vessel, Area), T), areaType(Area, AreaType).
+initiatedAt(withinArea(V, AT)=true, T) :- happensAt(entersArea(V, A), T), areaType(A, AT), vessel(_Other).
+"""
+
+
+def test_analysis_is_cached_and_matches_var_routes():
+	rule1, rule2 = get_parser().parse(RULES).rules
+	analysis = analyze_rule(rule1)
+	assert analyze_rule(rule1) is analysis
+	assert {var: [list(route) for route in routes] for var, routes in analysis.items()} == compute_var_routes(rule1)
+	assert analysis.signatures["Area"] == (
+		(("areaType", 0),),
+		(("happensAt", 0), ("entersArea", 1)),
+	)
+	assert analysis.singletons == frozenset()
+	assert analyze_rule(rule2).singletons == frozenset()
+	assert analysis.kind(Atom("Vessel", [])) == VAR
+	assert analysis.kind(rule1.head) == COMPOUND
+	assert analysis.kind(Atom("true", [])) == CONST
+	# Same routes under a renaming of the variables
+	assert var_distance("Area", "A", analysis, analyze_rule(rule2)) == 0
+	assert var_distance("Area", "A", compute_var_routes(rule1), compute_var_routes(rule2)) == 0
+
+
+def test_analysis_is_not_pickled():
+	rule = get_parser().parse(RULES).rules[0]
+	analyze_rule(rule)
+	assert pickle.loads(pickle.dumps(rule)).analysis is None
+
+
+def test_var_distance_of_singletons():
+	rule = get_parser().parse("initiatedAt(f(X)=true, T) :- happensAt(e(X, Y), T), g(_Z, W), h(W).").rules[0]
+	analysis = analyze_rule(rule)
+	assert analysis.singletons == frozenset({"Y"})
+	for routes in (analysis, compute_var_routes(rule)):
+		assert var_distance("Y", "_Z", routes, routes) == 0
+		assert var_distance("Y", "X", routes, routes) == 1
+		assert var_distance("X", "W", routes, routes) == 1
+		assert var_distance("W", "W", routes, routes) == 0
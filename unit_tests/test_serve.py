@@ -0,0 +1,43 @@
+import io
+import json
+import os
+
+from simlp.run import parse_and_compute_distance
+from simlp.serve import serve_jsonl
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GROUND = os.path.join(rules_dir, "rtec/maritime_rules.prolog")
+GENERATED = [os.path.join(rules_dir, "llms/executable_version/gpt4o_cot.prolog"),
+			 os.path.join(rules_dir, "llms/executable_version/gpto1_fewshot.prolog")]
+
+
+def serve(lines, **options):
+	output = io.StringIO()
+	with open(GROUND) as ground_file:
+		served = serve_jsonl(io.StringIO("\n".join(lines) + "\n"), output, ground_file.read(), **options)
+	results = [json.loads(line) for line in output.getvalue().splitlines()]
+	assert served == len(results)
+	return results
+
+
+def test_results_match_parse_and_compute_distance(tmp_path):
+	lines = [json.dumps({'id': path, 'generated_file': path, 'feedback': True}) for path in GENERATED]
+	lines.insert(1, "not json")
+	lines.append(json.dumps({'generated': "initiatedAt(f(X)=true, T) :- happensAt(e(X), T).", 'ground_file': GROUND}))
+	results = serve(lines)
+	assert [result['id'] for result in results] == [GENERATED[0], 2, GENERATED[1], 4]
+	assert results[1]['error'].startswith("Invalid JSON") and results[3]['error'] is None
+	for result, path in zip([results[0], results[2]], GENERATED):
+		expected = parse_and_compute_distance(generated_rules_file=path, ground_rules_file=GROUND,
+											  log_file=str(tmp_path / "log.txt"), generate_feedback=True)
+		assert result['similarity'] == expected[2] and result['feedback'] == expected[3]
+		assert result['matching'] and set(result['matching']) <= set(result['concepts'])
+
+
+def test_worker_pool_orders():
+	lines = [json.dumps({'generated_file': path}) for path in GENERATED * 3]
+	serial = serve(lines)
+	assert serve(lines, workers=2, max_in_flight=2) == serial
+	completed = serve(lines, workers=2, order='completion')
+	assert sorted(completed, key=lambda result: result['id']) == serial
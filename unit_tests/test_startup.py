@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+# The wall-clock budgets of the startup are checked by benchmarks/bench_startup.py
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.join(current_dir, "..")
+
+
+def run_python(code):
+	# The interpreter runs in the repository, where it imports simlp from
+	subprocess.run([sys.executable, "-c", code], cwd=root_dir, check=True)
+
+
+def test_import_is_lazy():
+	run_python("import sys, simlp; heavy = {'numpy', 'scipy', 'ply'} & set(sys.modules); assert not heavy, heavy")
+	run_python("import sys, simlp; simlp.parse_and_compute_distance; "
+			   "assert 'scipy' not in sys.modules and 'simlp.feedback_generator' not in sys.modules")
+
@@ -0,0 +1,75 @@
+import json
+import logging
+import os
+
+import pytest
+
+from simlp.distance_metric import compare_event_descriptions
+from simlp.evaluator import Evaluator
+from simlp.run import parse_and_compute_distance, parse_event_description
+from simlp.stats import PerformanceStats, STAGES
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+GENERATED = os.path.join(rules_dir, "llms/executable_version/gpt4o_cot.prolog")
+GROUND = os.path.join(rules_dir, "rtec/maritime_rules.prolog")
+
+
+def run(**kwargs):
+	return parse_and_compute_distance(generated_rules_file=GENERATED, ground_rules_file=GROUND, log_file=None, **kwargs)
+
+
+def test_stats_do_not_change_results():
+	stats = PerformanceStats()
+	assert run(generate_feedback=True, stats=stats)[2:] == run(generate_feedback=True)[2:]
+	data = json.loads(stats.to_json())
+	assert set(data['seconds']) == set(STAGES) and data['total_seconds'] > 0
+	assert data['calls']['rule_distance'] > 0
+	# One assignment per rule distance and one per concept
+	assert data['calls']['linear_sum_assignment'] == data['calls']['rule_distance'] + len(stats.concepts)
+	concept = next(iter(data['concepts'].values()))
+	assert concept['matrix_size'] ** 2 == concept['cells']['rule_matrix']
+
+
+def test_stage_times_add_up_over_concepts():
+	stats = PerformanceStats()
+	run(stats=stats, use_atom_cache=False)
+	assert len(stats.concepts) >= 2
+	for stage in ('cost_matrix', 'assignment'):
+		concept_seconds = [concept.seconds[stage] for concept in stats.concepts.values()]
+		assert all(seconds > 0 for seconds in concept_seconds)
+		assert stats.seconds[stage] == pytest.approx(sum(concept_seconds))
+
+
+def test_worker_stats_are_merged():
+	serial, parallel = PerformanceStats(), PerformanceStats()
+	run(stats=serial, use_atom_cache=False)
+	run(stats=parallel, use_atom_cache=False, workers=2)
+	assert serial.calls == parallel.calls and serial.cells == parallel.cells
+	assert list(serial.concepts) == list(parallel.concepts)
+
+
+def test_cache_hit_rates():
+	run(use_atom_cache=True)
+	stats = PerformanceStats()
+	run(stats=stats, use_atom_cache=True)
+	assert stats.hit_rates()['event_description_cache'] == 1.0
+	assert stats.hit_rates()['atom_distance_cache'] == 1.0
+	assert stats.seconds['parse'] == 0.0
+
+
+def test_uninstrumented_comparison_has_no_stats():
+	_, generated = parse_event_description(open(GENERATED).read())
+	_, ground = parse_event_description(open(GROUND).read())
+	key = sorted(generated.keys() & ground.keys(), key=str)[0]
+	logger = logging.getLogger("test_stats")
+	assert compare_event_descriptions(generated[key], ground[key], logger).stats is None
+	stats = compare_event_descriptions(generated[key], ground[key], logger, instrument=True).stats
+	assert stats.calls['rule_distance'] > 0 and stats.total_seconds > 0
+
+
+def test_evaluator_stats():
+	stats = PerformanceStats()
+	with Evaluator(ground_rules_file=GROUND) as evaluator:
+		evaluator.evaluate(generated_rules_file=GENERATED, stats=stats)
+	assert stats.concepts and stats.total_seconds > 0
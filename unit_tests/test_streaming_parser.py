@@ -0,0 +1,40 @@
+import io
+
+from simlp.rtec_parser import RTECParser, split_clauses
+
+PROGRAM = """% Two valid rules around a malformed one
+initiatedAt(gap(Vessel)=true, T) :-
+    happensAt(gap_start(Vessel), T).
+
+terminatedAt(gap(Vessel)=true, T) :-
+    happensAt(gap_end(Vessel), T) happensAt(velocity(Vessel, 5.3), T).
+
+holdsFor(stopped(Vessel)=true, I) :- /* a comment with a . inside */
+    holdsFor(idle(Vessel)=true, I1), union_all([I1], I).
+"""
+
+
+def test_malformed_clause_is_skipped_and_located():
+	parser = RTECParser()
+	errors = []
+	rules = list(parser.iter_rules(PROGRAM, errors))
+
+	assert [str(rule.head) for rule in rules] == ["initiatedAt(=(gap(Vessel),true),T)", "holdsFor(=(stopped(Vessel),true),I)"]
+	assert len(errors) == 1
+	assert (errors[0].line, errors[0].column) == (6, 35)
+	assert errors[0].token.value == "happensAt"
+
+
+def test_chunked_input_matches_string_input():
+	parser = RTECParser()
+	expected = str(parser.parse(PROGRAM))
+	for chunk_size in (1, 2, 7, 64):
+		chunks = [PROGRAM[i:i+chunk_size] for i in range(0, len(PROGRAM), chunk_size)]
+		assert str(parser.parse(chunks)) == expected
+	assert str(parser.parse(io.StringIO(PROGRAM))) == expected
+
+
+def test_split_clauses_reports_clause_positions():
+	clauses = list(split_clauses(["a :- b(1.5).\n  c :- d", ". % done\n"]))
+	assert [(line, column) for _, line, column in clauses] == [(1, 1), (1, 13), (2, 10)]
+	assert clauses[1][0] == "\n  c :- d."
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+
+from simlp.rtec_parser import get_parser, PARSER_BACKENDS
+from simlp.run import parse_and_compute_distance
+from simlp.event_description import Atom, EventDescription
+from simlp.synthetic import generate_event_description, mutate_event_description, generate_pair, to_prolog
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+rules_dir = os.path.join(current_dir, "../rules")
+
+
+def rules(event_description):
+	return [(rule.head, rule.body) for rule in event_description.rules]
+
+
+def test_generated_programs_parse_back():
+	for seed in range(5):
+		event_description = generate_event_description(fluents=6, rules_per_concept=3, body_length=6, nesting_depth=3,
+													   seed=seed)
+		source = to_prolog(event_description)
+		for backend in PARSER_BACKENDS:
+			parsed = get_parser(backend).parse(source)
+			assert not parsed.errors and rules(parsed) == rules(event_description)
+		mutated = get_parser().parse(to_prolog(mutate_event_description(event_description, 0.5, seed)))
+		assert not mutated.errors
+
+
+def test_generation_is_seeded():
+	assert generate_pair(0.3, seed=7, fluents=5) == generate_pair(0.3, seed=7, fluents=5)
+	assert generate_pair(0.3, seed=7, fluents=5) != generate_pair(0.3, seed=8, fluents=5)
+
+
+def test_mutation_rate_controls_similarity():
+	similarities = []
+	for mutation_rate in (0.0, 0.2, 0.6):
+		generated, ground = generate_pair(mutation_rate, seed=1, fluents=8)
+		similarities.append(parse_and_compute_distance(generated_event_description=generated,
+													   ground_event_description=ground, log_file=None)[2])
+	assert similarities[0] == pytest.approx(1.0)
+	assert similarities[0] > similarities[1] > similarities[2]
+
+
+def test_mutates_parsed_programs():
+	with open(os.path.join(rules_dir, "rtec/maritime_rules.prolog")) as f:
+		maritime = get_parser().parse(f.read())
+	mutated = get_parser().parse(to_prolog(mutate_event_description(maritime, 0.2, seed=3)))
+	assert not mutated.errors and rules(mutated) != rules(maritime)
+
+
+def test_nested_operators_parse_back():
+	a, b, c = Atom('A', []), Atom('B', []), Atom('C', [])
+	event_description = EventDescription()
+	head = Atom('initiatedAt', [Atom('=', [Atom('f', [a]), Atom('true', [])]), Atom('T', [])])
+	event_description.add_rule(head, [Atom('=', [Atom('X', []), Atom('-', [Atom('-', [a, b]), c])]),
+									  Atom('=', [Atom('Y', []), Atom('-', [a, Atom('-', [b, c])])]),
+									  Atom('>', [Atom('*', [Atom('+', [a, b]), c]), Atom('+', [a, Atom('*', [b, c])])]),
+									  Atom('-', [Atom('=', [a, b])])])
+	for backend in PARSER_BACKENDS:
+		parsed = get_parser(backend).parse(to_prolog(event_description))
+		assert not parsed.errors and rules(parsed) == rules(event_description)
+
+
+def test_invalid_parameters():
+	with pytest.raises(ValueError):
+		generate_event_description(body_length=0)
+	with pytest.raises(ValueError):
+		mutate_event_description(generate_event_description(), mutation_rate=1.5)